@@ -0,0 +1,379 @@
+"""
+Load test of the API hot paths.
+
+Every scenario sends `--requests` requests from `--concurrency` concurrent
+clients and reports throughput and p50/p95/p99 latency:
+
+* login - `POST /auth/login`;
+* list, list_type, list_amount, list_created_at, list_cursor - `GET /checks`
+  without filters, with every filter and for the second page;
+* get_by_id - `GET /checks/{check_id}`;
+* public_html - `GET /checks/public/{public_uuid}`, the rendered receipt;
+* create_1, create_10, create_100 - `POST /checks` with 1, 10 and 100 items.
+
+Reads run first, so they only see the seeded checks of 1-10 items.
+
+By default requests go through `httpx.ASGITransport` to the app in this
+process, which measures the app without the network. With `--url` they go
+to a running server instead, e.g. `uvicorn src.main:app --workers 4`.
+
+Results can be saved as a JSON baseline and later runs compared with it.
+The comparison fails with exit code 1 when p95 latency of a scenario grows or
+its throughput drops by more than `--threshold`.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_api [--requests 200] [--concurrency 10] [--url http://localhost:8000]
+    python -m benchmarks.bench_api --save benchmarks/baseline.json
+    python -m benchmarks.bench_api --compare benchmarks/baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable, Optional, Sequence
+
+from httpx import ASGITransport, AsyncClient, Response
+
+from benchmarks.utils import make_check
+from src.main import app
+
+SEED_CHECKS = 200
+
+Request = Callable[[AsyncClient], Awaitable[Response]]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    """
+    Summarize latencies of one scenario.
+
+    :param latencies: latencies of at least two requests in seconds.
+    :param elapsed: wall time of the scenario in seconds.
+    :param errors: number of requests with an unexpected status.
+
+    :return: dictionary with throughput and latency percentiles in ms.
+    """
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list[str]:
+    """
+    Compare results with a baseline.
+
+    :param baseline: results of a previous run.
+    :param results: results of this run.
+    :param threshold: allowed relative change, e.g. 0.2 for 20%.
+
+    :return: descriptions of regressed scenarios.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+
+        if result["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+            )
+        if result["throughput"] < previous["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['throughput']:.1f} -> "
+                f"{result['throughput']:.1f} req/s"
+            )
+    return regressions
+
+
+async def send_requests(
+    client: AsyncClient,
+    request: Request,
+    expected_status: int,
+    requests: int,
+    concurrency: int,
+) -> tuple[list[float], int]:
+    """
+    Send requests from concurrent workers.
+
+    :param client: authorized client.
+    :param request: function sending one request.
+    :param expected_status: status of a successful response.
+    :param requests: total number of requests.
+    :param concurrency: number of concurrent workers.
+
+    :return: latencies of requests in seconds and number of errors.
+    """
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started_at = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code != expected_status:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def run_scenario(
+    client: AsyncClient,
+    request: Request,
+    expected_status: int,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """
+    Send requests from concurrent workers and summarize their latencies.
+
+    :param client: authorized client.
+    :param request: function sending one request.
+    :param expected_status: status of a successful response.
+    :param requests: total number of requests, at least 2.
+    :param concurrency: number of concurrent workers.
+
+    :return: scenario summary.
+    """
+    started_at = time.perf_counter()
+    latencies, errors = await send_requests(
+        client, request, expected_status, requests, concurrency
+    )
+    return summarize(latencies, time.perf_counter() - started_at, errors)
+
+
+async def prepare(client: AsyncClient) -> dict:
+    """
+    Register a user, authorize the client and seed checks to read.
+
+    :param client: client without authorization.
+
+    :return: credentials of the user and IDs of seeded checks.
+    """
+    credentials = {
+        "login": f"bench-{uuid.uuid4()}",
+        "password": f"bench-{uuid.uuid4()}"[:64],
+    }
+    await client.post(
+        "/auth/register",
+        json={"first_name": "Bench", "last_name": "User", **credentials},
+    )
+    response = await client.post("/auth/login", json=credentials)
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    rng = random.Random(0)
+    checks = []
+    for _ in range(SEED_CHECKS):
+        check = make_check(rng.randint(1, 10))
+        check["payment"]["type"] = rng.choice(["cash", "cashless"])
+        checks.append(check)
+    response = await client.post("/checks/batch", json=checks)
+    created = response.json()["created"]
+
+    return {
+        "credentials": credentials,
+        "ids": [check["id"] for check in created],
+        "public_uuids": [check["public_uuid"] for check in created],
+    }
+
+
+def build_scenarios(data: dict) -> dict[str, tuple[Request, int]]:
+    """
+    Build the requests of every scenario.
+
+    :param data: result of `prepare`.
+
+    :return: scenario names mapped to request functions and expected statuses.
+    """
+    ids = itertools.cycle(data["ids"])
+    public_uuids = itertools.cycle(data["public_uuids"])
+    now = datetime.now(UTC)
+    created_at = {
+        "created_at__gte": (now - timedelta(days=1)).isoformat(),
+        "created_at__lt": (now + timedelta(days=1)).isoformat(),
+    }
+    checks = {items: make_check(items) for items in (1, 10, 100)}
+    cursor = {}
+
+    async def list_cursor(client: AsyncClient) -> Response:
+        if "value" not in cursor:
+            response = await client.get("/checks", params={"limit": 20})
+            cursor["value"] = response.headers["X-Next-Cursor"]
+        return await client.get(
+            "/checks", params={"limit": 20, "cursor": cursor["value"]}
+        )
+
+    return {
+        "login": (
+            lambda client: client.post("/auth/login", json=data["credentials"]),
+            200,
+        ),
+        "list": (lambda client: client.get("/checks", params={"limit": 20}), 200),
+        "list_type": (
+            lambda client: client.get("/checks", params={"limit": 20, "type": "cash"}),
+            200,
+        ),
+        "list_amount": (
+            lambda client: client.get(
+                "/checks",
+                params={"limit": 20, "amount__gte": 50, "amount__lt": 200},
+            ),
+            200,
+        ),
+        "list_created_at": (
+            lambda client: client.get("/checks", params={"limit": 20, **created_at}),
+            200,
+        ),
+        "list_cursor": (list_cursor, 200),
+        "get_by_id": (lambda client: client.get(f"/checks/{next(ids)}"), 200),
+        "public_html": (
+            lambda client: client.get(f"/checks/public/{next(public_uuids)}"),
+            200,
+        ),
+        **{
+            f"create_{items}": (
+                lambda client, check=check: client.post("/checks", json=check),
+                201,
+            )
+            for items, check in checks.items()
+        },
+    }
+
+
+def build_client(url: Optional[str]) -> AsyncClient:
+    """
+    Build a client of the app in this process or of a running server.
+
+    :param url: base URL of a running server.
+
+    :return: client.
+    """
+    if url:
+        return AsyncClient(base_url=url, timeout=60)
+    return AsyncClient(transport=ASGITransport(app), base_url="http://test")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """
+    Run the selected scenarios.
+
+    :param args: parsed command line arguments.
+
+    :return: scenario names mapped to summaries.
+    """
+    results = {}
+    async with build_client(args.url) as client:
+        scenarios = build_scenarios(await prepare(client))
+        for name, (request, expected_status) in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+
+            await send_requests(client, request, expected_status, args.warmup, 1)
+            results[name] = await run_scenario(
+                client, request, expected_status, args.requests, args.concurrency
+            )
+            result = results[name]
+            print(
+                f"{name:<16} {result['throughput']:8.1f} req/s "
+                f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                f"p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+            )
+    return results
+
+
+def request_count(value: str) -> int:
+    """
+    Parse the number of measured requests, percentiles need at least two.
+
+    :param value: command line value.
+
+    :return: number of requests.
+    """
+    count = int(value)
+    if count < 2:
+        raise argparse.ArgumentTypeError("at least 2 requests are needed")
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser of the load test.
+
+    :return: argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_api",
+        description="Load test of the API hot paths.",
+    )
+    parser.add_argument("--requests", type=request_count, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--url", help="base URL of a running server")
+    parser.add_argument("--only", nargs="+", help="names of scenarios to run")
+    parser.add_argument("--save", help="path to save results as a baseline")
+    parser.add_argument("--compare", help="path of a baseline to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative p95 and throughput change",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Entry point of the load test.
+
+    :param argv: command line arguments.
+    """
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "created_at": datetime.now(UTC).isoformat(),
+                    "python": platform.python_version(),
+                    "url": args.url,
+                    "requests": args.requests,
+                    "concurrency": args.concurrency,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
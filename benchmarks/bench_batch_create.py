@@ -0,0 +1,45 @@
+"""
+Benchmark of check creation throughput: sequential `POST /checks` calls
+against a single `POST /checks/batch` call with the same checks.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_batch_create
+"""
+
+import asyncio
+import time
+
+from benchmarks.utils import authorized_client, make_check
+
+BATCH_SIZES = (10, 100)
+ITEMS_PER_CHECK = 3
+
+
+async def run() -> None:
+    async with authorized_client() as client:
+        for batch_size in BATCH_SIZES:
+            checks = [make_check(ITEMS_PER_CHECK) for _ in range(batch_size)]
+
+            started_at = time.perf_counter()
+            for check in checks:
+                response = await client.post("/checks", json=check)
+                response.raise_for_status()
+            sequential = time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            response = await client.post("/checks/batch", json=checks)
+            response.raise_for_status()
+            batch = time.perf_counter() - started_at
+
+            print(
+                f"{batch_size:>4} checks: "
+                f"sequential {batch_size / sequential:8.1f} checks/s, "
+                f"batch {batch_size / batch:8.1f} checks/s, "
+                f"speedup {sequential / batch:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,109 @@
+"""
+Benchmark of check listing loading strategies for users with 10, 100 and
+1,000 checks of 1-50 items:
+
+* joinedload - the previous strategy, one query joining every item to its check;
+* selectinload - `CheckRepository.get_by_data`, checks first and items in one IN query;
+* projection - `CheckRepository.get_projection`, only response columns, no ORM objects.
+
+Wire volume is estimated by re-running the captured SQL on a raw asyncpg
+connection and summing rows and the text length of every returned value.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_check_loading
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import joinedload
+
+from benchmarks.utils import create_user, seed_checks
+from src.checks.models import Check
+from src.database import engine
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+SIZES = (10, 100, 1000)
+ROUNDS = 5
+
+
+async def load_joined(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> list[dict]:
+    statement = (
+        select(Check)
+        .filter(Check.user_id == user_id)
+        .options(joinedload(Check.items))
+        .order_by(Check.created_at.desc(), Check.id.desc())
+    )
+    result = await uow.session.execute(statement)
+    checks = result.unique().scalars().all()
+    return [check.as_dict(include_products=True) for check in checks]
+
+
+async def load_selectin(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> list[dict]:
+    return await uow.checks.get_by_data(data={"user_id": user_id})
+
+
+async def load_projection(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> list[dict]:
+    return await uow.checks.get_projection(data={"user_id": user_id})
+
+
+async def wire_volume(statements: list[tuple]) -> tuple[int, int]:
+    rows, size = 0, 0
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        for statement, parameters in statements:
+            records = await raw_connection.driver_connection.fetch(
+                statement, *parameters
+            )
+            rows += len(records)
+            size += sum(len(str(value)) for record in records for value in record)
+    return rows, size
+
+
+async def measure(load, user_id: int) -> tuple[float, int, int]:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    timings = []
+    for round_number in range(ROUNDS):
+        if round_number == 0:
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            started_at = time.perf_counter()
+            await load(uow, user_id)
+            timings.append(time.perf_counter() - started_at)
+
+        if round_number == 0:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    rows, size = await wire_volume(statements)
+    return min(timings), rows, size
+
+
+async def run() -> None:
+    strategies = {
+        "joinedload": load_joined,
+        "selectinload": load_selectin,
+        "projection": load_projection,
+    }
+    for size in SIZES:
+        user = await create_user()
+        await seed_checks(user["id"], size)
+
+        print(f"{size} checks:")
+        for name, load in strategies.items():
+            elapsed, rows, volume = await measure(load, user["id"])
+            print(
+                f"  {name:<13} {elapsed * 1000:9.2f} ms "
+                f"{rows:8} rows {volume / 1024:10.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,79 @@
+"""
+Benchmark of database round-trips, commits and WAL flushes per created check.
+
+Statements and commits are counted with SQLAlchemy engine events. With
+`synchronous_commit = on` every committed write transaction waits for one WAL
+flush (fsync), so commits per check is also the number of flushes per check.
+WAL volume is the difference of `pg_current_wal_lsn()` around the run.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_check_transactions
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import event, text
+
+from src.auth.services import UserService
+from src.checks.services import CheckService
+from src.database import engine
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+CHECKS = 200
+
+
+async def wal_lsn() -> int:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text("SELECT pg_current_wal_lsn() - '0/0'::pg_lsn")
+        )
+        return int(result.scalar_one())
+
+
+async def run() -> None:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "Bench",
+                "last_name": "User",
+                "login": f"bench-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+
+    counters = {"statements": 0, "commits": 0}
+
+    def count_statement(*_):
+        counters["statements"] += 1
+
+    def count_commit(*_):
+        counters["commits"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    event.listen(engine.sync_engine, "commit", count_commit)
+
+    wal_before = await wal_lsn()
+    for _ in range(CHECKS):
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            await CheckService(uow).create_check(
+                user["id"],
+                {
+                    "products": [{"name": "Product", "price": 10.0, "quantity": 2}],
+                    "payment": {"type": "cash", "amount": 100.0},
+                },
+            )
+    wal_after = await wal_lsn()
+
+    event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+    event.remove(engine.sync_engine, "commit", count_commit)
+
+    print(f"statements per check: {counters['statements'] / CHECKS:.2f}")
+    print(f"commits per check:    {counters['commits'] / CHECKS:.2f}")
+    print(f"WAL bytes per check:  {(wal_after - wal_before) / CHECKS:.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,87 @@
+"""
+Benchmark of the streaming check export against materialising the whole
+history, for users with 1,000 and 20,000 checks of 1-10 items:
+
+* listing - `CheckRepository.get_rows` without a limit and `dump_checks`,
+  what the unpaginated `GET /checks` used to do;
+* ndjson / csv - `CheckService.export_checks`, streamed in chunks.
+
+Time to first byte is measured until the first chunk is produced. Peak
+memory is the tracemalloc peak of the Python heap, measured in a separate run
+because tracing slows the export down several times.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_export
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.utils import create_user, seed_checks
+from src.checks.schemas import ExportFormat
+from src.checks.serializers import dump_checks
+from src.checks.services import CheckService
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+SIZES = (1000, 20000)
+SEED_BATCH = 5000
+
+
+async def export_listing(user_id: int):
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        checks, items = await uow.checks.get_rows(data={"user_id": user_id})
+    yield dump_checks(checks, items)
+
+
+def export_stream(export_format: ExportFormat):
+    async def export(user_id: int):
+        service = CheckService(SQLAlchemyUnitOfWorkManager())
+        async for chunk in service.export_checks({"user_id": user_id}, export_format):
+            yield chunk
+
+    return export
+
+
+async def measure(export, user_id: int) -> tuple[float, float, int, int]:
+    started_at = time.perf_counter()
+    first_byte, size = None, 0
+    async for chunk in export(user_id):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started_at
+        size += len(chunk)
+    elapsed = time.perf_counter() - started_at
+
+    tracemalloc.start()
+    async for _ in export(user_id):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte, elapsed, size, peak
+
+
+async def run() -> None:
+    strategies = {
+        "listing": export_listing,
+        "ndjson": export_stream(ExportFormat.NDJSON),
+        "csv": export_stream(ExportFormat.CSV),
+    }
+    for size in SIZES:
+        user = await create_user()
+        for _ in range(0, size, SEED_BATCH):
+            await seed_checks(user["id"], min(SEED_BATCH, size), max_items=10)
+
+        print(f"{size} checks:")
+        for name, export in strategies.items():
+            first_byte, elapsed, body, peak = await measure(export, user["id"])
+            print(
+                f"  {name:<8} first byte {first_byte * 1000:9.2f} ms "
+                f"total {elapsed * 1000:9.2f} ms {body / 1024:10.1f} KiB "
+                f"peak {peak / 1024:10.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
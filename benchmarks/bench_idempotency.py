@@ -0,0 +1,63 @@
+"""
+Benchmark of `POST /checks` retries with an `Idempotency-Key` for a
+100-item check:
+
+* create - a new key, the check is created and the response stored;
+* stored - a retry answered from `check_idempotency_keys`;
+* cached - a retry answered from the in-process cache.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_idempotency
+"""
+
+import asyncio
+import time
+import uuid
+
+from benchmarks.utils import create_user, make_check
+from src.checks.cache import idempotency_cache
+from src.checks.services import CheckService
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+ITEMS = 100
+REQUESTS = 200
+
+
+async def post(user_id: int, key: str) -> bool:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        _, replayed = await CheckService(uow).create_check_once(
+            user_id, make_check(ITEMS), key
+        )
+    return replayed
+
+
+async def measure(user_id: int, keys: list[str], clear_cache: bool) -> float:
+    started_at = time.perf_counter()
+    for key in keys:
+        if clear_cache:
+            idempotency_cache.clear()
+        await post(user_id, key)
+    return (time.perf_counter() - started_at) / len(keys)
+
+
+async def run() -> None:
+    user = await create_user()
+    keys = [str(uuid.uuid4()) for _ in range(REQUESTS)]
+
+    timings = {
+        "create": await measure(user["id"], keys, clear_cache=True),
+        "stored": await measure(user["id"], keys, clear_cache=True),
+    }
+    for key in keys:
+        await post(user["id"], key)
+    timings["cached"] = await measure(user["id"], keys, clear_cache=False)
+
+    print(f"{REQUESTS} requests, {ITEMS} items per check:")
+    for name, elapsed in timings.items():
+        print(f"  {name:<7} {elapsed * 1000:8.3f} ms/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
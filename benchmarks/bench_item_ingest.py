@@ -0,0 +1,77 @@
+"""
+Benchmark of check item ingestion: INSERT ... RETURNING against asyncpg
+binary COPY at 10, 100, 1,000 and 10,000 items per check.
+
+Every round runs in a transaction that is rolled back, so only one throwaway
+user and check are left in the database.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_item_ingest
+"""
+
+import asyncio
+import time
+import uuid
+
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+SIZES = (10, 100, 1000, 10000)
+ROUNDS = 5
+
+
+async def create_check(uow: SQLAlchemyUnitOfWorkManager) -> dict:
+    user = await uow.users.add(
+        {
+            "first_name": "Bench",
+            "last_name": "User",
+            "login": f"bench-{uuid.uuid4()}",
+            "password": "password",
+        }
+    )
+    check = await uow.checks.add(
+        {"type": "CASH", "amount": 1, "total": 1, "rest": 0, "user_id": user["id"]}
+    )
+    await uow.commit()
+    return check
+
+
+async def measure(uow: SQLAlchemyUnitOfWorkManager, method, items: list) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        await method(items)
+        timings.append(time.perf_counter() - started_at)
+        await uow.rollback()
+    return min(timings)
+
+
+async def run() -> None:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        check = await create_check(uow)
+
+        for size in SIZES:
+            items = [
+                {
+                    "name": f"Product {index}",
+                    "price": 12.5,
+                    "quantity": 2,
+                    "total": 25.0,
+                    "check_id": check["id"],
+                    "check_created_at": check["created_at"],
+                }
+                for index in range(size)
+            ]
+            insert = await measure(uow, uow.check_items.insert_add, items)
+            copy = await measure(uow, uow.check_items.copy_add, items)
+            print(
+                f"{size:>6} items: "
+                f"insert {size / insert:10.0f} rows/s, "
+                f"copy {size / copy:10.0f} rows/s, "
+                f"speedup {insert / copy:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
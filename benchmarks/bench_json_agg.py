@@ -0,0 +1,96 @@
+"""
+Benchmark of building the JSON body of a check listing for users with 10, 100
+and 1,000 checks of 1-50 items:
+
+* orm - `CheckRepository.get_by_data`, ORM objects validated by `CheckResponse`;
+* rows - `CheckRepository.get_rows` serialized by `dump_checks`;
+* json_agg - `CheckRepository.get_json`, documents aggregated by Postgres.
+
+Wall time covers the query and serialization, CPU time is the process time of
+the application side only.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_json_agg
+"""
+
+import asyncio
+import time
+
+from pydantic import TypeAdapter
+
+from benchmarks.utils import create_user, seed_checks
+from src.checks.schemas import CheckResponse
+from src.checks.serializers import dump_checks
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+SIZES = (10, 100, 1000)
+ROUNDS = 5
+
+checks_adapter = TypeAdapter(list[CheckResponse])
+
+
+async def dump_orm(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> bytes:
+    checks = await uow.checks.get_by_data(data={"user_id": user_id})
+    return checks_adapter.dump_json(
+        [
+            CheckResponse(
+                id=check["id"],
+                public_uuid=str(check["public_uuid"]),
+                products=check.get("products", []),
+                payment={"type": check["type"], "amount": check["amount"]},
+                total=check["total"],
+                rest=check["rest"],
+                created_at=check["created_at"],
+            )
+            for check in checks
+        ]
+    )
+
+
+async def dump_rows(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> bytes:
+    checks, items = await uow.checks.get_rows(data={"user_id": user_id})
+    return dump_checks(checks, items)
+
+
+async def dump_json_agg(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> bytes:
+    checks = await uow.checks.get_json(data={"user_id": user_id})
+    content = ",".join(check.document for check in checks)
+    return f"[{content}]".encode()
+
+
+async def measure(dump, user_id: int) -> tuple[float, float, int]:
+    wall, cpu, size = [], [], 0
+    for _ in range(ROUNDS):
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            started_at = time.perf_counter()
+            cpu_started_at = time.process_time()
+            body = await dump(uow, user_id)
+            cpu.append(time.process_time() - cpu_started_at)
+            wall.append(time.perf_counter() - started_at)
+            size = len(body)
+    return min(wall), min(cpu), size
+
+
+async def run() -> None:
+    strategies = {
+        "orm": dump_orm,
+        "rows": dump_rows,
+        "json_agg": dump_json_agg,
+    }
+    for size in SIZES:
+        user = await create_user()
+        await seed_checks(user["id"], size)
+
+        print(f"{size} checks:")
+        for name, dump in strategies.items():
+            wall, cpu, body = await measure(dump, user["id"])
+            print(
+                f"  {name:<9} {wall * 1000:9.2f} ms wall "
+                f"{cpu * 1000:9.2f} ms cpu {body / 1024:10.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,81 @@
+"""
+Benchmark of the metrics recording path.
+
+Measures one histogram observation and the overhead `MetricsMiddleware`
+adds to a request of an endpoint doing nothing, sent through
+`httpx.ASGITransport`, with and without the middleware.
+
+Usage:
+    python -m benchmarks.bench_metrics
+"""
+
+import asyncio
+import time
+import timeit
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.metrics.middleware import MetricsMiddleware
+from src.metrics.registry import Registry
+
+OBSERVATIONS = 1_000_000
+REQUESTS = 2000
+ROUNDS = 5
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def measure_requests(app: FastAPI) -> float:
+    transport = ASGITransport(app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        started_at = time.perf_counter()
+        for index in range(REQUESTS):
+            await client.get(f"/items/{index}")
+        return (time.perf_counter() - started_at) / REQUESTS
+
+
+async def measure(apps: dict[str, FastAPI]) -> dict[str, float]:
+    """
+    Measure apps in alternating rounds and keep the best round of each.
+    """
+    timings = {name: [] for name in apps}
+    for _ in range(ROUNDS):
+        for name, app in apps.items():
+            timings[name].append(await measure_requests(app))
+    return {name: min(values) for name, values in timings.items()}
+
+
+def main() -> None:
+    histogram = Registry().histogram("duration_seconds", "Duration.", ("route",))
+    observe = timeit.timeit(
+        lambda: histogram.observe(0.042, "/checks/{check_id}"), number=OBSERVATIONS
+    )
+    timings = asyncio.run(
+        measure(
+            {
+                "plain": build_app(instrumented=False),
+                "instrumented": build_app(instrumented=True),
+            }
+        )
+    )
+    plain, instrumented = timings["plain"], timings["instrumented"]
+
+    print(f"observe       {observe / OBSERVATIONS * 1e9:8.0f} ns")
+    print(f"request       {plain * 1e6:8.1f} us")
+    print(f"instrumented  {instrumented * 1e6:8.1f} us")
+    print(f"overhead      {(instrumented - plain) * 1e6:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
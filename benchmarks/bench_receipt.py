@@ -0,0 +1,86 @@
+"""
+Benchmark of receipt rendering:
+
+* load - getting `check.html` from a new environment, compiled from source
+  as `Jinja2Templates` did on every start, or loaded from the bytecode cache;
+* render - `render_receipt` for checks of 10, 100 and 1,000 products;
+* stream - time to the first chunk of `iter_receipt` for the same checks.
+
+Usage:
+    python -m benchmarks.bench_receipt
+"""
+
+import tempfile
+import time
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from src.checks.rendering import (
+    RECEIPT_TEMPLATE,
+    TEMPLATES_DIR,
+    iter_receipt,
+    render_receipt,
+)
+from src.checks.schemas import CheckResponse
+
+SIZES = (10, 100, 1000)
+ROUNDS = 50
+
+
+def build_check(products: int) -> CheckResponse:
+    return CheckResponse(
+        id=1,
+        public_uuid="123e4567-e89b-12d3-a456-426614174000",
+        products=[
+            {"name": f"Product {index}", "price": 12.5, "quantity": 2}
+            for index in range(products)
+        ],
+        payment={"type": "cash", "amount": 25.0 * products},
+        total=25.0 * products,
+        rest=0,
+        created_at=datetime.now(),
+    )
+
+
+def measure(function) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def load_template(bytecode_cache=None) -> None:
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
+    )
+    environment.get_template(RECEIPT_TEMPLATE)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        bytecode_cache = FileSystemBytecodeCache(directory)
+        load_template(bytecode_cache)
+        compiled = measure(load_template)
+        cached = measure(lambda: load_template(bytecode_cache))
+
+    print(
+        f"load   compiled {compiled * 1000:8.3f} ms  "
+        f"bytecode cache {cached * 1000:8.3f} ms"
+    )
+    for size in SIZES:
+        check = build_check(size)
+        rendered = measure(lambda: render_receipt(check))
+        first_chunk = measure(lambda: next(iter_receipt(check)))
+        print(
+            f"{size:>5} products  render {rendered * 1000:8.3f} ms  "
+            f"first chunk {first_chunk * 1000:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
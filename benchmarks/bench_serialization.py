@@ -0,0 +1,126 @@
+"""
+Microbenchmark of per-check response serialization for GET /checks.
+
+* ORM path - ORM `Check` -> `as_dict` -> `CheckResponse` -> FastAPI response
+  model validation and serialization -> `JSONResponse` rendering;
+* row path - `dump_checks`, rows written straight to JSON bytes.
+
+No database is needed, rows and ORM objects are built in memory.
+
+Usage:
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import timeit
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.auth.models import User  # noqa: F401 - configures Check.user
+from src.checks.models import Check, CheckItem
+from src.checks.schemas import CheckResponse, PaymentMethod
+from src.checks.serializers import dump_checks
+
+CHECKS = 100
+ITEMS_PER_CHECK = 10
+ROUNDS = 50
+
+CheckRow = namedtuple(
+    "CheckRow", ["id", "public_uuid", "type", "amount", "total", "rest", "created_at"]
+)
+ItemRow = namedtuple("ItemRow", ["check_id", "name", "price", "quantity"])
+
+
+def make_rows() -> tuple[list, list]:
+    checks = [
+        CheckRow(
+            id=check_id,
+            public_uuid=uuid.uuid4(),
+            type=PaymentMethod.CASH,
+            amount=Decimal("300.00"),
+            total=Decimal("249.90"),
+            rest=Decimal("50.10"),
+            created_at=datetime(2025, 5, 1, 12, 0, 0),
+        )
+        for check_id in range(CHECKS)
+    ]
+    items = [
+        ItemRow(
+            check_id=check.id,
+            name=f"Product {index}",
+            price=Decimal("12.50"),
+            quantity=2,
+        )
+        for check in checks
+        for index in range(ITEMS_PER_CHECK)
+    ]
+    return checks, items
+
+
+def make_models(checks: list, items: list) -> list[Check]:
+    models = []
+    for check in checks:
+        model = Check(**check._asdict(), user_id=1)
+        model.items = [
+            CheckItem(
+                id=index,
+                total=item.price * item.quantity,
+                **item._asdict(),
+            )
+            for index, item in enumerate(items)
+            if item.check_id == check.id
+        ]
+        models.append(model)
+    return models
+
+
+async def orm_path(models: list[Check], field) -> bytes:
+    responses = []
+    for model in models:
+        check = model.as_dict(include_products=True)
+        responses.append(
+            CheckResponse(
+                id=check["id"],
+                public_uuid=str(check["public_uuid"]),
+                products=check["products"],
+                payment={"type": check["type"], "amount": check["amount"]},
+                total=check["total"],
+                rest=check["rest"],
+                created_at=check["created_at"],
+            )
+        )
+    content = await serialize_response(field=field, response_content=responses)
+    return JSONResponse(content).body
+
+
+async def run() -> None:
+    checks, items = make_rows()
+    models = make_models(checks, items)
+    field = create_model_field(
+        name="Response", type_=list[CheckResponse], mode="serialization"
+    )
+
+    started_at = timeit.default_timer()
+    for _ in range(ROUNDS):
+        await orm_path(models, field)
+    orm = (timeit.default_timer() - started_at) / ROUNDS / CHECKS
+
+    started_at = timeit.default_timer()
+    for _ in range(ROUNDS):
+        dump_checks(checks, items)
+    rows = (timeit.default_timer() - started_at) / ROUNDS / CHECKS
+
+    print(f"{CHECKS} checks x {ITEMS_PER_CHECK} items")
+    print(f"orm path {orm * 1e6:8.2f} us/check")
+    print(f"row path {rows * 1e6:8.2f} us/check")
+    print(f"speedup  {orm / rows:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
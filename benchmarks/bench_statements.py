@@ -0,0 +1,78 @@
+"""
+Benchmark of repository statement building for a filtered page of checks:
+
+* rebuilt - the statement cache is cleared before every call, so the
+  construct and its compile cache key are built every time as before;
+* cached - statements are taken from `src.repository.statement_cache`.
+
+Building is measured alone and together with fetching a page of 10 checks,
+compile cache stats of the engine are printed at the end.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_statements
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from benchmarks.utils import create_user, seed_checks
+from src.checks.schemas import PaymentMethod
+from src.database import compile_cache_stats
+from src.repository import statement_cache
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+BUILDS = 20000
+FETCHES = 1000
+FILTERS = {
+    "type": PaymentMethod.CASH,
+    "total__gte": 1.0,
+    "created_at__gte": datetime(2020, 1, 1),
+    "created_at__lt": datetime(2100, 1, 1),
+}
+
+
+def measure_build(
+    uow: SQLAlchemyUnitOfWorkManager, user_id: int, rebuild: bool
+) -> float:
+    started_at = time.perf_counter()
+    for _ in range(BUILDS):
+        if rebuild:
+            statement_cache.clear()
+        statement, _ = uow.checks.build_projection_statement(
+            {**FILTERS, "user_id": user_id}, limit=11
+        )
+        statement._generate_cache_key()
+    return (time.perf_counter() - started_at) / BUILDS
+
+
+async def measure_fetch(
+    uow: SQLAlchemyUnitOfWorkManager, user_id: int, rebuild: bool
+) -> float:
+    started_at = time.perf_counter()
+    for _ in range(FETCHES):
+        if rebuild:
+            statement_cache.clear()
+        await uow.checks.get_rows(data={**FILTERS, "user_id": user_id}, limit=11)
+    return (time.perf_counter() - started_at) / FETCHES
+
+
+async def run() -> None:
+    user = await create_user()
+    await seed_checks(user["id"], 10, max_items=5)
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        print(f"{'':<8} {'build':>10} {'fetch':>10}")
+        for name, rebuild in (("rebuilt", True), ("cached", False)):
+            build = measure_build(uow, user["id"], rebuild)
+            fetch = await measure_fetch(uow, user["id"], rebuild)
+            print(f"{name:<8} {build * 1e6:7.1f} us {fetch * 1e3:7.3f} ms")
+
+    print(f"compile cache: {compile_cache_stats()}")
+    print(f"statement cache: {statement_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,125 @@
+"""
+Benchmark of monthly check summaries of a user with 20,000 checks spread over
+a year:
+
+* client - every check downloaded with `CheckRepository.get_rows` and summed
+  in Python, what the dashboards do today;
+* scan - the same sums aggregated from the `checks` table;
+* rollup - `CheckService.get_summary` reading `check_summaries`.
+
+Requires a migrated database configured through `DATABASE_URL`.
+
+Usage:
+    python -m benchmarks.bench_summary
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import Date, cast, func, select, text
+
+from benchmarks.utils import create_user, seed_checks
+from src.checks.maintenance import add_months, create_partitions, month_start
+from src.checks.models import Check
+from src.checks.schemas import SummaryPeriod
+from src.checks.services import CheckService
+from src.database import engine
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+CHECKS = 20000
+SEED_BATCH = 5000
+ROUNDS = 5
+
+
+async def seed(user_id: int) -> None:
+    """
+    Seed checks and spread them over the last year, rebuilding the summaries.
+    """
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await create_partitions(
+            connection, add_months(month_start(date.today()), -12), 13
+        )
+
+    for _ in range(0, CHECKS, SEED_BATCH):
+        await seed_checks(user_id, SEED_BATCH, max_items=5)
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        parameters = {"user_id": user_id}
+        await uow.session.execute(
+            text(
+                "UPDATE checks SET created_at = created_at - random() * interval '365 days' "
+                "WHERE user_id = :user_id"
+            ),
+            parameters,
+        )
+        await uow.session.execute(
+            text("DELETE FROM check_summaries WHERE user_id = :user_id"), parameters
+        )
+        await uow.session.execute(
+            text(
+                "INSERT INTO check_summaries "
+                "(user_id, day, type, count, amount, total, rest) "
+                "SELECT user_id, created_at::date, type, count(*), "
+                "sum(amount), sum(total), sum(rest) "
+                "FROM checks WHERE user_id = :user_id "
+                "GROUP BY user_id, created_at::date, type"
+            ),
+            parameters,
+        )
+        await uow.commit()
+
+
+async def summary_client(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> int:
+    checks, _ = await uow.checks.get_rows(data={"user_id": user_id})
+    months = defaultdict(lambda: [0, 0])
+    for check in checks:
+        month = months[(check.created_at.year, check.created_at.month, check.type)]
+        month[0] += 1
+        month[1] += check.total
+    return len(months)
+
+
+async def summary_scan(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> int:
+    month = cast(func.date_trunc("month", Check.created_at), Date)
+    result = await uow.session.execute(
+        select(month, Check.type, func.count(), func.sum(Check.total))
+        .filter(Check.user_id == user_id)
+        .group_by(month, Check.type)
+    )
+    return len(result.all())
+
+
+async def summary_rollup(uow: SQLAlchemyUnitOfWorkManager, user_id: int) -> int:
+    summaries = await CheckService(uow).get_summary(user_id, SummaryPeriod.MONTH)
+    return len(summaries)
+
+
+async def measure(summary, user_id: int) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            started_at = time.perf_counter()
+            await summary(uow, user_id)
+            timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+async def run() -> None:
+    user = await create_user()
+    await seed(user["id"])
+
+    print(f"{CHECKS} checks, monthly summary:")
+    for name, summary in {
+        "client": summary_client,
+        "scan": summary_scan,
+        "rollup": summary_rollup,
+    }.items():
+        elapsed = await measure(summary, user["id"])
+        print(f"  {name:<7} {elapsed * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
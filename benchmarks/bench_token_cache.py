@@ -0,0 +1,61 @@
+"""
+Benchmark of bearer token validation in `get_current_user`.
+
+Compares the previous path (validate_token + decode_token, two signature
+checks per request) with a single verification pass and with the
+verified-token cache.
+
+Usage:
+    python -m benchmarks.bench_token_cache
+"""
+
+import asyncio
+import timeit
+from datetime import datetime, UTC
+
+from src.auth.cache import TokenCache
+from src.auth.utils import create_access_token, decode_token, validate_token
+
+ROUNDS = 20000
+
+
+async def double_decode(token: str) -> dict:
+    payload = decode_token(token)
+    if datetime.fromtimestamp(payload["exp"], UTC) < datetime.now(UTC):
+        raise ValueError("Token has expired")
+    return decode_token(token)
+
+
+async def single_pass(token: str) -> dict:
+    return await validate_token(token)
+
+
+async def cached(token: str, cache: TokenCache) -> dict:
+    payload = cache.get(token)
+    if payload is None:
+        payload = await validate_token(token)
+        cache.set(token, payload)
+    return payload
+
+
+async def run(rounds: int) -> None:
+    token = create_access_token({"id": 1, "login": "benchmark-user-login"})
+    cache = TokenCache(max_size=1024)
+
+    cases = {
+        "validate + decode": lambda: double_decode(token),
+        "single pass": lambda: single_pass(token),
+        "cached": lambda: cached(token, cache),
+    }
+    for name, case in cases.items():
+        started_at = timeit.default_timer()
+        for _ in range(rounds):
+            await case()
+        elapsed = timeit.default_timer() - started_at
+        print(f"{name:<20} {elapsed / rounds * 1e6:8.2f} us/request")
+
+    print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(ROUNDS))
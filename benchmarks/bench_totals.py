@@ -0,0 +1,96 @@
+"""
+Benchmark of check totals and item rows for 1,000-line baskets:
+
+* float - the previous `CheckService._calculate_totals` and
+  `_build_check_item_data`, float arithmetic and one dict per product;
+* decimal - `calculate_totals` and `assign_check` from `src.checks.totals`.
+
+Also counts baskets whose float total differs from the exact one after
+rounding to kopecks, as `Numeric(10, 2)` would store it.
+
+Usage:
+    python -m benchmarks.bench_totals
+"""
+
+import random
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from src.checks.totals import assign_check, calculate_totals
+
+LINES = 1000
+BASKETS = 200
+ROUNDS = 5
+
+
+def float_totals(products: list, payment: dict) -> tuple:
+    total = sum(product["price"] * product["quantity"] for product in products)
+    return total, payment["amount"] - total
+
+
+def float_item_rows(products: list, check_id: int, check_created_at: datetime) -> list:
+    return [
+        {
+            "name": product["name"],
+            "price": product["price"],
+            "quantity": product["quantity"],
+            "total": product["price"] * product["quantity"],
+            "check_id": check_id,
+            "check_created_at": check_created_at,
+        }
+        for product in products
+    ]
+
+
+def run_float(basket: list, payment: dict, created_at: datetime) -> Decimal:
+    total, _ = float_totals(basket, payment)
+    float_item_rows(basket, 1, created_at)
+    return Decimal(repr(total)).quantize(Decimal("0.01"))
+
+
+def run_decimal(basket: list, payment: dict, created_at: datetime) -> Decimal:
+    totals = calculate_totals(basket, payment["amount"])
+    assign_check(totals.items, 1, created_at)
+    return totals.total
+
+
+def measure(run, baskets: list, created_at: datetime) -> tuple[float, list]:
+    timings, results = [], []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        results = [run(basket, payment, created_at) for basket, payment in baskets]
+        timings.append(time.perf_counter() - started_at)
+    return min(timings), results
+
+
+def main() -> None:
+    rng = random.Random(0)
+    created_at = datetime.now()
+    baskets = []
+    for _ in range(BASKETS):
+        basket = [
+            {
+                "name": f"Product {index}",
+                "price": round(rng.uniform(0.01, 500), rng.choice([2, 2, 2, 3])),
+                "quantity": rng.randint(1, 10),
+            }
+            for index in range(LINES)
+        ]
+        baskets.append((basket, {"type": "cash", "amount": 10_000_000.0}))
+
+    float_time, float_results = measure(run_float, baskets, created_at)
+    decimal_time, decimal_results = measure(run_decimal, baskets, created_at)
+    drifted = sum(
+        float_total != exact_total
+        for float_total, exact_total in zip(float_results, decimal_results)
+    )
+
+    print(f"{BASKETS} baskets x {LINES} lines")
+    print(f"float    {float_time / BASKETS * 1000:8.3f} ms/basket")
+    print(f"decimal  {decimal_time / BASKETS * 1000:8.3f} ms/basket")
+    print(f"float totals off by at least a kopeck: {drifted}/{BASKETS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import random
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from httpx import AsyncClient, ASGITransport
+
+from src.checks.schemas import PaymentMethod
+from src.main import app
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+@asynccontextmanager
+async def authorized_client(
+    base_url: str = "http://test",
+) -> AsyncIterator[AsyncClient]:
+    """
+    Register a throwaway user and yield a client authorized as that user.
+
+    :param base_url: base URL of the API.
+    """
+    login = f"bench-{uuid.uuid4()}"
+    password = f"bench-{uuid.uuid4()}"[:64]
+
+    async with AsyncClient(transport=ASGITransport(app), base_url=base_url) as client:
+        await client.post(
+            "/auth/register",
+            json={
+                "first_name": "Bench",
+                "last_name": "User",
+                "login": login,
+                "password": password,
+            },
+        )
+        response = await client.post(
+            "/auth/login", json={"login": login, "password": password}
+        )
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        yield client
+
+
+def make_check(items: int = 1) -> dict:
+    """
+    Build a check payload with the given number of products.
+
+    :param items: number of products in the check.
+    :return: check payload.
+    """
+    return {
+        "products": [
+            {"name": f"Product {index}", "price": 12.5, "quantity": 2}
+            for index in range(items)
+        ],
+        "payment": {"type": "cash", "amount": 25.0 * items + 10},
+    }
+
+
+async def create_user() -> dict:
+    """
+    Create a throwaway user directly in the database.
+
+    :return: created user data.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await uow.users.add(
+            {
+                "first_name": "Bench",
+                "last_name": "User",
+                "login": f"bench-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+        await uow.commit()
+        return user
+
+
+async def seed_checks(user_id: int, count: int, max_items: int = 50) -> None:
+    """
+    Insert checks with 1 to `max_items` random items for the user.
+
+    :param user_id: owner of the checks.
+    :param count: number of checks.
+    :param max_items: maximum number of items per check.
+    """
+    sizes = [random.randint(1, max_items) for _ in range(count)]
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        checks = await uow.checks.bulk_add(
+            data=[
+                {
+                    "type": random.choice(list(PaymentMethod)),
+                    "amount": 25.0 * size + 10,
+                    "total": 25.0 * size,
+                    "rest": 10,
+                    "user_id": user_id,
+                }
+                for size in sizes
+            ]
+        )
+        await uow.check_items.bulk_add(
+            data=[
+                {
+                    "name": f"Product {index}",
+                    "price": 12.5,
+                    "quantity": 2,
+                    "total": 25.0,
+                    "check_id": check["id"],
+                    "check_created_at": check["created_at"],
+                }
+                for check, size in zip(checks, sizes)
+                for index in range(size)
+            ]
+        )
+        await uow.commit()
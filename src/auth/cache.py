@@ -0,0 +1,92 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import settings
+
+
+class TokenCache:
+    """
+    In-process LRU cache of verified JWT payloads.
+
+    Entries are keyed by the SHA-256 digest of the raw token and kept until the
+    token's `exp` claim, so repeated requests with the same bearer token skip
+    signature verification and JSON parsing.
+
+    Attributes:
+        max_size (int): Maximum number of cached tokens.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that required token verification.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Get cached payload of the token.
+
+        :param token: raw JWT token.
+
+        :return: decoded payload or None if the token is not cached or expired.
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        """
+        Cache verified payload of the token until it expires.
+
+        :param token: raw JWT token.
+        :param payload: decoded and verified payload.
+        """
+        if self.max_size <= 0 or "exp" not in payload:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (float(payload["exp"]), payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached tokens.
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        :return: dictionary with cache size, hits and misses.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
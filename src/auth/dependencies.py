@@ -1,14 +1,16 @@
+import time
 from typing import Annotated
 
-import jwt
-from fastapi import HTTPException, Depends
-from starlette import status
+from fastapi import Depends
 
+from src.auth.cache import token_cache
 from src.auth.exceptions import InvalidCredentials, UserNotFound
+from src.auth.hashing import password_hasher
 from src.auth.services import UserService
-from src.auth.utils import verify_password, decode_token, validate_token
+from src.auth.utils import validate_token
 from src.config import oauth2_scheme
 from src.dependencies import UOWDep
+from src.metrics.registry import registry
 
 
 async def validate_auth_user(
@@ -29,7 +31,7 @@ async def validate_auth_user(
     if not exising_user:
         raise UserNotFound("User not found.")
 
-    if not verify_password(password, exising_user["password"]):
+    if not await password_hasher.verify(password, exising_user["password"]):
         raise InvalidCredentials("Invalid password.")
 
     return exising_user
@@ -38,22 +40,31 @@ async def validate_auth_user(
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     """
     Get current user.
+
+    Verified payloads are cached until the token expires, so repeated requests
+    with the same token skip signature verification.
+
     :param token: token to get user.
 
     :return: user data.
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
 
+    started_at = time.perf_counter()
     try:
-        await validate_token(token)
-        payload = decode_token(token)
-        return payload
+        payload = await validate_token(token)
+    finally:
+        token_validation_duration.observe(time.perf_counter() - started_at)
+    token_cache.set(token, payload)
+    return payload
 
-    except jwt.DecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
+token_validation_duration = registry.histogram(
+    "token_validation_duration_seconds",
+    "Time spent decoding and verifying tokens not found in the token cache.",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
 
 CurrentUser = Annotated[dict, Depends(get_current_user)]
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.auth.utils import hash_password, verify_password
+from src.config import settings
+from src.metrics.registry import registry
+
+
+class PasswordHasher:
+    """
+    Async password hasher.
+
+    bcrypt is CPU-bound and takes hundreds of milliseconds per call, so the work
+    is sent to a worker pool instead of running on the event loop. A semaphore
+    caps the number of jobs handed to the pool, and the remaining callers wait
+    in the queue reported by `stats`.
+
+    Attributes:
+        executor_type (str): Worker pool type, either "thread" or "process".
+        max_workers (int): Number of workers in the pool.
+        max_concurrency (int): Maximum number of jobs submitted to the pool at once.
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 2,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+        self.work_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash password in the worker pool.
+
+        :param password: password to hash.
+
+        :return: hashed password.
+        """
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify password in the worker pool.
+
+        :param plain_password: password to verify.
+        :param hashed_password: hashed password.
+
+        :return: True if password is correct, False otherwise.
+        """
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """
+        Get hasher metrics.
+
+        :return: dictionary with queue depth, in-flight jobs and timings.
+        """
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "wait_seconds": self.wait_seconds,
+            "work_seconds": self.work_seconds,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Shut down the worker pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, func: Callable, *args):
+        """
+        Run function in the worker pool once a concurrency slot is free.
+
+        :param func: function to run.
+        :param args: function arguments.
+
+        :return: function result.
+        """
+        queued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.wait_seconds += started_at - queued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.in_flight -= 1
+            self.completed += 1
+            self.work_seconds += elapsed
+            hash_duration.observe(elapsed, func.__name__)
+            self._semaphore.release()
+
+    def _get_executor(self) -> Executor:
+        """
+        Get the worker pool, creating it on first use.
+
+        :return: executor instance.
+        """
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher",
+                )
+        return self._executor
+
+
+hash_duration = registry.histogram(
+    "password_hasher_duration_seconds",
+    "Time spent hashing or verifying a password in the worker pool.",
+    ("operation",),
+)
+
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASHER_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    max_concurrency=settings.PASSWORD_HASHER_MAX_CONCURRENCY,
+)
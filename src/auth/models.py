@@ -30,4 +30,6 @@ class User(Base):
     login: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
     password: Mapped[str] = mapped_column(String(128), nullable=False)
 
-    checks: Mapped[list["Check"]] = relationship("Check", back_populates="user")
+    checks: Mapped[list["Check"]] = relationship(
+        "Check", back_populates="user", lazy="raise"
+    )
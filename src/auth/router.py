@@ -4,6 +4,7 @@ from starlette.status import HTTP_201_CREATED
 
 from src.auth.dependencies import validate_auth_user
 from src.auth.exceptions import UserAlreadyExists, InvalidCredentials
+from src.auth.hashing import password_hasher
 from src.auth.schemas import (
     RegisterResponse,
     RegisterRequest,
@@ -11,7 +12,7 @@ from src.auth.schemas import (
     LoginRequest,
 )
 from src.auth.services import UserService
-from src.auth.utils import hash_password, create_access_token, create_refresh_token
+from src.auth.utils import create_access_token, create_refresh_token
 from src.dependencies import UOWDep
 
 router = APIRouter(
@@ -30,7 +31,7 @@ async def register(uow: UOWDep, user: RegisterRequest) -> RegisterResponse:
     :return: created user data.
     """
     try:
-        user.password = hash_password(user.password)
+        user.password = await password_hasher.hash(user.password)
         created_user = await UserService(uow).create_user(user.model_dump())
         return RegisterResponse(**created_user)
 
@@ -1,4 +1,4 @@
-from datetime import timedelta, datetime, timezone, UTC
+from datetime import timedelta, datetime, timezone
 
 import bcrypt
 import jwt
@@ -156,21 +156,18 @@ def create_refresh_token(user: dict) -> str:
     )
 
 
-async def validate_token(token: str) -> None:
+async def validate_token(token: str) -> dict:
     """
     Validate token.
 
+    Signature and expiration are verified in a single decode pass.
+
     :param token: token to validate.
 
-    :return:
+    :return: decoded token.
     """
     try:
-        payload = decode_token(token)
-        if datetime.fromtimestamp(payload["exp"], UTC) < datetime.now(UTC):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has expired",
-            )
+        return decode_token(token)
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -178,7 +175,7 @@ async def validate_token(token: str) -> None:
             detail="Token has expired",
         )
 
-    except jwt.DecodeError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
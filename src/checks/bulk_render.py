@@ -0,0 +1,317 @@
+"""
+Bulk rendering of check receipts to static HTML files.
+
+Checks are read from the database in keyset pages of `--batch-size`, newest
+first, and every page is rendered by `render_receipt` in a process pool
+while the next pages are read. Receipts are written as `<public_uuid>.html`
+to a directory or to a single `.zip` or `.tar` archive.
+
+With `--checkpoint` the keyset position of the last written page is saved
+after every page, and a later run with the same checkpoint continues after
+it. Archives are only complete once closed, so after a crash resume into a
+directory or start the archive again; an interrupted run (Ctrl+C) closes
+the archive and can be resumed.
+
+Usage:
+    python -m src.checks.bulk_render --output receipts.zip [--user-id 1]
+        [--from 2025-01-01] [--to 2025-02-01] [--workers 4] [--batch-size 500]
+        [--checkpoint receipts.checkpoint]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time as day_start
+from typing import AsyncIterator, Optional, Sequence
+
+from src.checks.rendering import render_receipt
+from src.checks.schemas import CheckResponse
+from src.checks.serializers import build_checks
+from src.checks.utils import decode_cursor, encode_cursor
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+def render_batch(checks: list[dict]) -> list[tuple[str, bytes]]:
+    """
+    Render receipts of a batch of checks in a worker process.
+
+    :param checks: checks in the `CheckResponse` format.
+
+    :return: file names and rendered receipts.
+    """
+    return [
+        (
+            f"{check['public_uuid']}.html",
+            render_receipt(CheckResponse.model_validate(check)),
+        )
+        for check in checks
+    ]
+
+
+class ReceiptWriter:
+    """
+    Writer of rendered receipts to a directory, a zip or a tar archive.
+
+    The output type is chosen by the path suffix, archives are appended to
+    when they exist.
+
+    Attributes:
+        path (str): Output directory or archive path.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._archive = None
+        if path.endswith(".zip"):
+            self._archive = zipfile.ZipFile(path, "a", zipfile.ZIP_DEFLATED)
+        elif path.endswith(".tar"):
+            self._archive = tarfile.open(path, "a")
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, receipts: list[tuple[str, bytes]]) -> None:
+        """
+        Write rendered receipts.
+
+        :param receipts: file names and rendered receipts.
+        """
+        for name, content in receipts:
+            if isinstance(self._archive, zipfile.ZipFile):
+                self._archive.writestr(name, content)
+            elif isinstance(self._archive, tarfile.TarFile):
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                info.mtime = int(time.time())
+                self._archive.addfile(info, io.BytesIO(content))
+            else:
+                with open(os.path.join(self.path, name), "wb") as file:
+                    file.write(content)
+
+    def close(self) -> None:
+        """
+        Close the archive.
+        """
+        if self._archive is not None:
+            self._archive.close()
+
+
+def read_checkpoint(path: Optional[str]) -> Optional[tuple[datetime, int]]:
+    """
+    Read the keyset position saved in a checkpoint file.
+
+    :param path: checkpoint file path.
+
+    :return: keyset position or None if there is no checkpoint.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return decode_cursor(file.read().strip())
+
+
+def write_checkpoint(path: Optional[str], position: tuple[datetime, int]) -> None:
+    """
+    Atomically save a keyset position to a checkpoint file.
+
+    :param path: checkpoint file path.
+    :param position: keyset position of the last written check.
+    """
+    if not path:
+        return
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        file.write(encode_cursor(*position))
+    os.replace(temporary_path, path)
+
+
+async def read_batches(
+    filters: dict, batch_size: int, after: Optional[tuple[datetime, int]]
+) -> AsyncIterator[tuple[list[dict], tuple[datetime, int]]]:
+    """
+    Read checks in keyset pages.
+
+    :param filters: check filters.
+    :param batch_size: number of checks in a page.
+    :param after: keyset position to continue from.
+
+    :return: async iterator over checks of a page and its last keyset position.
+    """
+    while True:
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            checks, items = await uow.checks.get_rows(
+                data=filters, limit=batch_size, after=after
+            )
+        if not checks:
+            return
+
+        after = (checks[-1].created_at, checks[-1].id)
+        yield build_checks(checks, items), after
+
+
+async def render_receipts(
+    filters: dict,
+    writer: ReceiptWriter,
+    workers: int,
+    batch_size: int,
+    checkpoint: Optional[str] = None,
+) -> int:
+    """
+    Render receipts of all checks matching the filters.
+
+    Up to two pages per worker are rendered while the next pages are read.
+    Pages are written in the order they were read, so every check before
+    the saved checkpoint has its receipt written.
+
+    :param filters: check filters.
+    :param writer: receipt writer.
+    :param workers: number of worker processes.
+    :param batch_size: number of checks in a page.
+    :param checkpoint: checkpoint file path.
+
+    :return: number of rendered receipts.
+    """
+    loop = asyncio.get_running_loop()
+    rendered = 0
+    started_at = time.perf_counter()
+    pending = deque()
+
+    async def write_oldest() -> None:
+        nonlocal rendered
+        future, position = pending.popleft()
+        receipts = await future
+        writer.write(receipts)
+        write_checkpoint(checkpoint, position)
+        rendered += len(receipts)
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"{rendered} receipts, {rendered / elapsed:.0f} receipts/s",
+            file=sys.stderr,
+        )
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            batches = read_batches(filters, batch_size, read_checkpoint(checkpoint))
+            async for checks, position in batches:
+                future = loop.run_in_executor(executor, render_batch, checks)
+                pending.append((future, position))
+                if len(pending) >= workers * 2:
+                    await write_oldest()
+            while pending:
+                await write_oldest()
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+    return rendered
+
+
+def parse_date(value: str) -> datetime:
+    """
+    Parse a `YYYY-MM-DD` date argument.
+
+    :param value: date in `YYYY-MM-DD` format.
+
+    :return: start of the day.
+    """
+    try:
+        return datetime.combine(date.fromisoformat(value), day_start())
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date {value!r}, expected YYYY-MM-DD."
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser of the bulk render job.
+
+    :return: argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.checks.bulk_render",
+        description="Render check receipts to static HTML files.",
+    )
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="output directory, or a .zip or .tar archive",
+    )
+    parser.add_argument("--user-id", type=int, help="render checks of one user only")
+    parser.add_argument(
+        "--from",
+        dest="created_from",
+        type=parse_date,
+        help="first day of checks in YYYY-MM-DD format (UTC)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="created_to",
+        type=parse_date,
+        help="first day after the checks in YYYY-MM-DD format (UTC)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of rendering processes",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="number of checks read and rendered at once",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="file to save progress to and resume from",
+    )
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    """
+    Run the bulk render job.
+
+    :param args: parsed command line arguments.
+
+    :return: number of rendered receipts.
+    """
+    filters = {
+        "user_id": args.user_id,
+        "created_at__gte": args.created_from,
+        "created_at__lt": args.created_to,
+    }
+    writer = ReceiptWriter(args.output)
+    try:
+        return await render_receipts(
+            filters, writer, args.workers, args.batch_size, args.checkpoint
+        )
+    finally:
+        writer.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Entry point of the bulk render job.
+
+    :param argv: command line arguments.
+    """
+    args = build_parser().parse_args(argv)
+    started_at = time.perf_counter()
+    rendered = asyncio.run(run(args))
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"{rendered} receipts rendered in {elapsed:.1f} s, "
+        f"{rendered / elapsed if elapsed else 0:.0f} receipts/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
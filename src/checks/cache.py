@@ -0,0 +1,246 @@
+import importlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from src.config import settings
+
+
+class ReceiptCacheBackend(ABC):
+    """
+    Abstract class for rendered receipt cache backends.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+
+class InMemoryReceiptCache(ReceiptCacheBackend):
+    """
+    In-process LRU cache of rendered receipts bounded by total size in bytes.
+
+    Attributes:
+        max_bytes (int): Maximum total size of cached receipts.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not found in the cache.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Get rendered receipt.
+
+        :param key: public UUID of the check.
+
+        :return: rendered receipt or None if it is not cached.
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        Cache rendered receipt, evicting least recently used ones over budget.
+
+        :param key: public UUID of the check.
+        :param value: rendered receipt.
+        """
+        if len(value) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+
+        self._entries[key] = value
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        :return: dictionary with cache size, hits and misses.
+        """
+        return {
+            "size": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class ReceiptCache(ReceiptCacheBackend):
+    """
+    Rendered receipt cache with an in-process LRU in front of an optional
+    shared backend (for example Redis or memcached) used by all workers.
+
+    Attributes:
+        local (InMemoryReceiptCache): In-process cache.
+        shared (ReceiptCacheBackend): Optional shared cache backend.
+    """
+
+    def __init__(
+        self,
+        local: InMemoryReceiptCache,
+        shared: Optional[ReceiptCacheBackend] = None,
+    ) -> None:
+        self.local = local
+        self.shared = shared
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Get rendered receipt from the local cache, then from the shared one.
+
+        :param key: public UUID of the check.
+
+        :return: rendered receipt or None if it is not cached.
+        """
+        value = await self.local.get(key)
+        if value is None and self.shared is not None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        Cache rendered receipt in the local and the shared cache.
+
+        :param key: public UUID of the check.
+        :param value: rendered receipt.
+        """
+        await self.local.set(key, value)
+        if self.shared is not None:
+            await self.shared.set(key, value)
+
+
+def load_shared_backend(path: Optional[str]) -> Optional[ReceiptCacheBackend]:
+    """
+    Load shared cache backend from a dotted path like `package.module:ClassName`.
+
+    :param path: dotted path of a ReceiptCacheBackend subclass.
+
+    :return: backend instance or None if path is not set.
+    """
+    if not path:
+        return None
+
+    module_name, _, class_name = path.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+class StoredResponse(NamedTuple):
+    """
+    Response stored for an idempotency key.
+
+    Attributes:
+        request_hash (str): SHA-256 of the request body.
+        response (str): JSON of the response.
+    """
+
+    request_hash: str
+    response: str
+
+
+class IdempotencyCache:
+    """
+    In-process LRU cache of responses stored for idempotency keys.
+
+    Entries expire after `ttl` seconds, the database stays the source of
+    truth shared by all workers.
+
+    Attributes:
+        max_entries (int): Maximum number of cached responses.
+        ttl (float): Seconds a response is cached for.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not found in the cache.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, StoredResponse]] = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Optional[StoredResponse]:
+        """
+        Get stored response.
+
+        :param key: user ID and idempotency key.
+
+        :return: stored response or None if it is not cached or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: StoredResponse) -> None:
+        """
+        Cache stored response, evicting the least recently used one over size.
+
+        :param key: user ID and idempotency key.
+        :param value: stored response.
+        """
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        :return: dictionary with cache size, hits and misses.
+        """
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+receipt_cache = ReceiptCache(
+    local=InMemoryReceiptCache(max_bytes=settings.RECEIPT_CACHE_MAX_BYTES),
+    shared=load_shared_backend(settings.RECEIPT_CACHE_SHARED_BACKEND),
+)
+
+idempotency_cache = IdempotencyCache(
+    max_entries=settings.CHECKS_IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.CHECKS_IDEMPOTENCY_CACHE_TTL,
+)
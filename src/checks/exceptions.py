@@ -2,3 +2,27 @@ class CheckNotFound(Exception):
     """Exception raised when a check is not found."""
 
     pass
+
+
+class InvalidCursor(Exception):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+class InsufficientPayment(Exception):
+    """Exception raised when a payment amount is less than the check total."""
+
+    pass
+
+
+class IdempotencyKeyMismatch(Exception):
+    """Exception raised when an idempotency key is reused for another request."""
+
+    pass
+
+
+class IdempotencyKeyConflict(Exception):
+    """Exception raised when an idempotency key is stored by another request."""
+
+    pass
@@ -0,0 +1,298 @@
+"""
+Maintenance commands of the checks tables.
+
+`checks` and `check_items` are range partitioned by check creation month.
+There is no default partition, so partitions must exist before checks of a
+month are created: run `create-partitions` periodically (e.g. daily from
+cron) to keep `CHECKS_PARTITIONS_AHEAD` months of partitions ready.
+
+Old months can be detached into standalone tables to be archived or dropped
+without deleting rows from the live tables.
+
+Expired idempotency keys of `POST /checks` are deleted by
+`purge-idempotency-keys`, which should also run periodically.
+
+Usage:
+    python -m src.checks.maintenance create-partitions [--months-ahead 3] [--start 2025-01]
+    python -m src.checks.maintenance detach-partitions --before 2024-01 [--concurrently]
+    python -m src.checks.maintenance purge-idempotency-keys [--batch-size 10000]
+"""
+
+import argparse
+import asyncio
+import re
+from datetime import date, datetime, UTC
+from typing import Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.config import settings
+from src.database import engine
+
+# Partitioned tables and their partition keys. Items reference checks, so they
+# are detached first.
+PARTITIONED_TABLES = (
+    ("check_items", "check_created_at"),
+    ("checks", "created_at"),
+)
+PARTITION_NAME_PATTERN = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """
+    Get the first day of the month of the date.
+
+    :param value: date.
+
+    :return: first day of the month.
+    """
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    """
+    Get the first day of the month `months` months after the month of the date.
+
+    :param value: date.
+    :param months: number of months to add, can be negative.
+
+    :return: first day of the month.
+    """
+    month = value.year * 12 + value.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def parse_month(value: str) -> date:
+    """
+    Parse a `YYYY-MM` month argument.
+
+    :param value: month in `YYYY-MM` format.
+
+    :return: first day of the month.
+    """
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid month {value!r}, expected YYYY-MM.")
+
+
+def partition_name(table: str, month: date) -> str:
+    """
+    Get the name of the partition of the table holding the month.
+
+    :param table: partitioned table.
+    :param month: first day of the month.
+
+    :return: partition name.
+    """
+    return f"{table}_p{month:%Y_%m}"
+
+
+async def list_partitions(connection: AsyncConnection, table: str) -> list[date]:
+    """
+    List the months of attached monthly partitions of the table.
+
+    :param connection: database connection.
+    :param table: partitioned table.
+
+    :return: sorted first days of partition months.
+    """
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    months = []
+    for name in result.scalars():
+        match = PARTITION_NAME_PATTERN.search(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+async def create_partitions(
+    connection: AsyncConnection, start: date, months: int
+) -> list[str]:
+    """
+    Create missing monthly partitions of the checks tables.
+
+    :param connection: database connection.
+    :param start: first month to create.
+    :param months: number of months to create.
+
+    :return: names of created partitions.
+    """
+    created = []
+    for table, _ in reversed(PARTITIONED_TABLES):
+        existing = set(await list_partitions(connection, table))
+        for offset in range(months):
+            month = add_months(start, offset)
+            if month in existing:
+                continue
+
+            name = partition_name(table, month)
+            await connection.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+                )
+            )
+            created.append(name)
+    return created
+
+
+async def detach_partitions(
+    connection: AsyncConnection, before: date, concurrently: bool = False
+) -> list[str]:
+    """
+    Detach monthly partitions of the checks tables older than the month.
+
+    Detached partitions stay in the database as standalone tables.
+    Detaching concurrently only takes a SHARE UPDATE EXCLUSIVE lock on the
+    parent table, but can not run in a transaction block.
+
+    :param connection: database connection.
+    :param before: first month to keep.
+    :param concurrently: detach with `DETACH PARTITION ... CONCURRENTLY`.
+
+    :return: names of detached partitions.
+    """
+    detached = []
+    for table, _ in PARTITIONED_TABLES:
+        for month in await list_partitions(connection, table):
+            if month >= before:
+                continue
+
+            name = partition_name(table, month)
+            option = " CONCURRENTLY" if concurrently else ""
+            await connection.execute(
+                text(f"ALTER TABLE {table} DETACH PARTITION {name}{option}")
+            )
+            detached.append(name)
+    return detached
+
+
+async def purge_idempotency_keys(
+    connection: AsyncConnection, batch_size: int = 10000
+) -> int:
+    """
+    Delete expired idempotency keys in batches.
+
+    Every batch is a separate statement, so with an autocommit connection
+    row locks are held only while one batch is deleted.
+
+    :param connection: database connection.
+    :param batch_size: maximum number of keys deleted by one statement.
+
+    :return: number of deleted keys.
+    """
+    deleted = 0
+    while True:
+        result = await connection.execute(
+            text(
+                "DELETE FROM check_idempotency_keys WHERE ctid IN ("
+                "SELECT ctid FROM check_idempotency_keys "
+                "WHERE expires_at <= now() LIMIT :batch_size)"
+            ),
+            {"batch_size": batch_size},
+        )
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser of maintenance commands.
+
+    :return: argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.checks.maintenance",
+        description="Maintenance commands of the checks tables.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser(
+        "create-partitions",
+        help="create monthly partitions of the checks tables in advance",
+    )
+    create.add_argument(
+        "--start",
+        type=parse_month,
+        default=None,
+        help="first month to create in YYYY-MM format, the current month by default",
+    )
+    create.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.CHECKS_PARTITIONS_AHEAD,
+        help="number of months after the first month to create",
+    )
+
+    detach = commands.add_parser(
+        "detach-partitions",
+        help="detach monthly partitions of the checks tables older than a month",
+    )
+    detach.add_argument(
+        "--before",
+        type=parse_month,
+        required=True,
+        help="first month to keep in YYYY-MM format",
+    )
+    detach.add_argument(
+        "--concurrently",
+        action="store_true",
+        help="detach without blocking queries on the tables",
+    )
+
+    purge = commands.add_parser(
+        "purge-idempotency-keys",
+        help="delete expired idempotency keys of created checks",
+    )
+    purge.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="maximum number of keys deleted by one statement",
+    )
+    return parser
+
+
+async def run(args: argparse.Namespace) -> list[str]:
+    """
+    Run the maintenance command.
+
+    :param args: parsed command line arguments.
+
+    :return: names of changed tables or a summary of deleted rows.
+    """
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        if args.command == "create-partitions":
+            start = args.start or month_start(datetime.now(UTC).date())
+            return await create_partitions(connection, start, args.months_ahead + 1)
+        if args.command == "purge-idempotency-keys":
+            deleted = await purge_idempotency_keys(connection, args.batch_size)
+            return [f"check_idempotency_keys: {deleted} expired keys deleted"]
+        return await detach_partitions(connection, args.before, args.concurrently)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Entry point of maintenance commands.
+
+    :param argv: command line arguments.
+    """
+    args = build_parser().parse_args(argv)
+    for name in asyncio.run(run(args)):
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Integer, TIMESTAMP, func, Enum, Numeric, String, ForeignKey
+from sqlalchemy import (
+    Integer,
+    TIMESTAMP,
+    Date,
+    func,
+    Enum,
+    Numeric,
+    inspect,
+    String,
+    Text,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,14 +34,18 @@ class Check(Base):
         total (Decimal): Total amount of the check.
         rest (Decimal): Remaining amount of the check.
         created_at (datetime): Timestamp when the check was created.
+
+    The table is range partitioned by `created_at` month, so `created_at` is
+    a part of the primary key. Partitions are managed by
+    `src.checks.maintenance`.
     """
 
     __tablename__ = "checks"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[int] = mapped_column(
         Integer,
         primary_key=True,
-        unique=True,
         index=True,
         autoincrement=True,
     )
@@ -41,35 +58,57 @@ class Check(Base):
     rest: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     public_uuid: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        unique=True,
         index=True,
         server_default=func.gen_random_uuid(),
     )
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        primary_key=True,
+        server_default=func.now(),
+    )
 
-    user: Mapped["User"] = relationship("User", back_populates="checks")
-    items: Mapped[list["CheckItem"]] = relationship("CheckItem", back_populates="check")
+    user: Mapped["User"] = relationship("User", back_populates="checks", lazy="raise")
+    items: Mapped[list["CheckItem"]] = relationship(
+        "CheckItem", back_populates="check", lazy="raise"
+    )
 
     def as_dict(self, **kwargs) -> dict:
         data = super().as_dict()
         include_products = kwargs.get("include_products", False)
-        if include_products and hasattr(self, "items") and self.items:
+        if include_products and "items" not in inspect(self).unloaded and self.items:
             data["products"] = [item.as_dict() for item in self.items]
         return data
 
 
+Index(
+    "ix_checks_user_id_created_at_id",
+    Check.user_id,
+    Check.created_at.desc(),
+    Check.id.desc(),
+)
+
+
 class CheckItem(Base):
     """
     Check item model.
+
+    Items are partitioned like their checks, by `check_created_at` month.
     """
 
     __tablename__ = "check_items"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["check_id", "check_created_at"],
+            ["checks.id", "checks.created_at"],
+            onupdate="CASCADE",
+        ),
+        {"postgresql_partition_by": "RANGE (check_created_at)"},
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
         primary_key=True,
-        unique=True,
         index=True,
         autoincrement=True,
     )
@@ -77,6 +116,70 @@ class CheckItem(Base):
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     total: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    check_id: Mapped[int] = mapped_column(ForeignKey("checks.id"), nullable=False)
+    check_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    check_created_at: Mapped[datetime] = mapped_column(TIMESTAMP, primary_key=True)
+
+    check: Mapped["Check"] = relationship("Check", back_populates="items", lazy="raise")
+
+
+class CheckSummary(Base):
+    """
+    Daily check summary model.
+
+    One row aggregates the checks of a user created on one day (UTC) with one
+    payment method. Rows are upserted in the same transaction that creates
+    the checks, so they always match the `checks` table.
+
+    Attributes:
+        user_id (int): Owner of the checks.
+        day (date): Day the checks were created on.
+        type (PaymentMethod): Payment method of the checks.
+        count (int): Number of checks.
+        amount (Decimal): Sum of paid amounts.
+        total (Decimal): Sum of check totals.
+        rest (Decimal): Sum of remaining amounts.
+    """
+
+    __tablename__ = "check_summaries"
 
-    check: Mapped["Check"] = relationship("Check", back_populates="items")
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    type: Mapped[PaymentMethod] = mapped_column(
+        Enum(PaymentMethod, name="payment_method_enum"),
+        primary_key=True,
+    )
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    rest: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+
+
+class CheckIdempotencyKey(Base):
+    """
+    Idempotency key of a check creation request.
+
+    The stored response is returned for retries of the request with the same
+    key until the key expires. Expired keys are deleted by
+    `src.checks.maintenance`.
+
+    Attributes:
+        user_id (int): User the key belongs to.
+        key (str): Value of the `Idempotency-Key` header.
+        request_hash (str): SHA-256 of the request body.
+        response (str): JSON of the created check.
+        created_at (datetime): Timestamp when the check was created.
+        expires_at (datetime): Timestamp after which the key can be reused.
+    """
+
+    __tablename__ = "check_idempotency_keys"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        nullable=False,
+        server_default=func.now(),
+    )
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False, index=True)
@@ -0,0 +1,126 @@
+"""
+Receipt rendering.
+
+The receipt template is loaded and compiled once, when the module is
+imported. Compiled bytecode is stored in a `FileSystemBytecodeCache`, so
+other workers and later starts load it instead of compiling the template
+again. With `RECEIPT_TEMPLATE_AUTO_RELOAD` off the template file is not
+checked for changes on every lookup.
+
+`render_receipt` has no request or database dependencies, so it can be
+used by batch jobs and benchmarked on its own.
+"""
+
+import hashlib
+import os
+import time
+from typing import Iterator
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from src.checks.schemas import CheckResponse
+from src.config import BASE_DIR, settings
+from src.metrics.registry import registry
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+RECEIPT_TEMPLATE = "check.html"
+
+
+def build_environment() -> Environment:
+    """
+    Build the Jinja environment of receipt templates from settings.
+
+    :return: Jinja environment.
+    """
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=settings.RECEIPT_TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=FileSystemBytecodeCache(
+            settings.RECEIPT_TEMPLATE_BYTECODE_CACHE_DIR or None
+        ),
+    )
+
+
+def template_version(environment: Environment, name: str) -> str:
+    """
+    Get the fingerprint of the template source.
+
+    :param environment: Jinja environment.
+    :param name: template name.
+
+    :return: 12 hex characters of the SHA-256 of the source.
+    """
+    source, _, _ = environment.loader.get_source(environment, name)
+    return hashlib.sha256(source.encode()).hexdigest()[:12]
+
+
+def receipt_context(check: CheckResponse) -> dict:
+    """
+    Build the receipt template context.
+
+    :param check: check to render.
+
+    :return: template context.
+    """
+    return {
+        "check": check,
+        "created_at": check.created_at.strftime("%d.%m.%Y %H:%M"),
+        "payment_type": check.payment.type.value.capitalize(),
+    }
+
+
+def render_receipt(check: CheckResponse, template: Template = None) -> bytes:
+    """
+    Render the receipt of a check.
+
+    :param check: check to render.
+    :param template: receipt template, the precompiled one by default.
+
+    :return: UTF-8 encoded HTML.
+    """
+    template = template or receipt_template
+    started_at = time.perf_counter()
+    content = template.render(receipt_context(check)).encode()
+    render_duration.observe(time.perf_counter() - started_at)
+    return content
+
+
+def iter_receipt(
+    check: CheckResponse, chunk_size: int = None, template: Template = None
+) -> Iterator[bytes]:
+    """
+    Render the receipt of a check in chunks.
+
+    The template is rendered lazily with `Template.generate`, and the small
+    pieces it yields are joined into chunks of about `chunk_size` bytes, so
+    large baskets are sent while they are rendered.
+
+    :param check: check to render.
+    :param chunk_size: minimum size of a chunk before it is yielded.
+    :param template: receipt template, the precompiled one by default.
+
+    :return: iterator over UTF-8 encoded chunks of HTML.
+    """
+    template = template or receipt_template
+    chunk_size = chunk_size or settings.RECEIPT_STREAM_CHUNK_SIZE
+
+    pieces, size = [], 0
+    for piece in template.generate(receipt_context(check)):
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pieces).encode()
+            pieces, size = [], 0
+    if pieces:
+        yield "".join(pieces).encode()
+
+
+render_duration = registry.histogram(
+    "receipt_render_duration_seconds",
+    "Time spent rendering a whole receipt, streamed receipts are not included.",
+)
+
+environment = build_environment()
+receipt_template = environment.get_template(RECEIPT_TEMPLATE)
+receipt_template_version = template_version(environment, RECEIPT_TEMPLATE)
@@ -1,9 +1,40 @@
-from sqlalchemy import insert, select, and_
-from sqlalchemy.orm import joinedload
+import time
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Optional, Sequence
 
-from src.checks.models import Check, CheckItem
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    Interval,
+    Row,
+    Select,
+    String,
+    Text,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+
+from src.checks.models import Check, CheckIdempotencyKey, CheckItem, CheckSummary
+from src.checks.schemas import PaymentMethod
+from src.config import settings
+from src.database import record_query
 from src.repository import SQLAlchemyRepository
 
+# `to_char` pattern matching `format_created_at`.
+JSON_CREATED_AT_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS"Z"'
+
 
 class CheckRepository(SQLAlchemyRepository):
     """
@@ -11,52 +42,451 @@ class CheckRepository(SQLAlchemyRepository):
     """
 
     model = Check
+    projection_columns = (
+        Check.id,
+        Check.public_uuid,
+        Check.type,
+        Check.amount,
+        Check.total,
+        Check.rest,
+        Check.created_at,
+    )
+
+    @staticmethod
+    def build_parameters(
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> dict:
+        """
+        Build statement parameters of a check listing.
+
+        Filters without a value are left out, so the parameter names identify
+        the statement to execute.
 
-    def _build_filters(self, filters: dict) -> list:
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: Parameters.
         """
-        Build filters.
+        parameters = {key: value for key, value in data.items() if value is not None}
+        if limit is not None:
+            parameters["limit"] = limit
+        if after is not None:
+            parameters["after_created_at"], parameters["after_id"] = after
+        return parameters
 
-        :param filters: Filters.
+    def _build_filters(self, keys: tuple[str, ...]) -> list:
+        """
+        Build filters bound to the parameters of the given names.
+
+        :param keys: Parameter names of `build_parameters`.
         :return: Filters.
         """
         query_filters = []
+        if "after_created_at" in keys:
+            query_filters.append(
+                tuple_(self.model.created_at, self.model.id)
+                < tuple_(
+                    bindparam("after_created_at", type_=self.model.created_at.type),
+                    bindparam("after_id", type_=self.model.id.type),
+                )
+            )
 
-        for key, value in filters.items():
-            if value is None:
+        for key in keys:
+            field, _, operator = key.partition("__")
+            column = getattr(self.model, field, None)
+            if column is None:
                 continue
 
-            if "__" in key:
-                field, operator = key.split("__", 1)
-                column = getattr(self.model, field, None)
-                if column is not None:
-                    if operator == "gte":
-                        query_filters.append(column >= value)
-                    elif operator == "lt":
-                        query_filters.append(column < value)
-            else:
-                column = getattr(self.model, key, None)
-                if column is not None:
-                    query_filters.append(column == value)
+            if not operator:
+                query_filters.append(column == bindparam(key))
+            elif operator == "gte":
+                query_filters.append(column >= bindparam(key))
+            elif operator == "lt":
+                query_filters.append(column < bindparam(key))
 
         return query_filters
 
-    async def get_by_data(self, data: dict) -> list[dict]:
+    @staticmethod
+    def _build_limit(keys: tuple[str, ...]):
+        """
+        Build the LIMIT bound to the `limit` parameter, if it is given.
+
+        :param keys: Parameter names of `build_parameters`.
+        :return: LIMIT clause or None.
+        """
+        return bindparam("limit", type_=Integer) if "limit" in keys else None
+
+    def build_statement(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[Select, dict]:
+        """
+        Build the check listing statement.
+
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: select statement and its parameters.
+        """
+        parameters = self.build_parameters(data, limit=limit, after=after)
+        statement = self.cached_statement(
+            "listing",
+            parameters,
+            lambda keys: (
+                select(self.model)
+                .filter(and_(*self._build_filters(keys)))
+                .options(selectinload(self.model.items))
+                .order_by(self.model.created_at.desc(), self.model.id.desc())
+                .limit(self._build_limit(keys))
+            ),
+        )
+        return statement, parameters
+
+    def build_projection_statement(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[Select, dict]:
+        """
+        Build the check listing statement selecting only response columns.
+
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: select statement and its parameters.
+        """
+        parameters = self.build_parameters(data, limit=limit, after=after)
+        statement = self.cached_statement(
+            "projection",
+            parameters,
+            lambda keys: (
+                select(*self.projection_columns)
+                .filter(and_(*self._build_filters(keys)))
+                .order_by(self.model.created_at.desc(), self.model.id.desc())
+                .limit(self._build_limit(keys))
+            ),
+        )
+        return statement, parameters
+
+    def build_items_statement(
+        self,
+        check_ids: list[int],
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> tuple[Select, dict]:
+        """
+        Build the statement selecting response columns of items of the checks.
+
+        The creation range of the checks limits the scan to the item
+        partitions of their months. Check IDs are passed as one array, so the
+        SQL text does not depend on the number of checks.
+
+        :param check_ids: IDs of the checks.
+        :param created_from: Creation date of the oldest check.
+        :param created_to: Creation date of the newest check.
+        :return: select statement and its parameters.
+        """
+        parameters = {"check_ids": check_ids}
+        if created_from is not None:
+            parameters["created_from"] = created_from
+        if created_to is not None:
+            parameters["created_to"] = created_to
+
+        def build(keys: tuple[str, ...]) -> Select:
+            query_filters = [
+                CheckItem.check_id
+                == any_(bindparam("check_ids", type_=ARRAY(CheckItem.check_id.type)))
+            ]
+            if "created_from" in keys:
+                query_filters.append(
+                    CheckItem.check_created_at >= bindparam("created_from")
+                )
+            if "created_to" in keys:
+                query_filters.append(
+                    CheckItem.check_created_at <= bindparam("created_to")
+                )
+
+            return (
+                select(*CheckItemRepository.projection_columns)
+                .filter(and_(*query_filters))
+                .order_by(CheckItem.check_id, CheckItem.id)
+            )
+
+        return self.cached_statement("items", parameters, build), parameters
+
+    def build_json_statement(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[Select, dict]:
+        """
+        Build the check listing statement returning every check as one JSON
+        document in the `CheckResponse` format.
+
+        Products are aggregated with `json_agg` in a subquery correlated by
+        `check_id`, so the page is limited before any items are read.
+
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: select statement of `document`, `created_at` and `id` and its
+            parameters.
+        """
+        parameters = self.build_parameters(data, limit=limit, after=after)
+        statement = self.cached_statement(
+            "json", parameters, self._build_json_statement
+        )
+        return statement, parameters
+
+    def _build_json_statement(self, keys: tuple[str, ...]) -> Select:
+        """
+        Build the JSON listing statement for parameters of the given names.
+
+        :param keys: Parameter names of `build_parameters`.
+        :return: select statement.
+        """
+        product = func.json_build_object(
+            literal("name"),
+            CheckItem.name,
+            literal("price"),
+            cast(CheckItem.price, Float),
+            literal("quantity"),
+            CheckItem.quantity,
+        )
+        products = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(product, CheckItem.id)),
+                    cast(literal("[]"), JSON),
+                )
+            )
+            .filter(
+                CheckItem.check_id == self.model.id,
+                CheckItem.check_created_at == self.model.created_at,
+            )
+            .scalar_subquery()
+        )
+        payment_type = case(
+            *((self.model.type == method, method.value) for method in PaymentMethod)
+        )
+        document = func.json_build_object(
+            literal("id"),
+            self.model.id,
+            literal("public_uuid"),
+            self.model.public_uuid,
+            literal("products"),
+            products,
+            literal("payment"),
+            func.json_build_object(
+                literal("type"),
+                payment_type,
+                literal("amount"),
+                cast(self.model.amount, Float),
+            ),
+            literal("total"),
+            cast(self.model.total, Float),
+            literal("rest"),
+            cast(self.model.rest, Float),
+            literal("created_at"),
+            func.to_char(self.model.created_at, JSON_CREATED_AT_FORMAT),
+        )
+
+        return (
+            select(
+                # Read as text so the driver passes the document through undecoded.
+                cast(document, Text).label("document"),
+                self.model.created_at,
+                self.model.id,
+            )
+            .filter(and_(*self._build_filters(keys)))
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
+            .limit(self._build_limit(keys))
+        )
+
+    def build_export_statement(self, data: dict) -> tuple[Select, dict]:
+        """
+        Build the export statement returning one row per check item.
+
+        Rows of a check are adjacent and ordered by item ID, checks are
+        ordered from newest to oldest as in the listing.
+
+        :param data: Check data.
+        :return: select statement and its parameters.
+        """
+        parameters = self.build_parameters(data)
+        statement = self.cached_statement(
+            "export", parameters, self._build_export_statement
+        )
+        return statement, parameters
+
+    def _build_export_statement(self, keys: tuple[str, ...]) -> Select:
+        """
+        Build the export statement for parameters of the given names.
+
+        :param keys: Parameter names of `build_parameters`.
+        :return: select statement.
+        """
+        return (
+            select(
+                *self.projection_columns,
+                CheckItem.name,
+                CheckItem.price,
+                CheckItem.quantity,
+            )
+            .outerjoin(
+                CheckItem,
+                and_(
+                    CheckItem.check_id == self.model.id,
+                    CheckItem.check_created_at == self.model.created_at,
+                ),
+            )
+            .filter(and_(*self._build_filters(keys)))
+            .order_by(self.model.created_at.desc(), self.model.id.desc(), CheckItem.id)
+        )
+
+    async def stream_export(
+        self, data: dict, fetch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream export rows by data with a server-side cursor.
+
+        At most `fetch_size` rows are held in memory at once, so the memory
+        use does not depend on the number of exported checks.
+
+        :param data: Check data.
+        :param fetch_size: Number of rows fetched from the cursor at once.
+        :return: async iterator over partitions of export rows.
+        """
+        statement, parameters = self.build_export_statement(data)
+        result = await self.session.stream(
+            statement, parameters, execution_options={"yield_per": fetch_size}
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_by_data(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> list[dict]:
         """
         Get check by data.
 
+        Checks are ordered from newest to oldest by `(created_at, id)`, so the
+        keyset position of the last returned check can be passed back as `after`
+        to read the next page without an OFFSET scan.
+
         :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
         :return: check.
         """
-        query_filters = self._build_filters(data)
+        statement, parameters = self.build_statement(data, limit=limit, after=after)
+        result = await self.session.execute(statement, parameters)
+        checks = result.scalars().all()
+        return [check.as_dict(include_products=True) for check in checks]
 
-        statement = (
-            select(self.model)
-            .filter(and_(*query_filters))
-            .options(joinedload(self.model.items))
+    async def get_rows(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[Sequence[Row], Sequence[Row]]:
+        """
+        Get rows of checks and their items by data without ORM objects.
+
+        Checks are selected first and their items are fetched with one `IN`
+        query. Only the columns needed for the check response are selected
+        and rows are not added to the session identity map.
+
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: check rows and item rows ordered by check.
+        """
+        statement, parameters = self.build_projection_statement(
+            data, limit=limit, after=after
         )
-        result = await self.session.execute(statement)
-        checks = result.unique().scalars().all()
-        return [check.as_dict(include_products=True) for check in checks]
+        checks = (await self.session.execute(statement, parameters)).all()
+        if not checks:
+            return checks, []
+
+        statement, parameters = self.build_items_statement(
+            [check.id for check in checks],
+            created_from=min(check.created_at for check in checks),
+            created_to=max(check.created_at for check in checks),
+        )
+        items = (await self.session.execute(statement, parameters)).all()
+        return checks, items
+
+    async def get_json(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> Sequence[Row]:
+        """
+        Get checks by data as JSON documents built by the database.
+
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: rows of `document`, `created_at` and `id`.
+        """
+        statement, parameters = self.build_json_statement(
+            data, limit=limit, after=after
+        )
+        result = await self.session.execute(statement, parameters)
+        return result.all()
+
+    async def get_projection(
+        self,
+        data: dict,
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> list[dict]:
+        """
+        Get checks by data without loading ORM objects.
+
+        :param data: Check data.
+        :param limit: Maximum number of checks to return.
+        :param after: Keyset position `(created_at, id)` to continue from.
+        :return: checks with products.
+        """
+        checks, items = await self.get_rows(data, limit=limit, after=after)
+
+        products = {check.id: [] for check in checks}
+        for item in items:
+            products[item.check_id].append(
+                {"name": item.name, "price": item.price, "quantity": item.quantity}
+            )
+
+        return [{**check._asdict(), "products": products[check.id]} for check in checks]
+
+    async def bulk_add(self, data: list) -> list[dict]:
+        """
+        Bulk add checks to database in one statement.
+
+        :param data: Check data.
+        :return: added checks in the same order as data.
+        """
+        statement = self.cached_statement(
+            "bulk_add",
+            {},
+            lambda _: insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            ),
+        )
+        result = await self.session.execute(statement, data)
+        all_result = result.scalars().all()
+        return [check.as_dict() for check in all_result]
 
 
 class CheckItemRepository(SQLAlchemyRepository):
@@ -65,15 +495,261 @@ class CheckItemRepository(SQLAlchemyRepository):
     """
 
     model = CheckItem
+    projection_columns = (
+        CheckItem.check_id,
+        CheckItem.name,
+        CheckItem.price,
+        CheckItem.quantity,
+    )
+
+    copy_columns = (
+        "name",
+        "price",
+        "quantity",
+        "total",
+        "check_id",
+        "check_created_at",
+    )
 
     async def bulk_add(self, data: list) -> list[dict]:
         """
         Bulk add check items to database.
 
+        Lists with at least `CHECK_ITEMS_COPY_THRESHOLD` items are written with
+        binary COPY, smaller ones with INSERT ... RETURNING.
+
         :param data: Check item data.
         :return: added check items.
         """
-        statement = insert(self.model).values(data).returning(self.model)
-        result = await self.session.execute(statement)
+        if len(data) >= settings.CHECK_ITEMS_COPY_THRESHOLD:
+            return await self.copy_add(data)
+        return await self.insert_add(data)
+
+    async def insert_add(self, data: list) -> list[dict]:
+        """
+        Add check items with INSERT ... RETURNING.
+
+        :param data: Check item data.
+        :return: added check items.
+        """
+        statement = self.cached_statement(
+            "bulk_add",
+            {},
+            lambda _: insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            ),
+        )
+        result = await self.session.execute(statement, data)
         all_result = result.scalars().all()
         return [item.as_dict() for item in all_result]
+
+    async def copy_add(self, data: list) -> list[dict]:
+        """
+        Add check items with asyncpg binary COPY on the session connection.
+
+        The rows are written in the current transaction, but generated IDs are
+        not returned, so the result is the input data.
+
+        :param data: Check item data.
+        :return: added check items without IDs.
+        """
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        records = [tuple(item[column] for column in self.copy_columns) for item in data]
+
+        # COPY bypasses the cursor events, so its time is recorded here.
+        started_at = time.perf_counter()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.model.__tablename__, records=records, columns=self.copy_columns
+        )
+        record_query(
+            f"COPY {self.model.__tablename__} ({', '.join(self.copy_columns)})",
+            time.perf_counter() - started_at,
+        )
+        return data
+
+
+class CheckSummaryRepository(SQLAlchemyRepository):
+    """
+    Check summary Repository class.
+    """
+
+    model = CheckSummary
+    sum_columns = ("count", "amount", "total", "rest")
+
+    async def upsert(self, data: list) -> None:
+        """
+        Add check sums to the summaries, creating missing summary rows.
+
+        Rows should be unique by `(user_id, day, type)` and sorted, so
+        concurrent transactions lock summary rows in the same order.
+
+        :param data: Summary data with sums to add.
+        """
+        statement = self.cached_statement("upsert", {}, self._build_upsert_statement)
+        await self.session.execute(statement, data)
+
+    def _build_upsert_statement(self, keys: tuple[str, ...]):
+        """
+        Build the statement adding sums to summary rows.
+
+        :param keys: Parameter names, unused.
+        :return: insert statement.
+        """
+        statement = pg_insert(self.model)
+        return statement.on_conflict_do_update(
+            index_elements=[self.model.user_id, self.model.day, self.model.type],
+            set_={
+                column: (
+                    getattr(self.model, column) + getattr(statement.excluded, column)
+                )
+                for column in self.sum_columns
+            },
+        )
+
+    def build_period_statement(
+        self,
+        user_id: int,
+        period: str,
+        day_from: Optional[date] = None,
+        day_to: Optional[date] = None,
+    ) -> Select:
+        """
+        Build the statement summing daily summaries by period and payment type.
+
+        :param user_id: User ID.
+        :param period: `date_trunc` field, one of `day`, `week` or `month`.
+        :param day_from: First day to include.
+        :param day_to: First day to exclude.
+        :return: select statement.
+        """
+        period_start = cast(func.date_trunc(period, self.model.day), Date)
+        query_filters = [self.model.user_id == user_id]
+        if day_from is not None:
+            query_filters.append(self.model.day >= day_from)
+        if day_to is not None:
+            query_filters.append(self.model.day < day_to)
+
+        return (
+            select(
+                period_start.label("period"),
+                self.model.type,
+                *(
+                    func.sum(getattr(self.model, column)).label(column)
+                    for column in self.sum_columns
+                ),
+            )
+            .filter(and_(*query_filters))
+            .group_by(period_start, self.model.type)
+            .order_by(period_start, self.model.type)
+        )
+
+    async def get_by_period(
+        self,
+        user_id: int,
+        period: str,
+        day_from: Optional[date] = None,
+        day_to: Optional[date] = None,
+    ) -> Sequence[Row]:
+        """
+        Get sums of checks by period and payment type.
+
+        :param user_id: User ID.
+        :param period: `date_trunc` field, one of `day`, `week` or `month`.
+        :param day_from: First day to include.
+        :param day_to: First day to exclude.
+        :return: rows of `period`, `type`, `count`, `amount`, `total` and `rest`.
+        """
+        statement = self.build_period_statement(user_id, period, day_from, day_to)
+        result = await self.session.execute(statement)
+        return result.all()
+
+
+class CheckIdempotencyKeyRepository(SQLAlchemyRepository):
+    """
+    Check idempotency key Repository class.
+    """
+
+    model = CheckIdempotencyKey
+
+    async def lock(self, user_id: int, key: str) -> None:
+        """
+        Lock an idempotency key until the end of the current transaction.
+
+        Concurrent requests with the same key wait here until the transaction
+        holding the lock commits or rolls back.
+
+        :param user_id: User ID.
+        :param key: Idempotency key.
+        """
+        statement = self.cached_statement(
+            "lock",
+            {},
+            lambda _: select(
+                func.pg_advisory_xact_lock(
+                    bindparam("user_id", type_=Integer),
+                    func.hashtext(bindparam("key", type_=String)),
+                )
+            ),
+        )
+        await self.session.execute(statement, {"user_id": user_id, "key": key})
+
+    async def get_active(self, user_id: int, key: str) -> Optional[Row]:
+        """
+        Get the stored response of an idempotency key that has not expired.
+
+        :param user_id: User ID.
+        :param key: Idempotency key.
+        :return: row of `request_hash` and `response` or None.
+        """
+        statement = self.cached_statement(
+            "active",
+            {},
+            lambda _: select(self.model.request_hash, self.model.response).filter(
+                self.model.user_id == bindparam("user_id"),
+                self.model.key == bindparam("key"),
+                self.model.expires_at > func.now(),
+            ),
+        )
+        result = await self.session.execute(statement, {"user_id": user_id, "key": key})
+        return result.one_or_none()
+
+    async def save(self, data: dict, ttl: timedelta) -> bool:
+        """
+        Store the response of an idempotency key, replacing an expired one.
+
+        Callers hold the `lock` of the key, so the insert only fails when an
+        active key was stored outside of it.
+
+        :param data: `user_id`, `key`, `request_hash` and `response`.
+        :param ttl: Time the key is stored for.
+        :return: whether the response was stored.
+        """
+        statement = self.cached_statement("save", {}, self._build_save_statement)
+        result = await self.session.execute(statement, {**data, "ttl": ttl})
+        return result.scalar_one_or_none() is not None
+
+    def _build_save_statement(self, keys: tuple[str, ...]):
+        """
+        Build the statement storing the response of an idempotency key.
+
+        :param keys: Parameter names, unused.
+        :return: insert statement.
+        """
+        statement = pg_insert(self.model).values(
+            user_id=bindparam("user_id"),
+            key=bindparam("key"),
+            request_hash=bindparam("request_hash"),
+            response=bindparam("response"),
+            expires_at=func.now() + bindparam("ttl", type_=Interval),
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[self.model.user_id, self.model.key],
+            set_={
+                "request_hash": statement.excluded.request_hash,
+                "response": statement.excluded.response,
+                "created_at": func.now(),
+                "expires_at": statement.excluded.expires_at,
+            },
+            where=self.model.expires_at <= func.now(),
+        ).returning(self.model.key)
@@ -1,12 +1,39 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import HTMLResponse
-from starlette.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
-from starlette.templating import Jinja2Templates
+from typing import Annotated, Any, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response, Body
+from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.status import (
+    HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    HTTP_422_UNPROCESSABLE_ENTITY,
+)
 
 from src.auth.dependencies import CurrentUser
-from src.checks.exceptions import CheckNotFound
-from src.checks.schemas import CheckCreate, CheckResponse, CheckFilter
+from src.checks.cache import receipt_cache
+from src.checks.exceptions import (
+    CheckNotFound,
+    IdempotencyKeyConflict,
+    IdempotencyKeyMismatch,
+    InvalidCursor,
+)
+from src.checks.rendering import iter_receipt, receipt_template_version, render_receipt
+from src.checks.schemas import (
+    CheckCreate,
+    CheckResponse,
+    CheckFilter,
+    CheckBatchResponse,
+    CheckExportFilter,
+    CheckSummaryFilter,
+    CheckSummaryResponse,
+    ExportFormat,
+)
 from src.checks.services import CheckService
+from src.checks.utils import etag_matches, receipt_etag
+from src.config import settings
 from src.dependencies import UOWDep
 
 router = APIRouter(
@@ -14,7 +41,12 @@ router = APIRouter(
     tags=["Checks"],
 )
 
-templates = Jinja2Templates(directory="templates")
+RECEIPT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
 
 
 @router.post("", response_model=CheckResponse, status_code=HTTP_201_CREATED)
@@ -22,23 +54,41 @@ async def create_check(
     uow: UOWDep,
     user: CurrentUser,
     check: CheckCreate,
+    response: Response,
+    idempotency_key: Annotated[Optional[str], Header(max_length=255)] = None,
 ) -> CheckResponse:
     """
     Create a new check.
 
+    With an `Idempotency-Key` header the check is created once: retries with
+    the same key and body return the created check with the
+    `Idempotent-Replayed: true` header.
+
     :param uow: Unit of Work dependency.
     :param user: current user information.
     :param check: check data to create.
+    :param response: response to add headers to.
+    :param idempotency_key: key identifying retries of the request.
     :return: created check data.
     """
     try:
         user_id = int(user["sub"])
-        created_check = await CheckService(uow).create_check(
-            user_id,
-            check.model_dump(),
+        if idempotency_key is None:
+            return await CheckService(uow).create_check(user_id, check.model_dump())
+
+        created_check, replayed = await CheckService(uow).create_check_once(
+            user_id, check.model_dump(), idempotency_key
         )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
         return created_check
 
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=HTTP_409_CONFLICT, detail=str(e))
+
     except Exception as e:
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST,
@@ -46,26 +96,82 @@ async def create_check(
         )
 
 
+@router.post(
+    "/batch",
+    response_model=CheckBatchResponse,
+    status_code=HTTP_201_CREATED,
+)
+async def create_checks(
+    uow: UOWDep,
+    user: CurrentUser,
+    checks: list[dict[str, Any]] = Body(...),
+) -> CheckBatchResponse:
+    """
+    Create a batch of checks.
+
+    Every check in the batch has the same format as in `POST /checks`. Invalid
+    checks are reported in `errors` by their position in the batch and do not
+    prevent the valid ones from being created.
+
+    :param uow: Unit of Work dependency.
+    :param user: current user information.
+    :param checks: list of checks to create.
+    :return: created checks and validation errors.
+    """
+    if len(checks) > settings.CHECKS_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch can contain at most {settings.CHECKS_BATCH_MAX_SIZE} checks.",
+        )
+
+    try:
+        user_id = int(user["sub"])
+        return await CheckService(uow).create_checks(user_id, checks)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"Error occurred while creating checks: {str(e)}",
+        )
+
+
 @router.get("", response_model=list[CheckResponse])
 async def get_check(
     uow: UOWDep,
     user: CurrentUser,
     filter_data: CheckFilter = Depends(),
-) -> list[CheckResponse]:
+) -> Response:
     """
     Get check by filters.
 
+    Checks are returned newest first in pages of at most `limit` items.
+    When more checks are available, the `X-Next-Cursor` response header
+    contains the cursor to pass as `cursor` to get the next page.
+
     :param uow: Unit of Work dependency.
     :param user: current user information.
     :param filter_data: filter data for check.
     :return: check data.
     """
     try:
-        filters = filter_data.model_dump()
+        filters = filter_data.model_dump(exclude={"limit", "cursor"})
         filters["user_id"] = int(user["sub"])
 
-        check = await CheckService(uow).get_check_by_filters(filters)
-        return check
+        content, next_cursor = await CheckService(uow).get_checks_page_json(
+            filters,
+            limit=filter_data.limit,
+            cursor=filter_data.cursor,
+        )
+        response = Response(content=content, media_type="application/json")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return response
+
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
     except CheckNotFound as e:
         raise HTTPException(
@@ -80,12 +186,75 @@ async def get_check(
         )
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_checks(
+    uow: UOWDep,
+    user: CurrentUser,
+    filter_data: CheckExportFilter = Depends(),
+) -> StreamingResponse:
+    """
+    Export all checks by filters.
+
+    Checks are streamed newest first as NDJSON (one check per line) or CSV
+    (one product per line) while they are read from the database.
+
+    :param uow: Unit of Work dependency.
+    :param user: current user information.
+    :param filter_data: filter data and format of the export.
+    :return: streamed export.
+    """
+    filters = filter_data.model_dump(exclude={"format"})
+    filters["user_id"] = int(user["sub"])
+
+    return StreamingResponse(
+        CheckService(uow).export_checks(filters, filter_data.format),
+        media_type=EXPORT_MEDIA_TYPES[filter_data.format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="checks.{filter_data.format.value}"'
+            ),
+        },
+    )
+
+
+@router.get("/summary", response_model=list[CheckSummaryResponse])
+async def get_check_summary(
+    uow: UOWDep,
+    user: CurrentUser,
+    filter_data: CheckSummaryFilter = Depends(),
+) -> list[CheckSummaryResponse]:
+    """
+    Get check counts and sums by period and payment type.
+
+    Periods without checks are omitted. Days are calendar days in UTC.
+
+    :param uow: Unit of Work dependency.
+    :param user: current user information.
+    :param filter_data: period and day range of the summary.
+    :return: summaries ordered by period.
+    """
+    try:
+        user_id = int(user["sub"])
+        return await CheckService(uow).get_summary(
+            user_id,
+            period=filter_data.period,
+            day_from=filter_data.day__gte,
+            day_to=filter_data.day__lt,
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"Error occurred while getting check summary: {str(e)}",
+        )
+
+
 @router.get("/{check_id}", response_model=CheckResponse)
 async def get_check_by_id(
     uow: UOWDep,
     user: CurrentUser,
     check_id: int,
-) -> CheckResponse:
+) -> Response:
     """
     Get check by ID.
 
@@ -96,11 +265,11 @@ async def get_check_by_id(
     """
     try:
         user_id = int(user["sub"])
-        check = await CheckService(uow).get_check_by_id(
+        content = await CheckService(uow).get_check_json(
             user_id=user_id,
             check_id=check_id,
         )
-        return check
+        return Response(content=content, media_type="application/json")
 
     except CheckNotFound as e:
         raise HTTPException(
@@ -120,25 +289,46 @@ async def get_rendered_check(request: Request, uow: UOWDep, public_uuid: str):
     """
     Get rendered check by ID.
 
+    Checks never change once created, so rendered receipts are cached by
+    their ETag, which includes the template version, and served with it. A
+    request with a matching If-None-Match header is answered with 304 without
+    touching the database, `If-None-Match: *` only once the check is known to
+    exist. Receipts of checks with at least `RECEIPT_STREAM_THRESHOLD`
+    products are streamed while they are rendered and not cached.
+
     :param request: HTTP request object.
     :param uow: Unit of Work dependency.
     :param public_uuid: Public UUID of the check.
     :return: HTML response with the rendered check.
     """
+    etag = receipt_etag(public_uuid, receipt_template_version)
+    headers = {"ETag": etag, "Cache-Control": RECEIPT_CACHE_CONTROL}
+    if_none_match = request.headers.get("If-None-Match")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
     try:
-        check = await CheckService(uow).get_check_by_public_uuid(
-            public_uuid=public_uuid
-        )
-        formatted_created_at = check.created_at.strftime("%d.%m.%Y %H:%M")
-        return templates.TemplateResponse(
-            request=request,
-            name="check.html",
-            context={
-                "check": check,
-                "created_at": formatted_created_at,
-                "payment_type": check.payment.type.value.capitalize(),
-            },
-        )
+        cache_key = etag.strip('"')
+        content = await receipt_cache.get(cache_key)
+        check = None
+        if content is None:
+            check = await CheckService(uow).get_check_by_public_uuid(
+                public_uuid=public_uuid
+            )
+
+        if if_none_match and if_none_match.strip() == "*":
+            return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if content is None:
+            if len(check.products) >= settings.RECEIPT_STREAM_THRESHOLD:
+                return StreamingResponse(
+                    iter_receipt(check), media_type="text/html", headers=headers
+                )
+
+            content = render_receipt(check)
+            await receipt_cache.set(cache_key, content)
+
+        return HTMLResponse(content=content, headers=headers)
 
     except CheckNotFound as e:
         raise HTTPException(
@@ -1,8 +1,19 @@
-from datetime import datetime, UTC
+from datetime import date, datetime, UTC
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field, field_serializer, field_validator
+
+
+def format_created_at(value: datetime) -> str:
+    """
+    Format check creation date as it is returned by the API.
+
+    :param value: creation date.
+
+    :return: ISO 8601 UTC date string.
+    """
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 class PaymentMethod(str, Enum):
@@ -88,7 +99,7 @@ class CheckResponse(BaseModel):
     )
     rest: float = Field(
         ...,
-        gt=0,
+        ge=0,
         examples=[0.0],
         description="Remaining amount after payment",
     )
@@ -109,27 +120,55 @@ class CheckResponse(BaseModel):
         Returns:
             str: The serialized datetime string.
         """
-        return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return format_created_at(value)
 
 
-class CheckFilter(BaseModel):
+class CheckBatchError(BaseModel):
     """
-    Check filter model for the application.
+    Check batch error model for the application.
+
+    Attributes:
+        index (int): The position of the rejected check in the batch.
+        detail (Any): The validation errors of the rejected check.
+    """
+
+    index: int = Field(
+        ..., examples=[0], description="Position of the check in the batch"
+    )
+    detail: Any = Field(..., description="Validation errors of the check")
+
+
+class CheckBatchResponse(BaseModel):
+    """
+    Check batch response model for the application.
+
+    Attributes:
+        created (list[CheckResponse]): The checks created from the batch.
+        errors (list[CheckBatchError]): The checks rejected from the batch.
+    """
+
+    created: list[CheckResponse] = Field(...)
+    errors: list[CheckBatchError] = Field(...)
+
+
+class CheckFilterBase(BaseModel):
+    """
+    Base check filter model for the application.
 
     Attributes:
-        created_at__lt (str): Filter by creation date less than.
-        created_at__gte (str): Filter by creation date greater than or equal to.
+        created_at__lt (datetime): Filter by creation date less than.
+        created_at__gte (datetime): Filter by creation date greater than or equal to.
         amount__lt (float): Filter by amount less than.
         amount__gte (float): Filter by amount greater than or equal to.
         type (PaymentMethod): Filter by payment type.
     """
 
-    created_at__lt: Optional[str] = Field(
+    created_at__lt: Optional[datetime] = Field(
         None,
         examples=["2023-10-01T12:00:00Z"],
         description="Filter by creation date less than",
     )
-    created_at__gte: Optional[str] = Field(
+    created_at__gte: Optional[datetime] = Field(
         None,
         examples=["2023-10-01T12:00:00Z"],
         description="Filter by creation date greater than or equal to",
@@ -149,3 +188,137 @@ class CheckFilter(BaseModel):
         examples=["cash", "cashless"],
         description="Filter by payment type",
     )
+
+    @field_validator("created_at__lt", "created_at__gte")
+    @classmethod
+    def normalize_created_at(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """
+        Convert timezone-aware datetimes to naive UTC, as stored in the database.
+
+        Args:
+            value (datetime): The datetime value to be normalized.
+
+        Returns:
+            datetime: The naive UTC datetime.
+        """
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+
+class CheckFilter(CheckFilterBase):
+    """
+    Check filter model for the application.
+
+    Attributes:
+        limit (int): Maximum number of checks in one page.
+        cursor (str): Opaque cursor of the next page.
+    """
+
+    limit: int = Field(
+        100,
+        ge=1,
+        le=1000,
+        examples=[100],
+        description="Maximum number of checks in one page",
+    )
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor from the `X-Next-Cursor` header of the previous page",
+    )
+
+
+class ExportFormat(str, Enum):
+    """
+    Enum for check export formats.
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class CheckExportFilter(CheckFilterBase):
+    """
+    Check export filter model for the application.
+
+    Attributes:
+        format (ExportFormat): Format of the export.
+    """
+
+    format: ExportFormat = Field(
+        ExportFormat.NDJSON,
+        examples=["ndjson", "csv"],
+        description="Format of the export",
+    )
+
+
+class SummaryPeriod(str, Enum):
+    """
+    Enum for check summary periods.
+    """
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class CheckSummaryFilter(BaseModel):
+    """
+    Check summary filter model for the application.
+
+    Attributes:
+        period (SummaryPeriod): Period to group checks by.
+        day__gte (date): Filter by creation day greater than or equal to.
+        day__lt (date): Filter by creation day less than.
+    """
+
+    period: SummaryPeriod = Field(
+        SummaryPeriod.DAY,
+        examples=["day", "week", "month"],
+        description="Period to group checks by, weeks start on Monday",
+    )
+    day__gte: Optional[date] = Field(
+        None,
+        examples=["2023-10-01"],
+        description="Filter by creation day (UTC) greater than or equal to",
+    )
+    day__lt: Optional[date] = Field(
+        None,
+        examples=["2023-11-01"],
+        description="Filter by creation day (UTC) less than",
+    )
+
+
+class CheckSummaryTotals(BaseModel):
+    """
+    Check summary totals model for the application.
+
+    Attributes:
+        count (int): Number of checks.
+        amount (float): Sum of paid amounts.
+        total (float): Sum of check totals.
+        rest (float): Sum of remaining amounts.
+    """
+
+    count: int = Field(..., examples=[10], description="Number of checks")
+    amount: float = Field(..., examples=[1100.0], description="Sum of paid amounts")
+    total: float = Field(..., examples=[1000.0], description="Sum of check totals")
+    rest: float = Field(..., examples=[100.0], description="Sum of remaining amounts")
+
+
+class CheckSummaryResponse(CheckSummaryTotals):
+    """
+    Check summary response model for the application.
+
+    Attributes:
+        period (date): First day of the period.
+        payments (dict[PaymentMethod, CheckSummaryTotals]): Totals by payment type.
+    """
+
+    period: date = Field(
+        ..., examples=["2023-10-01"], description="First day of the period"
+    )
+    payments: dict[PaymentMethod, CheckSummaryTotals] = Field(
+        ...,
+        description="Totals of the period by payment type",
+    )
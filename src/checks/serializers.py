@@ -0,0 +1,168 @@
+import csv
+import io
+from typing import AsyncIterator, Sequence
+
+from pydantic_core import to_json
+from sqlalchemy import Row
+
+from src.checks.schemas import format_created_at
+
+
+def build_check(check: Row, products: list[dict]) -> dict:
+    """
+    Build JSON-ready check data in the `CheckResponse` format.
+
+    :param check: check row of `CheckRepository.get_rows`.
+    :param products: JSON-ready products of the check.
+
+    :return: check data.
+    """
+    return {
+        "id": check.id,
+        "public_uuid": str(check.public_uuid),
+        "products": products,
+        "payment": {"type": check.type.value, "amount": float(check.amount)},
+        "total": float(check.total),
+        "rest": float(check.rest),
+        "created_at": format_created_at(check.created_at),
+    }
+
+
+def build_checks(checks: Sequence[Row], items: Sequence[Row]) -> list[dict]:
+    """
+    Build JSON-ready checks from rows in one pass over checks and items.
+
+    :param checks: check rows of `CheckRepository.get_rows`.
+    :param items: item rows of `CheckRepository.get_rows`.
+
+    :return: list of check data.
+    """
+    products = {check.id: [] for check in checks}
+    for item in items:
+        check_products = products.get(item.check_id)
+        if check_products is not None:
+            check_products.append(
+                {
+                    "name": item.name,
+                    "price": float(item.price),
+                    "quantity": item.quantity,
+                }
+            )
+
+    return [build_check(check, products[check.id]) for check in checks]
+
+
+def dump_checks(checks: Sequence[Row], items: Sequence[Row]) -> bytes:
+    """
+    Serialize rows to the JSON body of a `list[CheckResponse]` response.
+
+    The rows are already validated by the database, so the response is
+    written directly without building and validating pydantic models.
+
+    :param checks: check rows of `CheckRepository.get_rows`.
+    :param items: item rows of `CheckRepository.get_rows`.
+
+    :return: JSON body.
+    """
+    return to_json(build_checks(checks, items))
+
+
+def dump_check(check: Row, items: Sequence[Row]) -> bytes:
+    """
+    Serialize rows to the JSON body of a `CheckResponse` response.
+
+    :param check: check row of `CheckRepository.get_rows`.
+    :param items: item rows of the check.
+
+    :return: JSON body.
+    """
+    return to_json(build_checks([check], items)[0])
+
+
+EXPORT_CSV_HEADER = (
+    "id",
+    "public_uuid",
+    "created_at",
+    "payment_type",
+    "payment_amount",
+    "total",
+    "rest",
+    "product_name",
+    "product_price",
+    "product_quantity",
+)
+
+
+async def iter_export_ndjson(
+    partitions: AsyncIterator[Sequence[Row]],
+) -> AsyncIterator[bytes]:
+    """
+    Serialize export rows to NDJSON with one check per line.
+
+    Rows of a check are adjacent, so a check is written as soon as the rows
+    of the next one start. One chunk is produced per partition.
+
+    :param partitions: partitions of `CheckRepository.stream_export`.
+
+    :return: async iterator over NDJSON chunks.
+    """
+    check, products = None, []
+    async for partition in partitions:
+        chunk = []
+        for row in partition:
+            if check is None or row.id != check.id:
+                if check is not None:
+                    chunk.append(to_json(build_check(check, products)))
+                check, products = row, []
+
+            if row.name is not None:
+                products.append(
+                    {
+                        "name": row.name,
+                        "price": float(row.price),
+                        "quantity": row.quantity,
+                    }
+                )
+
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    if check is not None:
+        yield to_json(build_check(check, products)) + b"\n"
+
+
+async def iter_export_csv(
+    partitions: AsyncIterator[Sequence[Row]],
+) -> AsyncIterator[bytes]:
+    """
+    Serialize export rows to CSV with one product per line.
+
+    :param partitions: partitions of `CheckRepository.stream_export`.
+
+    :return: async iterator over CSV chunks starting with the header.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_CSV_HEADER)
+    yield buffer.getvalue().encode()
+
+    async for partition in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            (
+                row.id,
+                row.public_uuid,
+                format_created_at(row.created_at),
+                row.type.value,
+                row.amount,
+                row.total,
+                row.rest,
+                row.name,
+                row.price,
+                row.quantity,
+            )
+            for row in partition
+        )
+        yield buffer.getvalue().encode()
@@ -1,5 +1,36 @@
-from src.checks.exceptions import CheckNotFound
-from src.checks.schemas import CheckResponse
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+
+from src.checks.cache import StoredResponse, idempotency_cache
+from src.checks.exceptions import (
+    CheckNotFound,
+    IdempotencyKeyConflict,
+    IdempotencyKeyMismatch,
+    InsufficientPayment,
+)
+from src.checks.schemas import (
+    CheckBatchError,
+    CheckBatchResponse,
+    CheckCreate,
+    CheckResponse,
+    CheckSummaryResponse,
+    CheckSummaryTotals,
+    ExportFormat,
+    PaymentMethod,
+    SummaryPeriod,
+)
+from src.checks.serializers import (
+    dump_check,
+    dump_checks,
+    iter_export_csv,
+    iter_export_ndjson,
+)
+from src.checks.totals import CheckTotals, assign_check, calculate_totals
+from src.checks.utils import decode_cursor, encode_cursor, request_hash
+from src.config import settings
 from src.unit_of_work import AbstractUnitOfWorkManager
 
 
@@ -17,9 +48,29 @@ class CheckService:
         create_check(user_id: int, data: dict) -> dict:
             Creates a new check with the provided user ID and data.
 
+        create_check_once(user_id: int, data: dict, idempotency_key: str) -> tuple:
+            Creates a new check once per idempotency key, returning the stored
+            check for retries.
+
+        create_checks(user_id: int, data: list) -> CheckBatchResponse:
+            Creates a batch of checks in one transaction.
+
         get_check(check_id: int) -> dict:
             Retrieves a check by its ID.
 
+        get_check_json(check_id: int, user_id: int) -> bytes:
+            Retrieves a check by its ID serialized to JSON straight from rows.
+
+        get_checks_page_json(filters: dict, limit: int, cursor: str) -> tuple:
+            Retrieves one keyset-paginated page of checks serialized to JSON
+            straight from rows and the next cursor.
+
+        export_checks(filters: dict, export_format: ExportFormat) -> AsyncIterator:
+            Streams all checks matching the filters as NDJSON or CSV.
+
+        get_summary(user_id: int, period: SummaryPeriod, ...) -> list:
+            Retrieves check sums by period and payment type.
+
     """
 
     def __init__(self, uow: AbstractUnitOfWorkManager):
@@ -34,26 +85,159 @@ class CheckService:
 
         :return: Check data.
         """
-        products = data.pop("products")
-        payment = data.get("payment")
+        async with self.uow:
+            created_check = await self._add_check(user_id, data)
+            await self.uow.commit()
+            return created_check
+
+    async def create_check_once(
+        self, user_id: int, data: dict, idempotency_key: str
+    ) -> tuple[CheckResponse, bool]:
+        """
+        Create new check once per idempotency key.
+
+        A retry with the same key and body returns the check created by the
+        first request without computing totals or writing rows again. The
+        response is looked up in the in-process cache first. Otherwise the key
+        is locked before it is looked up in the database, so a retry arriving
+        while the first request is still running waits for it and replays its
+        response.
+
+        :param user_id: User ID.
+        :param data: Check data.
+        :param idempotency_key: Value of the `Idempotency-Key` header.
+
+        :return: Check data and whether it was created by an earlier request.
+        :raises IdempotencyKeyMismatch: if the key was used with another body.
+        :raises IdempotencyKeyConflict: if the key was stored without the lock.
+        """
+        cache_key = (user_id, idempotency_key)
+        body_hash = request_hash(data)
 
-        total, rest = self._calculate_totals(products, payment)
-        check_data = self._build_check_data(user_id, payment, total, rest)
+        stored = idempotency_cache.get(cache_key)
+        if stored is not None:
+            return self._replay(stored, body_hash), True
 
         async with self.uow:
-            check = await self.uow.checks.add(data=check_data)
-            products = await self._add_check_items(products, check["id"])
+            await self.uow.idempotency_keys.lock(user_id, idempotency_key)
+            active = await self.uow.idempotency_keys.get_active(
+                user_id, idempotency_key
+            )
+            if active is not None:
+                # Release the lock for other retries waiting for it.
+                await self.uow.rollback()
+                stored = StoredResponse(active.request_hash, active.response)
+                idempotency_cache.set(cache_key, stored)
+                return self._replay(stored, body_hash), True
+
+            created_check = await self._add_check(user_id, data)
+            stored = StoredResponse(body_hash, created_check.model_dump_json())
+            saved = await self.uow.idempotency_keys.save(
+                data={
+                    "user_id": user_id,
+                    "key": idempotency_key,
+                    "request_hash": stored.request_hash,
+                    "response": stored.response,
+                },
+                ttl=timedelta(hours=settings.CHECKS_IDEMPOTENCY_TTL_HOURS),
+            )
+            if not saved:
+                raise IdempotencyKeyConflict(
+                    "Idempotency key is already used by another request."
+                )
+
             await self.uow.commit()
 
-            return CheckResponse(
-                id=check["id"],
-                public_uuid=str(check["public_uuid"]),
-                products=products,
-                payment=payment,
-                total=total,
-                rest=rest,
-                created_at=check["created_at"],
+        idempotency_cache.set(cache_key, stored)
+        return created_check, False
+
+    async def create_checks(self, user_id: int, data: list) -> CheckBatchResponse:
+        """
+        Create a batch of checks.
+
+        Every check is validated separately and invalid checks, including
+        checks without products or with a zero total, are reported in
+        `errors` without failing the rest of the batch. Valid checks are
+        inserted with one statement for headers and one for items, and
+        committed once.
+
+        :param user_id: User ID.
+        :param data: List of raw check data.
+
+        :return: Created checks and validation errors.
+        """
+        errors = []
+        valid_checks = []
+        for index, raw_check in enumerate(data):
+            try:
+                check = CheckCreate.model_validate(raw_check).model_dump()
+            except ValidationError as e:
+                errors.append(
+                    CheckBatchError(
+                        index=index,
+                        detail=e.errors(include_url=False, include_context=False),
+                    )
+                )
+                continue
+
+            try:
+                totals = calculate_totals(check["products"], check["payment"]["amount"])
+            except InsufficientPayment as e:
+                errors.append(CheckBatchError(index=index, detail=str(e)))
+                continue
+
+            if totals.total <= 0:
+                errors.append(
+                    CheckBatchError(
+                        index=index, detail="Check total must be greater than zero."
+                    )
+                )
+                continue
+
+            valid_checks.append((check, totals))
+
+        if not valid_checks:
+            return CheckBatchResponse(created=[], errors=errors)
+
+        async with self.uow:
+            checks = await self.uow.checks.bulk_add(
+                data=[
+                    self._build_check_data(user_id, check["payment"]["type"], totals)
+                    for check, totals in valid_checks
+                ]
             )
+            items = await self.uow.check_items.bulk_add(
+                data=[
+                    row
+                    for (_, totals), created_check in zip(valid_checks, checks)
+                    for row in assign_check(
+                        totals.items, created_check["id"], created_check["created_at"]
+                    )
+                ]
+            )
+            await self.uow.check_summaries.upsert(data=self._build_summary_data(checks))
+
+            products = defaultdict(list)
+            for item in items:
+                products[item["check_id"]].append(item)
+
+            # Responses are built before the commit, so a check that fails
+            # response validation rolls back the whole batch.
+            created = [
+                CheckResponse(
+                    id=created_check["id"],
+                    public_uuid=str(created_check["public_uuid"]),
+                    products=products[created_check["id"]],
+                    payment=check["payment"],
+                    total=totals.total,
+                    rest=totals.rest,
+                    created_at=created_check["created_at"],
+                )
+                for (check, totals), created_check in zip(valid_checks, checks)
+            ]
+            await self.uow.commit()
+
+        return CheckBatchResponse(created=created, errors=errors)
 
     async def get_check_by_public_uuid(self, public_uuid: str) -> CheckResponse:
         """
@@ -71,47 +255,180 @@ class CheckService:
 
         return checks[0]
 
-    async def get_check_by_id(
-        self, check_id: int, user_id: int = None
-    ) -> CheckResponse:
+    async def get_check_json(self, check_id: int, user_id: int = None) -> bytes:
         """
-        Get check by ID.
+        Get check by ID serialized straight from database rows.
 
         :param check_id: Check ID.
         :param user_id: User ID.
 
-        :return: Check data.
+        :return: JSON body of the check.
         """
         filters = {"id": check_id, "user_id": user_id}
-        checks = await self._get_checks(filters)
+        if settings.CHECKS_READ_MODE == "json_agg":
+            async with self.uow:
+                checks = await self.uow.checks.get_json(data=filters)
+
+            if not checks:
+                raise CheckNotFound("Check not found.")
+
+            return checks[0].document.encode()
+
+        async with self.uow:
+            checks, items = await self.uow.checks.get_rows(data=filters)
 
         if not checks:
             raise CheckNotFound("Check not found.")
 
-        return checks[0]
+        return dump_check(checks[0], items)
 
-    async def get_check_by_filters(self, filters: dict) -> list[CheckResponse]:
+    async def get_checks_page_json(
+        self, filters: dict, limit: int, cursor: str = None
+    ) -> tuple[bytes, str | None]:
         """
-        Get check by filters.
+        Get one page of checks by filters serialized straight from database rows.
 
         :param filters: Filters for retrieving checks.
+        :param limit: Maximum number of checks in the page.
+        :param cursor: Cursor returned with the previous page.
 
-        :return: Check data.
+        :return: Tuple containing JSON body and the cursor of the next page.
         """
-        return await self._get_checks(filters)
+        after = decode_cursor(cursor) if cursor else None
+        if settings.CHECKS_READ_MODE == "json_agg":
+            return await self._get_checks_page_documents(filters, limit, after)
 
-    async def _get_checks(self, filters: dict) -> list[CheckResponse]:
+        async with self.uow:
+            checks, items = await self.uow.checks.get_rows(
+                data=filters, limit=limit + 1, after=after
+            )
+
+        next_cursor = None
+        if len(checks) > limit:
+            checks = checks[:limit]
+            next_cursor = encode_cursor(checks[-1].created_at, checks[-1].id)
+
+        return dump_checks(checks, items), next_cursor
+
+    async def export_checks(
+        self, filters: dict, export_format: ExportFormat
+    ) -> AsyncIterator[bytes]:
+        """
+        Export all checks by filters.
+
+        The unit of work is entered inside the generator, so the export keeps
+        its session open while the response is streamed, even after the
+        request dependencies are closed.
+
+        :param filters: Filters for retrieving checks.
+        :param export_format: Format of the export.
+
+        :return: async iterator over chunks of the export.
+        """
+        serializers = {
+            ExportFormat.NDJSON: iter_export_ndjson,
+            ExportFormat.CSV: iter_export_csv,
+        }
+        async with self.uow:
+            partitions = self.uow.checks.stream_export(
+                data=filters, fetch_size=settings.CHECKS_EXPORT_FETCH_SIZE
+            )
+            async for chunk in serializers[export_format](partitions):
+                yield chunk
+
+    async def get_summary(
+        self,
+        user_id: int,
+        period: SummaryPeriod,
+        day_from: date = None,
+        day_to: date = None,
+    ) -> list[CheckSummaryResponse]:
+        """
+        Get check sums by period and payment type.
+
+        Sums are read from the daily summaries, so the cost depends on the
+        number of days in the range, not on the number of checks.
+
+        :param user_id: User ID.
+        :param period: Period to group checks by.
+        :param day_from: First day to include.
+        :param day_to: First day to exclude.
+
+        :return: Summaries ordered by period.
+        """
+        async with self.uow:
+            rows = await self.uow.check_summaries.get_by_period(
+                user_id, period.value, day_from, day_to
+            )
+
+        summaries = {}
+        for row in rows:
+            summary = summaries.setdefault(
+                row.period,
+                {
+                    "period": row.period,
+                    "count": 0,
+                    "amount": 0,
+                    "total": 0,
+                    "rest": 0,
+                    "payments": {},
+                },
+            )
+            totals = CheckSummaryTotals(
+                count=row.count,
+                amount=row.amount,
+                total=row.total,
+                rest=row.rest,
+            )
+            summary["payments"][row.type] = totals
+            for column in ("count", "amount", "total", "rest"):
+                summary[column] += getattr(row, column)
+
+        return [CheckSummaryResponse(**summary) for summary in summaries.values()]
+
+    async def _get_checks_page_documents(
+        self, filters: dict, limit: int, after: tuple = None
+    ) -> tuple[bytes, str | None]:
+        """
+        Get one page of checks as JSON documents aggregated by the database.
+
+        :param filters: Filters for retrieving checks.
+        :param limit: Maximum number of checks in the page.
+        :param after: Keyset position to continue from.
+
+        :return: Tuple containing JSON body and the cursor of the next page.
+        """
+        async with self.uow:
+            checks = await self.uow.checks.get_json(
+                data=filters, limit=limit + 1, after=after
+            )
+
+        next_cursor = None
+        if len(checks) > limit:
+            checks = checks[:limit]
+            next_cursor = encode_cursor(checks[-1].created_at, checks[-1].id)
+
+        content = ",".join(check.document for check in checks)
+        return f"[{content}]".encode(), next_cursor
+
+    async def _get_checks(
+        self, filters: dict, limit: int = None, after: tuple = None
+    ) -> list[CheckResponse]:
         """
         Retrieve a check based on the provided filters.
 
         :param filters: Filters for retrieving checks.
+        :param limit: Maximum number of checks to retrieve.
+        :param after: Keyset position to continue from.
         :return: Check data.
         """
         async with self.uow:
-            checks = await self.uow.checks.get_by_data(data=filters)
+            checks = await self.uow.checks.get_projection(
+                data=filters, limit=limit, after=after
+            )
 
             if not checks:
-                raise []
+                return []
 
             return [
                 CheckResponse(
@@ -129,60 +446,101 @@ class CheckService:
                 for check in checks
             ]
 
-    async def _add_check_items(self, products: list, check_id: int) -> list[dict]:
+    async def _add_check(self, user_id: int, data: dict) -> CheckResponse:
         """
-        Add check items to the database.
+        Add new check, its items and summary sums in the current transaction.
 
-        :param products: List of products to be added.
-        :param check_id: ID of the associated check.
-        """
-        product_data = [
-            {
-                "name": product["name"],
-                "price": product["price"],
-                "quantity": product["quantity"],
-                "total": product["price"] * product["quantity"],
-                "check_id": check_id,
-            }
-            for product in products
-        ]
+        :param user_id: User ID.
+        :param data: Check data.
 
-        created_products = await self.uow.check_items.bulk_add(data=product_data)
-        return created_products
+        :return: Check data.
+        """
+        products = data["products"]
+        payment = data["payment"]
+
+        totals = calculate_totals(products, payment["amount"])
+        check_data = self._build_check_data(user_id, payment["type"], totals)
+
+        check = await self.uow.checks.add(data=check_data)
+        items = await self.uow.check_items.bulk_add(
+            data=assign_check(totals.items, check["id"], check["created_at"])
+        )
+        await self.uow.check_summaries.upsert(data=self._build_summary_data([check]))
+
+        return CheckResponse(
+            id=check["id"],
+            public_uuid=str(check["public_uuid"]),
+            products=items,
+            payment=payment,
+            total=totals.total,
+            rest=totals.rest,
+            created_at=check["created_at"],
+        )
 
     @staticmethod
-    def _calculate_totals(products: list, payment: dict) -> tuple:
+    def _replay(stored: StoredResponse, body_hash: str) -> CheckResponse:
         """
-        Calculate the total amount and the remaining balance.
+        Get the check stored for an idempotency key.
 
-        :param products: List of products in the check.
-        :param payment: Payment information.
+        :param stored: Response stored for the key.
+        :param body_hash: Hash of the body of the current request.
 
-        :return: Tuple containing total amount and remaining balance.
+        :return: Check data.
+        :raises IdempotencyKeyMismatch: if the key was used with another body.
         """
-        total = sum(product["price"] * product["quantity"] for product in products)
-        amount = payment.get("amount")
-        rest = amount - total
-        return total, rest
+        if stored.request_hash != body_hash:
+            raise IdempotencyKeyMismatch(
+                "Idempotency key was already used with another request."
+            )
+        return CheckResponse.model_validate_json(stored.response)
 
     @staticmethod
     def _build_check_data(
-        user_id: int, payment: dict, total: float, rest: float
+        user_id: int, payment_type: PaymentMethod, totals: CheckTotals
     ) -> dict:
         """
         Build the check data dictionary.
 
         :param user_id: User ID.
-        :param payment: Payment information.
-        :param total: Total amount of the check.
-        :param rest: Remaining balance.
+        :param payment_type: Payment method.
+        :param totals: Exact totals of the check.
 
         :return: Dictionary containing check data.
         """
         return {
-            "type": payment.get("type"),
-            "amount": payment.get("amount"),
-            "total": total,
-            "rest": rest,
+            "type": payment_type,
+            "amount": totals.amount,
+            "total": totals.total,
+            "rest": totals.rest,
             "user_id": user_id,
         }
+
+    @staticmethod
+    def _build_summary_data(checks: list[dict]) -> list[dict]:
+        """
+        Build the check summary data of created checks.
+
+        :param checks: Created checks.
+
+        :return: List of summary sums, one per user, day and payment type.
+        """
+        summaries = {}
+        for check in checks:
+            key = (check["user_id"], check["created_at"].date(), check["type"])
+            summary = summaries.setdefault(
+                key,
+                {
+                    "user_id": key[0],
+                    "day": key[1],
+                    "type": key[2],
+                    "count": 0,
+                    "amount": 0,
+                    "total": 0,
+                    "rest": 0,
+                },
+            )
+            summary["count"] += 1
+            for column in ("amount", "total", "rest"):
+                summary[column] += check[column]
+
+        return [summaries[key] for key in sorted(summaries)]
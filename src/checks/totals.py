@@ -0,0 +1,101 @@
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Context, Decimal
+from typing import Iterable, Mapping, NamedTuple, Union
+
+from src.checks.exceptions import InsufficientPayment
+
+# Money values are rounded to kopecks half away from zero, the same way
+# Postgres rounds values stored in `Numeric(10, 2)` columns. Rounded values
+# have at most 2 decimal places, so sums and products by quantities are exact.
+MONEY_CONTEXT = Context(prec=28, rounding=ROUND_HALF_UP)
+KOPECK = Decimal("0.01")
+
+Money = Union[int, float, str, Decimal]
+
+
+class CheckTotals(NamedTuple):
+    """
+    Exact totals of a check.
+
+    Attributes:
+        amount (Decimal): Paid amount.
+        total (Decimal): Sum of item totals.
+        rest (Decimal): Paid amount minus total, never negative.
+        items (list[dict]): Check item rows in the order of products.
+    """
+
+    amount: Decimal
+    total: Decimal
+    rest: Decimal
+    items: list[dict]
+
+
+def to_money(value: Money) -> Decimal:
+    """
+    Convert a value to an exact money value rounded to kopecks.
+
+    Floats are converted through their shortest repr, so `24.99` is exactly
+    `Decimal("24.99")` and not `24.989999...`.
+
+    :param value: money value.
+
+    :return: money value with two decimal places.
+    """
+    if isinstance(value, float):
+        value = repr(value)
+    return MONEY_CONTEXT.quantize(Decimal(value), KOPECK)
+
+
+def calculate_totals(products: Iterable[Mapping], amount: Money) -> CheckTotals:
+    """
+    Calculate exact check totals in one pass over products.
+
+    The pass also builds the check item rows, which only miss the keys of
+    the check, see `assign_check`.
+
+    :param products: products with `name`, `price` and `quantity`.
+    :param amount: paid amount.
+
+    :return: check totals and item rows.
+    :raises InsufficientPayment: if the amount is less than the total.
+    """
+    items = []
+    total = Decimal(0)
+    for product in products:
+        price = to_money(product["price"])
+        quantity = product["quantity"]
+        item_total = price * quantity
+        total += item_total
+        items.append(
+            {
+                "name": product["name"],
+                "price": price,
+                "quantity": quantity,
+                "total": item_total,
+            }
+        )
+
+    amount = to_money(amount)
+    rest = amount - total
+    if rest < 0:
+        raise InsufficientPayment("Payment amount is less than the check total.")
+
+    return CheckTotals(amount, MONEY_CONTEXT.quantize(total, KOPECK), rest, items)
+
+
+def assign_check(
+    items: list[dict], check_id: int, check_created_at: datetime
+) -> list[dict]:
+    """
+    Complete check item rows with the keys of their check in place.
+
+    :param items: item rows of `calculate_totals`.
+    :param check_id: ID of the check.
+    :param check_created_at: creation date of the check.
+
+    :return: the same item rows.
+    """
+    for item in items:
+        item["check_id"] = check_id
+        item["check_created_at"] = check_created_at
+    return items
@@ -0,0 +1,85 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+
+from src.checks.exceptions import InvalidCursor
+
+
+def encode_cursor(created_at: datetime, check_id: int) -> str:
+    """
+    Encode keyset position into an opaque cursor.
+
+    :param created_at: creation date of the last returned check.
+    :param check_id: ID of the last returned check.
+
+    :return: URL-safe cursor string.
+    """
+    payload = json.dumps([created_at.isoformat(), check_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode an opaque cursor into keyset position.
+
+    :param cursor: cursor string returned by encode_cursor.
+
+    :return: tuple of creation date and check ID.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, check_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(check_id)
+
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor("Invalid pagination cursor.")
+
+
+def receipt_etag(public_uuid: str, template_version: str) -> str:
+    """
+    Build a strong ETag of a rendered receipt.
+
+    Checks never change once created, so the receipt only depends on the check
+    and the template it was rendered with.
+
+    :param public_uuid: public UUID of the check.
+    :param template_version: fingerprint of the receipt template.
+
+    :return: quoted ETag value.
+    """
+    return f'"{public_uuid}-{template_version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check whether the If-None-Match header lists the ETag.
+
+    `*` is not treated as a match here, it matches any existing resource and
+    the caller has to check the resource exists first.
+
+    :param if_none_match: value of the If-None-Match header.
+    :param etag: current ETag.
+
+    :return: True if the client already has the current representation.
+    """
+    if not if_none_match:
+        return False
+
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def request_hash(data: dict) -> str:
+    """
+    Hash a request body independently of the order of its keys.
+
+    :param data: request body.
+
+    :return: hex SHA-256 digest.
+    """
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -1,8 +1,213 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config import settings
+from src.metrics.middleware import current_request_metrics
+from src.metrics.profiling import current_request_profile
+from src.metrics.registry import registry
+
+
+class PoolMetrics:
+    """
+    Connection pool checkout metrics.
+
+    Attributes:
+        checkouts (int): Number of connections checked out from the pool.
+        timeouts (int): Number of checkouts that failed with a pool timeout.
+        wait_seconds (float): Total time spent waiting for a connection.
+        max_wait_seconds (float): Longest time spent waiting for a connection.
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        """
+        Record a connection checkout.
+
+        :param wait_seconds: time spent waiting for the connection.
+        """
+        self.checkouts += 1
+        self.wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self) -> None:
+        """
+        Record a checkout that timed out.
+        """
+        self.timeouts += 1
+
+
+class CompileCacheMetrics:
+    """
+    SQLAlchemy compiled statement cache metrics.
+
+    Attributes:
+        hits (int): Executions of statements found in the compile cache.
+        misses (int): Executions of statements compiled and added to the cache.
+        uncached (int): Executions of statements that can not be cached.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def record(self, cache_hit) -> None:
+        """
+        Record an execution.
+
+        :param cache_hit: `cache_hit` of the execution context.
+        """
+        if cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif cache_hit is CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Share of cacheable executions served by the compile cache.
+        """
+        cacheable = self.hits + self.misses
+        return self.hits / cacheable if cacheable else 0.0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long every checkout waits for a connection.
+    """
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+
+        pool_metrics.record_checkout(time.perf_counter() - started_at)
+        return connection
+
+
+def get_connect_args() -> dict:
+    """
+    Build asyncpg connection arguments from settings.
+
+    :return: connection arguments.
+    """
+    connect_args = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def pool_stats() -> dict:
+    """
+    Get connection pool metrics of the current worker.
+
+    :return: dictionary with pool state and checkout metrics.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": pool_metrics.checkouts,
+        "timeouts": pool_metrics.timeouts,
+        "wait_seconds": pool_metrics.wait_seconds,
+        "max_wait_seconds": pool_metrics.max_wait_seconds,
+    }
+
+
+def compile_cache_stats() -> dict:
+    """
+    Get compiled statement cache metrics of the current worker.
+
+    :return: dictionary with hits, misses, uncached executions and hit ratio.
+    """
+    return {
+        "hits": compile_cache_metrics.hits,
+        "misses": compile_cache_metrics.misses,
+        "uncached": compile_cache_metrics.uncached,
+        "hit_ratio": compile_cache_metrics.hit_ratio,
+    }
+
+
+pool_metrics = PoolMetrics()
+compile_cache_metrics = CompileCacheMetrics()
+query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing database queries.",
+)
+
+engine = create_async_engine(
+    str(settings.DATABASE_URL),
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args=get_connect_args(),
+)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def record_compile_cache(
+    connection, cursor, statement, parameters, context, executemany
+) -> None:
+    """
+    Record whether the executed statement was found in the compile cache and
+    when its execution started.
+    """
+    compile_cache_metrics.record(context.cache_hit)
+    connection.info["query_started_at"] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def record_query_duration(
+    connection, cursor, statement, parameters, context, executemany
+) -> None:
+    """
+    Record the duration of the executed statement.
+    """
+    elapsed = time.perf_counter() - connection.info["query_started_at"]
+    record_query(statement, elapsed)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """
+    Record the query duration globally and for the request being handled, and
+    the statement itself when the request is profiled.
+
+    Statements executed through the engine are recorded by an event listener,
+    operations on the driver connection, like COPY, have to call it directly.
+
+    :param statement: SQL statement.
+    :param seconds: execution time.
+    """
+    query_duration.observe(seconds)
+    request_metrics = current_request_metrics.get()
+    if request_metrics is not None:
+        request_metrics.record_query(seconds)
+    request_profile = current_request_profile.get()
+    if request_profile is not None:
+        request_profile.record_query(statement, seconds)
+
 
-engine = create_async_engine(str(settings.DATABASE_URL))
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -1,19 +1,44 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
 from src.__version__ import __version__
+from src.auth.hashing import password_hasher
 from src.auth.router import router as auth_router
 from src.checks.router import router as checks_router
 from src.config import settings
+from src.metrics.middleware import MetricsMiddleware
+from src.metrics.profiling import ProfilingMiddleware, profile_sampler
+from src.metrics.router import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """
+    Application lifespan handler that releases worker pools and threads on shutdown.
+    """
+    yield
+    password_hasher.shutdown()
+    profile_sampler.shutdown()
+
 
 app = FastAPI(
     title="Checkbox API",
     description="API for Checkbox Test Task",
     version=__version__,
+    lifespan=lifespan,
 )
 app.include_router(auth_router)
 app.include_router(checks_router)
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,159 @@
+"""
+Collectors exporting the stats kept by pools and caches of the worker.
+"""
+
+from src.auth.cache import token_cache
+from src.auth.hashing import password_hasher
+from src.checks.cache import idempotency_cache, receipt_cache
+from src.database import compile_cache_stats, pool_stats
+from src.metrics.registry import registry
+from src.repository import statement_cache
+
+
+def family(
+    name: str,
+    metric_type: str,
+    documentation: str,
+    value: float | dict,
+    label: str = None,
+) -> tuple:
+    """
+    Build a metric family.
+
+    :param name: metric name, `_total` is added to samples of counters.
+    :param metric_type: "gauge" or "counter".
+    :param documentation: metric help text.
+    :param value: value, or label values mapped to values when `label` is set.
+    :param label: name of the label.
+
+    :return: metric name, type, help text and samples.
+    """
+    sample_name = f"{name}_total" if metric_type == "counter" else name
+    if label is None:
+        samples = [(sample_name, {}, value)]
+    else:
+        samples = [(sample_name, {label: key}, item) for key, item in value.items()]
+    return name, metric_type, documentation, samples
+
+
+@registry.collector
+def collect_pool() -> list[tuple]:
+    """
+    Collect connection pool saturation.
+    """
+    stats = pool_stats()
+    return [
+        family(
+            "db_pool_size",
+            "gauge",
+            "Number of connections kept in the pool.",
+            stats["size"],
+        ),
+        family(
+            "db_pool_checked_out",
+            "gauge",
+            "Number of connections checked out from the pool.",
+            stats["checked_out"],
+        ),
+        family(
+            "db_pool_overflow",
+            "gauge",
+            "Number of overflow connections, negative while the pool fills up.",
+            stats["overflow"],
+        ),
+        family(
+            "db_pool_checkouts",
+            "counter",
+            "Connections checked out from the pool.",
+            stats["checkouts"],
+        ),
+        family(
+            "db_pool_timeouts",
+            "counter",
+            "Checkouts that failed with a pool timeout.",
+            stats["timeouts"],
+        ),
+        family(
+            "db_pool_wait_seconds",
+            "counter",
+            "Time spent waiting for a connection.",
+            stats["wait_seconds"],
+        ),
+    ]
+
+
+@registry.collector
+def collect_password_hasher() -> list[tuple]:
+    """
+    Collect password hasher queue depth.
+    """
+    stats = password_hasher.stats()
+    return [
+        family(
+            "password_hasher_queued",
+            "gauge",
+            "Jobs waiting for a password hasher slot.",
+            stats["queued"],
+        ),
+        family(
+            "password_hasher_in_flight",
+            "gauge",
+            "Jobs running in the password hasher pool.",
+            stats["in_flight"],
+        ),
+        family(
+            "password_hasher_wait_seconds",
+            "counter",
+            "Time jobs spent waiting for a password hasher slot.",
+            stats["wait_seconds"],
+        ),
+    ]
+
+
+@registry.collector
+def collect_caches() -> list[tuple]:
+    """
+    Collect sizes, hits and misses of in-process caches.
+    """
+    caches = {
+        "token": token_cache.stats(),
+        "receipt": receipt_cache.local.stats(),
+        "idempotency": idempotency_cache.stats(),
+        "statement": statement_cache.stats(),
+    }
+    compile_cache = compile_cache_stats()
+    return [
+        family(
+            "cache_entries",
+            "gauge",
+            "Number of entries in an in-process cache.",
+            {name: stats["size"] for name, stats in caches.items()},
+            label="cache",
+        ),
+        family(
+            "cache_hits",
+            "counter",
+            "Lookups answered from an in-process cache.",
+            {name: stats["hits"] for name, stats in caches.items()},
+            label="cache",
+        ),
+        family(
+            "cache_misses",
+            "counter",
+            "Lookups not found in an in-process cache.",
+            {name: stats["misses"] for name, stats in caches.items()},
+            label="cache",
+        ),
+        family(
+            "db_compile_cache_hits",
+            "counter",
+            "Executions of statements found in the SQLAlchemy compile cache.",
+            compile_cache["hits"],
+        ),
+        family(
+            "db_compile_cache_misses",
+            "counter",
+            "Executions of statements compiled and added to the compile cache.",
+            compile_cache["misses"],
+        ),
+    ]
@@ -0,0 +1,96 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics.registry import registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of the response.",
+    ("method", "route", "status"),
+)
+request_queries = registry.histogram(
+    "http_request_db_queries",
+    "Number of database queries executed by a request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+request_query_duration = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Time a request spent executing database queries.",
+    ("route",),
+)
+
+
+class RequestMetrics:
+    """
+    Database work of the request being handled.
+
+    Attributes:
+        queries (int): Number of executed queries.
+        query_seconds (float): Total time spent executing queries.
+    """
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def record_query(self, seconds: float) -> None:
+        """
+        Record an executed query.
+
+        :param seconds: query execution time.
+        """
+        self.queries += 1
+        self.query_seconds += seconds
+
+
+current_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and database work of every HTTP request.
+
+    Requests are labelled by the path template of the matched route, e.g.
+    `/checks/{check_id}`, so the number of series does not grow with IDs.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            current_request_metrics.reset(token)
+
+            route = scope.get("route")
+            route = route.path_format if route is not None else UNMATCHED_ROUTE
+            request_duration.observe(elapsed, scope["method"], route, status_code)
+            request_queries.observe(metrics.queries, route)
+            request_query_duration.observe(metrics.query_seconds, route)
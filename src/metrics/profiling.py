@@ -0,0 +1,344 @@
+"""
+Opt-in request profiling.
+
+`ProfilingMiddleware` captures a request when:
+
+* it is sampled with probability `PROFILING_SAMPLE_RATE`;
+* it sends the `X-Profile` header with the `PROFILING_TOKEN` value;
+* or it takes at least `PROFILING_SLOW_REQUEST_MS`, in which case every
+  request is captured and only the slow ones are kept.
+
+A capture holds a statistical profile and the SQL statements the request
+executed with their timings. The profile is taken by `StackSampler`, a
+thread that samples the stack of the event loop thread every
+`PROFILING_INTERVAL_MS` and adds it to the request whose task is running.
+Samples taken while another task runs are counted as `<waiting>`, which
+covers awaiting the database and other I/O.
+
+Kept captures are written as JSON files to `PROFILING_DIR`, and only the
+newest `PROFILING_MAX_FILES` files are kept. Stacks are in the collapsed
+format read by flame graph tools, e.g. speedscope.
+
+The middleware is only installed with `PROFILING_ENABLED`, so it costs
+nothing when profiling is off.
+"""
+
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+PROFILE_HEADER = b"x-profile"
+WAITING = "<waiting>"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """
+    Capture of a profiled request.
+
+    Attributes:
+        stacks (Counter): Collapsed stacks mapped to numbers of samples.
+        queries (list): Executed SQL statements and their durations in ms.
+    """
+
+    __slots__ = ("stacks", "queries")
+
+    def __init__(self) -> None:
+        self.stacks = Counter()
+        self.queries = []
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        """
+        Record an executed statement.
+
+        :param statement: SQL statement.
+        :param seconds: execution time.
+        """
+        self.queries.append(
+            {"statement": statement, "duration_ms": round(seconds * 1000, 3)}
+        )
+
+
+current_request_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_request_profile", default=None
+)
+
+
+def collapse_stack(frame) -> str:
+    """
+    Collapse a stack into one line, outermost frame first.
+
+    :param frame: innermost frame.
+
+    :return: frames separated by semicolons.
+    """
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class StackSampler:
+    """
+    Sampling profiler of requests handled on one event loop.
+
+    Attributes:
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._profiles: dict[asyncio.Task, RequestProfile] = {}
+
+    def register(self, task: asyncio.Task, profile: RequestProfile) -> None:
+        """
+        Start sampling a request, starting the sampler thread on first use.
+
+        Must be called on the event loop thread.
+
+        :param task: task handling the request.
+        :param profile: capture of the request.
+        """
+        if self._thread is None:
+            self._loop = asyncio.get_running_loop()
+            self._thread_id = threading.get_ident()
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="request-profiler", daemon=True
+            )
+            self._thread.start()
+        self._profiles[task] = profile
+
+    def unregister(self, task: asyncio.Task) -> None:
+        """
+        Stop sampling a request.
+
+        :param task: task handling the request.
+        """
+        self._profiles.pop(task, None)
+
+    def shutdown(self) -> None:
+        """
+        Stop the sampler thread.
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if not self._profiles:
+                continue
+
+            running = asyncio.current_task(self._loop)
+            frame = sys._current_frames().get(self._thread_id)
+            for task, profile in list(self._profiles.items()):
+                if task is running and frame is not None:
+                    profile.stacks[collapse_stack(frame)] += 1
+                else:
+                    profile.stacks[WAITING] += 1
+
+
+class ProfileWriter:
+    """
+    Writer of captures to a directory keeping only the newest files.
+
+    Attributes:
+        directory (str): Directory of capture files.
+        max_files (int): Number of newest files to keep.
+    """
+
+    def __init__(self, directory: str, max_files: int) -> None:
+        self.directory = directory
+        self.max_files = max_files
+
+    def write(self, name: str, capture: dict) -> str:
+        """
+        Write a capture and remove the oldest files over the limit.
+
+        :param name: file name without extension.
+        :param capture: capture data.
+
+        :return: path of the written file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.json")
+        with open(path, "w") as file:
+            json.dump(capture, file, indent=2)
+
+        files = sorted(
+            entry.path
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        )
+        for old_path in files[: max(len(files) - self.max_files, 0)]:
+            # Another writer, in this or another worker, may remove it first.
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(old_path)
+        return path
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware capturing profiles of sampled, requested and slow requests.
+
+    Attributes:
+        sample_rate (float): Share of requests captured at random.
+        slow_request_seconds (float): Latency from which requests are kept, 0 to
+            disable.
+        token (str): Value of the `X-Profile` header requesting a capture.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = None,
+        slow_request_ms: float = None,
+        token: str = None,
+        sampler: StackSampler = None,
+        writer: ProfileWriter = None,
+    ) -> None:
+        self.app = app
+        self.sample_rate = (
+            settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+        slow_request_ms = (
+            settings.PROFILING_SLOW_REQUEST_MS
+            if slow_request_ms is None
+            else slow_request_ms
+        )
+        self.slow_request_seconds = slow_request_ms / 1000
+        self.token = (settings.PROFILING_TOKEN if token is None else token) or None
+        self.sampler = sampler or profile_sampler
+        self.writer = writer or ProfileWriter(
+            settings.PROFILING_DIR, settings.PROFILING_MAX_FILES
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        task = asyncio.current_task()
+        profile = RequestProfile()
+        token = current_request_profile.set(profile)
+        self.sampler.register(task, profile)
+        started_at = datetime.now(UTC)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.sampler.unregister(task)
+            current_request_profile.reset(token)
+
+            if reason != "slow" or elapsed >= self.slow_request_seconds:
+                try:
+                    await self._write(
+                        scope, reason, status_code, started_at, elapsed, profile
+                    )
+                except Exception:
+                    # Profiling must never fail the request or hide its error.
+                    logger.exception("Failed to write the profile of a request.")
+
+    def _reason(self, scope: Scope) -> Optional[str]:
+        """
+        Decide whether to capture a request.
+
+        :param scope: ASGI scope of the request.
+
+        :return: "header", "sampled", "slow" or None if it is not captured.
+        """
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    if hmac.compare_digest(value, self.token.encode()):
+                        return "header"
+                    break
+
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        if self.slow_request_seconds:
+            return "slow"
+        return None
+
+    async def _write(
+        self,
+        scope: Scope,
+        reason: str,
+        status_code: int,
+        started_at: datetime,
+        elapsed: float,
+        profile: RequestProfile,
+    ) -> None:
+        """
+        Write a capture in a worker thread.
+
+        :param scope: ASGI scope of the request.
+        :param reason: why the request was captured.
+        :param status_code: response status.
+        :param started_at: time the request was received.
+        :param elapsed: request duration in seconds.
+        :param profile: capture of the request.
+        """
+        route = scope.get("route")
+        route = getattr(route, "path_format", None)
+        capture = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route,
+            "status": status_code,
+            "reason": reason,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(elapsed * 1000, 3),
+            "interval_ms": self.sampler.interval * 1000,
+            "queries": profile.queries,
+            "stacks": [
+                f"{stack} {count}" for stack, count in profile.stacks.most_common()
+            ],
+        }
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", route or scope["path"]).strip("-")
+        name = f"{started_at:%Y%m%dT%H%M%S%f}-{reason}-{scope['method']}-{slug}"
+        await asyncio.to_thread(self.writer.write, name, capture)
+
+
+profile_sampler = StackSampler(interval=settings.PROFILING_INTERVAL_MS / 1000)
@@ -0,0 +1,304 @@
+"""
+Metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain per-process objects updated on the event
+loop without locks. Recording a histogram value is a bisect and two
+additions, and label values are looked up by tuple, so the recording path
+stays cheap enough for every request and query. Buckets are cumulated
+only when the metrics are rendered.
+
+Values kept elsewhere, like pool or cache stats, are exported by
+collectors called on every render.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Iterable, Sequence
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Sample = tuple[str, dict, float]
+Collector = Callable[[], Iterable[tuple[str, str, str, Sequence[Sample]]]]
+
+
+def escape_label_value(value) -> str:
+    """
+    Escape a label value.
+
+    :param value: label value.
+
+    :return: value with backslashes, quotes and newlines escaped.
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict) -> str:
+    """
+    Format labels of a sample.
+
+    :param labels: label names mapped to values.
+
+    :return: labels in braces or an empty string.
+    """
+    if not labels:
+        return ""
+    pairs = (f'{name}="{escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    """
+    Format a sample value.
+
+    :param value: sample value.
+
+    :return: value as Prometheus expects it.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """
+    Monotonic counter.
+
+    Attributes:
+        name (str): Metric name.
+        documentation (str): Metric help text.
+        labelnames (tuple): Names of labels.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        """
+        Increase the counter.
+
+        :param labels: label values in the order of `labelnames`.
+        :param amount: amount to add.
+        """
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        """
+        Get the counter value.
+
+        :param labels: label values in the order of `labelnames`.
+
+        :return: counter value.
+        """
+        return self._values.get(labels, 0)
+
+    def clear(self) -> None:
+        """
+        Remove all recorded values.
+        """
+        self._values.clear()
+
+    def samples(self) -> list[Sample]:
+        """
+        Get samples of the counter.
+
+        :return: list of name, labels and value.
+        """
+        return [
+            (f"{self.name}_total", dict(zip(self.labelnames, labels)), value)
+            for labels, value in self._values.items()
+        ]
+
+
+class Histogram:
+    """
+    Histogram of observed values with fixed buckets.
+
+    Attributes:
+        name (str): Metric name.
+        documentation (str): Metric help text.
+        labelnames (tuple): Names of labels.
+        buckets (tuple): Upper bounds of buckets in increasing order.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        """
+        Record a value.
+
+        :param value: observed value.
+        :param labels: label values in the order of `labelnames`.
+        """
+        series = self._series.get(labels)
+        if series is None:
+            # Bucket counts followed by the sum of values.
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels) -> int:
+        """
+        Get the number of observed values.
+
+        :param labels: label values in the order of `labelnames`.
+
+        :return: number of values.
+        """
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def total(self, *labels) -> float:
+        """
+        Get the sum of observed values.
+
+        :param labels: label values in the order of `labelnames`.
+
+        :return: sum of values.
+        """
+        series = self._series.get(labels)
+        return series[-1] if series else 0.0
+
+    def clear(self) -> None:
+        """
+        Remove all recorded values.
+        """
+        self._series.clear()
+
+    def samples(self) -> list[Sample]:
+        """
+        Get cumulative bucket, count and sum samples of the histogram.
+
+        :return: list of name, labels and value.
+        """
+        samples = []
+        for labels, series in self._series.items():
+            labels = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                bucket_labels = {**labels, "le": format_value(bound)}
+                samples.append((f"{self.name}_bucket", bucket_labels, cumulative))
+            samples.append((f"{self.name}_count", labels, cumulative))
+            samples.append((f"{self.name}_sum", labels, series[-1]))
+        return samples
+
+
+class Registry:
+    """
+    Registry of metrics and collectors of the current process.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._collectors: list[Collector] = []
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """
+        Create and register a counter.
+
+        :param name: metric name without the `_total` suffix.
+        :param documentation: metric help text.
+        :param labelnames: names of labels.
+
+        :return: counter.
+        """
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Create and register a histogram.
+
+        :param name: metric name.
+        :param documentation: metric help text.
+        :param labelnames: names of labels.
+        :param buckets: upper bounds of buckets in increasing order.
+
+        :return: histogram.
+        """
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, collector: Collector) -> Collector:
+        """
+        Register a collector, can be used as a decorator.
+
+        A collector returns tuples of metric name, type, help text and samples.
+
+        :param collector: function returning metric families.
+
+        :return: the collector.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        :return: metrics text.
+        """
+        families = [
+            (metric.name, metric.type, metric.documentation, metric.samples())
+            for metric in self._metrics.values()
+        ]
+        for collector in self._collectors:
+            families.extend(collector())
+
+        lines = []
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(
+                f"{sample}{format_labels(labels)} {format_value(value)}"
+                for sample, labels, value in samples
+            )
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+registry = Registry()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import src.metrics.collectors  # noqa: F401 - registers the collectors
+from src.metrics.registry import registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Get metrics of the current worker in the Prometheus text format.
+
+    :return: metrics text.
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
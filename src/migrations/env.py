@@ -8,7 +8,7 @@ from alembic import context
 from src.main import settings
 from src.models import Base
 from src.auth.models import User
-from src.checks.models import Check, CheckItem
+from src.checks.models import Check, CheckIdempotencyKey, CheckItem, CheckSummary
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
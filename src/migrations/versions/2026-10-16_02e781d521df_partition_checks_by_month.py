@@ -0,0 +1,277 @@
+"""Partition checks by month
+
+Revision ID: 02e781d521df
+Revises: 29abebdadf16
+Create Date: 2026-10-16 23:58:10.402113
+
+Existing tables can not be converted to partitioned ones, so the migration
+creates partitioned `checks` and `check_items`, copies the rows and drops the
+old tables. Tables are locked while rows are copied, run it in a maintenance
+window.
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "02e781d521df"
+down_revision: Union[str, None] = "29abebdadf16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+
+CHECK_INDEXES = (
+    ("ix_checks_id", ["id"]),
+    ("ix_checks_public_uuid", ["public_uuid"]),
+    (
+        "ix_checks_user_id_created_at_id",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    ),
+)
+CHECK_ITEM_INDEXES = (
+    ("ix_check_items_id", ["id"]),
+    ("ix_check_items_check_id", ["check_id"]),
+)
+# Unique indexes of partitioned tables must contain the partition key, so
+# these are only unique before partitioning.
+UNPARTITIONED_UNIQUE_INDEXES = {
+    "ix_checks_id",
+    "ix_checks_public_uuid",
+    "ix_check_items_id",
+}
+
+
+def payment_method_enum() -> postgresql.ENUM:
+    return postgresql.ENUM(
+        "CASH", "CASHLESS", name="payment_method_enum", create_type=False
+    )
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def move_aside(table: str, constraints: Sequence[tuple[str, str]], indexes) -> None:
+    """
+    Rename the table to `<table>_old` and drop its indexes and constraints, so
+    their names can be reused by the new table.
+    """
+    op.rename_table(table, f"{table}_old")
+    for name, type_ in constraints:
+        op.drop_constraint(name, f"{table}_old", type_=type_)
+    for name, _ in indexes:
+        op.drop_index(name, table_name=f"{table}_old")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    move_aside(
+        "check_items",
+        [("check_items_check_id_fkey", "foreignkey"), ("check_items_pkey", "primary")],
+        CHECK_ITEM_INDEXES,
+    )
+    move_aside(
+        "checks",
+        [("checks_user_id_fkey", "foreignkey"), ("checks_pkey", "primary")],
+        CHECK_INDEXES,
+    )
+
+    op.create_table(
+        "checks",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('checks_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("type", payment_method_enum(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("total", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("rest", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column(
+            "public_uuid",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    for name, columns in CHECK_INDEXES:
+        op.create_index(name, "checks", columns, unique=False)
+
+    op.create_table(
+        "check_items",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('check_items_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("price", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("check_id", sa.Integer(), nullable=False),
+        sa.Column("check_created_at", sa.TIMESTAMP(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["check_id", "check_created_at"],
+            ["checks.id", "checks.created_at"],
+            onupdate="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", "check_created_at"),
+        postgresql_partition_by="RANGE (check_created_at)",
+    )
+    for name, columns in CHECK_ITEM_INDEXES:
+        op.create_index(name, "check_items", columns, unique=False)
+
+    # Partitions from the month of the oldest check up to PARTITIONS_AHEAD
+    # months ahead, later ones are created by `src.checks.maintenance`.
+    month, last_month = bind.execute(
+        sa.text(
+            "SELECT date_trunc('month', coalesce(min(created_at), now()))::date, "
+            f"(date_trunc('month', now()) + interval '{PARTITIONS_AHEAD} months')::date "
+            "FROM checks_old"
+        )
+    ).one()
+    while month <= last_month:
+        bounds = f"FROM ('{month}') TO ('{next_month(month)}')"
+        op.execute(
+            f"CREATE TABLE checks_p{month:%Y_%m} PARTITION OF checks FOR VALUES {bounds}"
+        )
+        op.execute(
+            f"CREATE TABLE check_items_p{month:%Y_%m} PARTITION OF check_items "
+            f"FOR VALUES {bounds}"
+        )
+        month = next_month(month)
+
+    op.execute(
+        """
+        INSERT INTO checks (id, type, amount, total, rest, public_uuid, user_id, created_at)
+        SELECT id, type, amount, total, rest, public_uuid, user_id, coalesce(created_at, now())
+        FROM checks_old
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO check_items (id, name, price, quantity, total, check_id, check_created_at)
+        SELECT check_items_old.id, name, price, quantity, check_items_old.total, check_id,
+               coalesce(checks_old.created_at, now())
+        FROM check_items_old
+        JOIN checks_old ON checks_old.id = check_items_old.check_id
+        """
+    )
+
+    op.drop_table("check_items_old")
+    op.drop_table("checks_old")
+    op.execute("ALTER SEQUENCE checks_id_seq OWNED BY checks.id")
+    op.execute("ALTER SEQUENCE check_items_id_seq OWNED BY check_items.id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    move_aside(
+        "check_items",
+        [
+            ("check_items_check_id_check_created_at_fkey", "foreignkey"),
+            ("check_items_pkey", "primary"),
+        ],
+        CHECK_ITEM_INDEXES,
+    )
+    move_aside(
+        "checks",
+        [("checks_user_id_fkey", "foreignkey"), ("checks_pkey", "primary")],
+        CHECK_INDEXES,
+    )
+
+    op.create_table(
+        "checks",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('checks_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("type", payment_method_enum(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("total", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("rest", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column(
+            "public_uuid",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for name, columns in CHECK_INDEXES:
+        op.create_index(
+            name, "checks", columns, unique=name in UNPARTITIONED_UNIQUE_INDEXES
+        )
+
+    op.create_table(
+        "check_items",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('check_items_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("price", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("check_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["check_id"], ["checks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for name, columns in CHECK_ITEM_INDEXES:
+        op.create_index(
+            name, "check_items", columns, unique=name in UNPARTITIONED_UNIQUE_INDEXES
+        )
+
+    op.execute(
+        """
+        INSERT INTO checks (id, type, amount, total, rest, public_uuid, user_id, created_at)
+        SELECT id, type, amount, total, rest, public_uuid, user_id, created_at
+        FROM checks_old
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO check_items (id, name, price, quantity, total, check_id)
+        SELECT id, name, price, quantity, total, check_id
+        FROM check_items_old
+        """
+    )
+
+    op.drop_table("check_items_old")
+    op.drop_table("checks_old")
+    op.execute("ALTER SEQUENCE checks_id_seq OWNED BY checks.id")
+    op.execute("ALTER SEQUENCE check_items_id_seq OWNED BY check_items.id")
@@ -0,0 +1,59 @@
+"""Add check summaries
+
+Revision ID: 29abebdadf16
+Revises: bd2d51e47123
+Create Date: 2026-10-16 23:21:59.988610
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "29abebdadf16"
+down_revision: Union[str, None] = "bd2d51e47123"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "check_summaries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "type",
+            postgresql.ENUM(
+                "CASH", "CASHLESS", name="payment_method_enum", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("rest", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "day", "type"),
+    )
+    # Backfill the summaries of existing checks.
+    op.execute(
+        """
+        INSERT INTO check_summaries (user_id, day, type, count, amount, total, rest)
+        SELECT user_id, created_at::date, type, count(*), sum(amount), sum(total), sum(rest)
+        FROM checks
+        GROUP BY user_id, created_at::date, type
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("check_summaries")
@@ -0,0 +1,58 @@
+"""Add check listing indexes
+
+Revision ID: bd2d51e47123
+Revises: 1aeff972668a
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bd2d51e47123"
+down_revision: Union[str, None] = "1aeff972668a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes are built concurrently so large tables stay writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_checks_user_id_created_at_id",
+            "checks",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_check_items_check_id"),
+            "check_items",
+            ["check_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_check_items_check_id"),
+            table_name="check_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_checks_user_id_created_at_id",
+            table_name="checks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -1,11 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Optional, Type, Generic
+from typing import Callable, Hashable, TypeVar, Optional, Type, Generic
 
 from pydantic import BaseModel
-from sqlalchemy import insert, select
+from sqlalchemy import Executable, bindparam, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar("T", bound=BaseModel)
+S = TypeVar("S", bound=Executable)
+
+
+class StatementCache:
+    """
+    Statements built once per shape and reused with bound parameters.
+
+    A statement is keyed by the names of its parameters, so every
+    combination of filters gets one statement object. Reusing the object
+    skips rebuilding the construct and its compile cache key, and the SQL
+    text stays the same for the asyncpg prepared statement cache.
+
+    Attributes:
+        hits (int): Number of lookups served by a built statement.
+        misses (int): Number of statements built.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[Hashable, Executable] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], S]) -> S:
+        """
+        Get a statement, building it on the first lookup of the key.
+
+        :param key: statement key.
+        :param build: function building the statement.
+
+        :return: statement.
+        """
+        statement = self._statements.get(key)
+        if statement is None:
+            self.misses += 1
+            statement = self._statements[key] = build()
+        else:
+            self.hits += 1
+        return statement
+
+    def clear(self) -> None:
+        """
+        Remove all statements.
+        """
+        self._statements.clear()
+
+    def stats(self) -> dict:
+        """
+        Get statement cache metrics of the current worker.
+
+        :return: dictionary with cache size, hits and misses.
+        """
+        return {"size": len(self._statements), "hits": self.hits, "misses": self.misses}
+
+
+statement_cache = StatementCache()
 
 
 class AbstractRepository(ABC):
@@ -36,17 +91,73 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
+    def cached_statement(
+        self, name: str, parameters: dict, build: Callable[[tuple[str, ...]], S]
+    ) -> S:
+        """
+        Get a statement of the repository model from the statement cache.
+
+        :param name: statement name, unique within the repository.
+        :param parameters: parameters the statement is executed with.
+        :param build: function building the statement from parameter names.
+
+        :return: statement.
+        """
+        keys = tuple(parameters)
+        return statement_cache.get((self.model, name, keys), lambda: build(keys))
+
+    def _equality_statement(self, name: str, data: dict) -> tuple[Executable, dict]:
+        """
+        Get a statement selecting the model by equality with all `data` values.
+
+        None values are compared with IS NULL instead of a parameter, so which
+        values are None is part of the statement key.
+
+        :param name: statement name, unique within the repository.
+        :param data: dictionary with filter parameters.
+
+        :return: statement and parameters to execute it with.
+        """
+        parameters = {key: value for key, value in data.items() if value is not None}
+        null_keys = tuple(key for key, value in data.items() if value is None)
+        statement = statement_cache.get(
+            (self.model, name, tuple(parameters), null_keys),
+            lambda: select(self.model).filter(
+                *self._build_equality_filters(tuple(parameters), null_keys)
+            ),
+        )
+        return statement, parameters
+
+    def _build_equality_filters(
+        self, keys: tuple[str, ...], null_keys: tuple[str, ...] = ()
+    ) -> list:
+        """
+        Build filters comparing model attributes with parameters of the same name.
+
+        :param keys: attribute names.
+        :param null_keys: names of attributes that must be NULL.
+
+        :return: filters.
+        """
+        return [getattr(self.model, key) == bindparam(key) for key in keys] + [
+            getattr(self.model, key).is_(None) for key in null_keys
+        ]
+
     async def add(self, data: dict, **kwargs) -> T:
         """
         Add entity to database.
 
+        The entity is written in the current transaction, committing it is
+        left to the unit of work.
+
         :param data: dictionary with entity data.
 
         :return: dictionary with created entity data.
         """
-        statement = insert(self.model).values(**data).returning(self.model)
-        added_data = await self.session.execute(statement)
-        await self.session.commit()
+        statement = self.cached_statement(
+            "add", {}, lambda _: insert(self.model).returning(self.model)
+        )
+        added_data = await self.session.execute(statement, data)
         result = added_data.scalar_one_or_none()
         return result.as_dict(**kwargs) if result else None
 
@@ -58,8 +169,8 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
 
         :return: None
         """
-        statement = select(self.model).filter_by(**data)
-        received_data = await self.session.execute(statement)
+        statement, parameters = self._equality_statement("get", data)
+        received_data = await self.session.execute(statement, parameters)
         result = received_data.scalar_one_or_none()
         return result.as_dict() if result else None
 
@@ -69,7 +180,7 @@ class SQLAlchemyRepository(AbstractRepository, Generic[T]):
 
         :return: List of dictionaries containing record data.
         """
-        statement = select(self.model).filter_by(**data)
-        received_data = await self.session.execute(statement)
+        statement, parameters = self._equality_statement("list", data)
+        received_data = await self.session.execute(statement, parameters)
         result = received_data.scalars().all()
         return [record.as_dict() for record in result]
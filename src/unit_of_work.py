@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
 
 from src.auth.repository import UserRepository
-from src.checks.repository import CheckRepository, CheckItemRepository
+from src.checks.repository import (
+    CheckRepository,
+    CheckIdempotencyKeyRepository,
+    CheckItemRepository,
+    CheckSummaryRepository,
+)
 from src.database import async_session_maker
 
 
@@ -13,6 +18,8 @@ class AbstractUnitOfWorkManager(ABC):
     users: UserRepository
     checks: CheckRepository
     check_items: CheckItemRepository
+    check_summaries: CheckSummaryRepository
+    idempotency_keys: CheckIdempotencyKeyRepository
 
     @abstractmethod
     def __init__(self, *args, **kwargs) -> None:
@@ -38,21 +45,38 @@ class AbstractUnitOfWorkManager(ABC):
 class SQLAlchemyUnitOfWorkManager(AbstractUnitOfWorkManager):
     """
     Unit of Work Manager for SQLAlchemy ORM.
+
+    The manager is re-entrant: the outermost `async with` opens the session and
+    nested entries (for example service methods called inside the request
+    scope of `get_uow`) reuse it, so one request gets exactly one session and
+    one connection checkout. Uncommitted work is rolled back when a block exits
+    with an exception or when the outermost block exits, which also closes the
+    session.
     """
 
     def __init__(self) -> None:
         self.session_factory = async_session_maker
+        self.depth = 0
 
     async def __aenter__(self) -> AbstractUnitOfWorkManager:
-        self.session = self.session_factory()
-        self.users = UserRepository(self.session)
-        self.checks = CheckRepository(self.session)
-        self.check_items = CheckItemRepository(self.session)
-        return await super().__aenter__()
+        if self.depth == 0:
+            self.session = self.session_factory()
+            self.users = UserRepository(self.session)
+            self.checks = CheckRepository(self.session)
+            self.check_items = CheckItemRepository(self.session)
+            self.check_summaries = CheckSummaryRepository(self.session)
+            self.idempotency_keys = CheckIdempotencyKeyRepository(self.session)
+
+        self.depth += 1
+        return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        await super().__aexit__(exc_type, exc_val, exc_tb)
-        await self.session.close()
+        self.depth -= 1
+        if exc_type is not None or self.depth == 0:
+            await self.rollback()
+
+        if self.depth == 0:
+            await self.session.close()
 
     async def commit(self) -> None:
         await self.session.commit()
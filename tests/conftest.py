@@ -1,11 +1,16 @@
 import asyncio
+import functools
 import uuid
+from contextlib import contextmanager
 
+import asyncpg
 import pytest
 import pytest_asyncio
 from faker import Faker
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 
+from src.database import engine
 from src.main import app
 
 faker = Faker()
@@ -32,7 +37,9 @@ async def user_tokens():
         "password": TEST_PASSWORD,
     }
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
         response = await client.post("/auth/login", json=auth_data)
         response_data = response.json()
 
@@ -40,3 +47,57 @@ async def user_tokens():
     refresh_token = response_data.get("refresh_token")
 
     return access_token, refresh_token
+
+
+class QueryCounter:
+    """
+    Recorder of SQL statements executed through the engine and of COPY
+    operations, which asyncpg runs without a cursor.
+    """
+
+    def __init__(self) -> None:
+        self.statements = []
+
+    def record(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def record_copy(self, copy):
+        """
+        Wrap an asyncpg COPY method to record every call.
+        """
+
+        @functools.wraps(copy)
+        async def recorded_copy(connection, table_name, *args, **kwargs):
+            self.statements.append(f"COPY {table_name}")
+            return await copy(connection, table_name, *args, **kwargs)
+
+        return recorded_copy
+
+    @contextmanager
+    def budget(self, limit: int):
+        """
+        Fail when the block executes more than `limit` statements.
+        """
+        start = len(self.statements)
+        yield
+        executed = self.statements[start:]
+        assert len(executed) <= limit, (
+            f"{len(executed)} queries executed, budget is {limit}:\n"
+            + "\n".join(executed)
+        )
+
+
+@pytest.fixture(scope="function")
+def query_counter(monkeypatch):
+    """
+    Count SQL statements and COPY operations executed during the test.
+    """
+    counter = QueryCounter()
+    monkeypatch.setattr(
+        asyncpg.Connection,
+        "copy_records_to_table",
+        counter.record_copy(asyncpg.Connection.copy_records_to_table),
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", counter.record)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter.record)
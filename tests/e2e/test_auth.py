@@ -41,7 +41,10 @@ async def test_register_user_fail():
             },
         )
     assert response.status_code == 409
-    assert response.json()["detail"] == f"User with username '{TEST_LOGIN}' already exists."
+    assert (
+        response.json()["detail"]
+        == f"User with username '{TEST_LOGIN}' already exists."
+    )
 
 
 @pytest.mark.asyncio
@@ -77,3 +80,15 @@ async def test_login_user_fail():
         )
     assert response.status_code == 401
     assert response.json()["detail"] == "Invalid password."
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_fail():
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": "Bearer invalid-token"},
+    ) as client:
+        response = await client.get("/checks")
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid token"
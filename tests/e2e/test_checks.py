@@ -1,6 +1,14 @@
+import csv
+import io
+import json
+import uuid
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 
+from src.checks.cache import idempotency_cache, receipt_cache
+from src.checks.rendering import receipt_template_version
+from src.config import settings
 from src.main import app
 
 CHECK_ID, CHECK_UUID = None, None
@@ -23,16 +31,9 @@ async def test_create_check_success(user_tokens):
             "/checks",
             json={
                 "products": [
-                    {
-                        "name": "Dji Mavic",
-                        "price": 20000,
-                        "quantity": 2
-                    },
+                    {"name": "Dji Mavic", "price": 20000, "quantity": 2},
                 ],
-                "payment": {
-                    "type": "cash",
-                    "amount": 60000
-                }
+                "payment": {"type": "cash", "amount": 60000},
             },
         )
     assert response.status_code == 201
@@ -105,3 +106,455 @@ async def test_get_check_by_uuid_success(user_tokens):
         response = await client.get(f"/checks/public/{CHECK_UUID}")
 
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_check_pagination_success(user_tokens):
+    """
+    [Successful] Test get check endpoint keyset pagination.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        await client.post(
+            "/checks",
+            json={
+                "products": [{"name": "Dji Mini", "price": 100, "quantity": 1}],
+                "payment": {"type": "cashless", "amount": 150},
+            },
+        )
+        first_page = await client.get("/checks", params={"limit": 1})
+        next_cursor = first_page.headers.get("X-Next-Cursor")
+        second_page = await client.get(
+            "/checks", params={"limit": 1, "cursor": next_cursor}
+        )
+
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 1
+    assert next_cursor is not None
+    assert second_page.status_code == 200
+    assert len(second_page.json()) == 1
+    assert second_page.json()[0]["id"] < first_page.json()[0]["id"]
+
+
+@pytest.mark.asyncio
+async def test_get_check_by_created_at_success(user_tokens):
+    """
+    [Successful] Test get check endpoint filtered by creation date.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.get(
+            "/checks", params={"created_at__gte": "2000-01-01T00:00:00Z"}
+        )
+
+    assert response.status_code == 200
+    assert CHECK_ID in [check["id"] for check in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_get_check_invalid_cursor_fail(user_tokens):
+    """
+    [Failed] Test get check endpoint with a malformed cursor.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.get("/checks", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor."
+
+
+@pytest.mark.asyncio
+async def test_create_checks_batch_success(user_tokens):
+    """
+    [Successful] Test create checks batch endpoint with a rejected check.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.post(
+            "/checks/batch",
+            json=[
+                {
+                    "products": [
+                        {"name": "Dji Mavic", "price": 200, "quantity": 2},
+                        {"name": "Dji Goggles", "price": 50, "quantity": 1},
+                    ],
+                    "payment": {"type": "cash", "amount": 500},
+                },
+                {
+                    "products": [{"name": "Dji Mini", "price": -1, "quantity": 1}],
+                    "payment": {"type": "cash", "amount": 100},
+                },
+                {
+                    "products": [{"name": "Dji Avata", "price": 300, "quantity": 1}],
+                    "payment": {"type": "cashless", "amount": 400},
+                },
+            ],
+        )
+        response_data = response.json()
+
+    assert response.status_code == 201
+    assert len(response_data["created"]) == 2
+    assert len(response_data["created"][0]["products"]) == 2
+    assert response_data["created"][0]["total"] == 450
+    assert response_data["created"][1]["products"][0]["name"] == "Dji Avata"
+    assert response_data["created"][1]["rest"] == 100
+    assert len(response_data["errors"]) == 1
+    assert response_data["errors"][0]["index"] == 1
+
+
+@pytest.mark.asyncio
+async def test_create_checks_batch_empty_check_fail(user_tokens):
+    """
+    [Failed] Test checks without products or with a zero total are rejected.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.post(
+            "/checks/batch",
+            json=[
+                {"products": [], "payment": {"type": "cash", "amount": 100}},
+                {
+                    "products": [{"name": "Sticker", "price": 0.001, "quantity": 1}],
+                    "payment": {"type": "cash", "amount": 100},
+                },
+                {
+                    "products": [{"name": "Dji Avata", "price": 300, "quantity": 1}],
+                    "payment": {"type": "cashless", "amount": 400},
+                },
+            ],
+        )
+        response_data = response.json()
+
+    assert response.status_code == 201
+    assert len(response_data["created"]) == 1
+    assert [error["index"] for error in response_data["errors"]] == [0, 1]
+    assert response_data["errors"][0]["detail"] == (
+        "Check total must be greater than zero."
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_check_large_basket_success(user_tokens):
+    """
+    [Successful] Test create check endpoint with a basket written through COPY.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        created = await client.post(
+            "/checks",
+            json={
+                "products": [
+                    {"name": f"Product {index}", "price": 1.5, "quantity": 2}
+                    for index in range(settings.CHECK_ITEMS_COPY_THRESHOLD)
+                ],
+                "payment": {"type": "cash", "amount": 1000},
+            },
+        )
+        response = await client.get(f"/checks/{created.json()['id']}")
+
+    assert created.status_code == 201
+    assert len(created.json()["products"]) == settings.CHECK_ITEMS_COPY_THRESHOLD
+    assert response.status_code == 200
+    assert len(response.json()["products"]) == settings.CHECK_ITEMS_COPY_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_get_check_by_uuid_not_modified(user_tokens):
+    """
+    [Successful] Test get check by uuid endpoint answers If-None-Match with 304.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+    ) as client:
+        response = await client.get(f"/checks/public/{CHECK_UUID}")
+        etag = response.headers["ETag"]
+        cached_response = await client.get(f"/checks/public/{CHECK_UUID}")
+        not_modified = await client.get(
+            f"/checks/public/{CHECK_UUID}",
+            headers={"If-None-Match": etag},
+        )
+
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
+    assert cached_response.content == response.content
+    assert cached_response.headers["ETag"] == etag
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+@pytest.mark.asyncio
+async def test_get_check_by_uuid_any_etag(user_tokens):
+    """
+    [Successful] Test If-None-Match: * is only answered with 304 for existing checks.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+    ) as client:
+        existing = await client.get(
+            f"/checks/public/{CHECK_UUID}", headers={"If-None-Match": "*"}
+        )
+        missing = await client.get(
+            f"/checks/public/{uuid.uuid4()}", headers={"If-None-Match": "*"}
+        )
+
+    assert existing.status_code == 304
+    assert missing.status_code == 404
+    assert await receipt_cache.get(f"{CHECK_UUID}-{receipt_template_version}")
+
+
+@pytest.mark.asyncio
+async def test_export_checks_ndjson_success(user_tokens, monkeypatch):
+    """
+    [Successful] Test export checks endpoint in NDJSON format.
+    """
+    monkeypatch.setattr(settings, "CHECKS_EXPORT_FETCH_SIZE", 1)
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        listing = await client.get("/checks", params={"limit": 1000})
+        response = await client.get("/checks/export")
+
+    checks = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert checks == listing.json()
+
+
+@pytest.mark.asyncio
+async def test_export_checks_csv_success(user_tokens):
+    """
+    [Successful] Test export checks endpoint in CSV format.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.get(
+            "/checks/export", params={"format": "csv", "type": "cash"}
+        )
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert {row["payment_type"] for row in rows} == {"cash"}
+    assert CHECK_ID in [int(row["id"]) for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_get_check_summary_success(user_tokens):
+    """
+    [Successful] Test check summary endpoint matches the listed checks.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        checks = (await client.get("/checks", params={"limit": 1000})).json()
+        days = await client.get("/checks/summary")
+        months = await client.get("/checks/summary", params={"period": "month"})
+
+    assert days.status_code == 200
+    assert months.status_code == 200
+    assert sum(summary["count"] for summary in days.json()) == len(checks)
+    assert sum(summary["count"] for summary in months.json()) == len(checks)
+    assert sum(summary["total"] for summary in days.json()) == pytest.approx(
+        sum(check["total"] for check in checks)
+    )
+    assert sum(
+        summary["payments"].get("cash", {}).get("count", 0) for summary in months.json()
+    ) == len([check for check in checks if check["payment"]["type"] == "cash"])
+
+
+@pytest.mark.asyncio
+async def test_create_check_exact_payment_success(user_tokens):
+    """
+    [Successful] Test create check endpoint with exact payment and no cent drift.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.post(
+            "/checks",
+            json={
+                "products": [{"name": "Gum", "price": 0.1, "quantity": 3}],
+                "payment": {"type": "cash", "amount": 0.3},
+            },
+        )
+
+    assert response.status_code == 201
+    assert response.json()["total"] == 0.3
+    assert response.json()["rest"] == 0
+
+
+@pytest.mark.asyncio
+async def test_create_check_insufficient_payment_fail(user_tokens):
+    """
+    [Failed] Test create check endpoint with payment less than the total.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        before = await client.get("/checks/summary")
+        response = await client.post(
+            "/checks",
+            json={
+                "products": [{"name": "Gum", "price": 0.1, "quantity": 3}],
+                "payment": {"type": "cash", "amount": 0.29},
+            },
+        )
+        after = await client.get("/checks/summary")
+
+    assert response.status_code == 400
+    assert "Payment amount is less than the check total." in response.json()["detail"]
+    assert after.json() == before.json()
+
+
+@pytest.mark.asyncio
+async def test_create_check_idempotent_retry_success(user_tokens):
+    """
+    [Successful] Test a retry with the same Idempotency-Key returns the created check.
+    """
+    access_token, _ = user_tokens
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    check = {
+        "products": [{"name": "Coffee", "price": 2.5, "quantity": 2}],
+        "payment": {"type": "cashless", "amount": 5},
+    }
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        before = await client.get("/checks/summary")
+        created = await client.post("/checks", json=check, headers=headers)
+        cached_retry = await client.post("/checks", json=check, headers=headers)
+        idempotency_cache.clear()
+        stored_retry = await client.post("/checks", json=check, headers=headers)
+        after = await client.get("/checks/summary")
+
+    assert created.status_code == 201
+    assert "Idempotent-Replayed" not in created.headers
+    for retry in (cached_retry, stored_retry):
+        assert retry.status_code == 201
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert retry.json() == created.json()
+    assert sum(summary["count"] for summary in after.json()) == (
+        sum(summary["count"] for summary in before.json()) + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_check_idempotency_key_reused_fail(user_tokens):
+    """
+    [Failed] Test an Idempotency-Key can not be reused with another body.
+    """
+    access_token, _ = user_tokens
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    check = {
+        "products": [{"name": "Coffee", "price": 2.5, "quantity": 2}],
+        "payment": {"type": "cashless", "amount": 5},
+    }
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        await client.post("/checks", json=check, headers=headers)
+        check["products"][0]["quantity"] = 1
+        response = await client.post("/checks", json=check, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == (
+        "Idempotency key was already used with another request."
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_check_by_uuid_streamed(user_tokens, monkeypatch):
+    """
+    [Successful] Test receipts of large checks are streamed and not cached.
+    """
+    access_token, _ = user_tokens
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        created = await client.post(
+            "/checks",
+            json={
+                "products": [
+                    {"name": f"Product {index}", "price": 1.5, "quantity": 2}
+                    for index in range(20)
+                ],
+                "payment": {"type": "cash", "amount": 100},
+            },
+        )
+        public_uuid = created.json()["public_uuid"]
+        monkeypatch.setattr(settings, "RECEIPT_STREAM_THRESHOLD", 20)
+        streamed = await client.get(f"/checks/public/{public_uuid}")
+        monkeypatch.setattr(settings, "RECEIPT_STREAM_THRESHOLD", 1000)
+        rendered = await client.get(f"/checks/public/{public_uuid}")
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("text/html")
+    assert "content-length" not in streamed.headers
+    assert "ETag" in streamed.headers
+    assert streamed.content == rendered.content
+    assert "Product 19" in streamed.text
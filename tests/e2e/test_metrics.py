@@ -0,0 +1,33 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.main import app
+from src.metrics.middleware import request_duration, request_queries
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_request(user_tokens):
+    """
+    [Successful] Test requests are recorded by route template with their queries.
+    """
+    access_token, _ = user_tokens
+    requests = request_duration.count("GET", "/checks/{check_id}", 404)
+    queries = request_queries.total("/checks/{check_id}")
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.get("/checks/0")
+        assert response.status_code == 404
+
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert request_duration.count("GET", "/checks/{check_id}", 404) == requests + 1
+    assert request_queries.total("/checks/{check_id}") > queries
+    assert 'route="/checks/{check_id}",status="404"' in response.text
+    assert "db_pool_checked_out " in response.text
+    assert 'cache_hits_total{cache="token"}' in response.text
@@ -0,0 +1,176 @@
+import json
+import os
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.config import settings
+from src.main import app
+from src.metrics.middleware import request_queries
+from src.metrics.profiling import ProfileWriter, ProfilingMiddleware, StackSampler
+
+
+def read_captures(directory) -> list[dict]:
+    captures = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name)) as file:
+            captures.append(json.load(file))
+    return captures
+
+
+@pytest.mark.asyncio
+async def test_profile_requested_with_header(user_tokens, tmp_path):
+    """
+    [Successful] Test only requests with the operator token are captured.
+    """
+    access_token, _ = user_tokens
+    sampler = StackSampler(interval=0.001)
+    profiled_app = ProfilingMiddleware(
+        app,
+        sample_rate=0,
+        slow_request_ms=0,
+        token="operator-token",
+        sampler=sampler,
+        writer=ProfileWriter(str(tmp_path), max_files=2),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(profiled_app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        await client.get("/checks")
+        await client.get("/checks", headers={"X-Profile": "wrong-token"})
+        assert os.listdir(tmp_path) == []
+
+        for _ in range(3):
+            response = await client.get(
+                "/checks", params={"limit": 5}, headers={"X-Profile": "operator-token"}
+            )
+            assert response.status_code == 200
+    sampler.shutdown()
+
+    captures = read_captures(tmp_path)
+    assert len(captures) == 2
+    assert captures[-1]["route"] == "/checks"
+    assert captures[-1]["reason"] == "header"
+    assert captures[-1]["status"] == 200
+    assert any("check" in query["statement"] for query in captures[-1]["queries"])
+
+
+@pytest.mark.asyncio
+async def test_profile_slow_requests(tmp_path):
+    """
+    [Successful] Test requests over the latency threshold are captured.
+    """
+    sampler = StackSampler(interval=0.001)
+    profiled_app = ProfilingMiddleware(
+        app,
+        sample_rate=0,
+        slow_request_ms=60_000,
+        token="",
+        sampler=sampler,
+        writer=ProfileWriter(str(tmp_path), max_files=10),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(profiled_app), base_url="http://test"
+    ) as client:
+        await client.get("/checks/public/00000000-0000-0000-0000-000000000000")
+        assert os.listdir(tmp_path) == []
+
+        profiled_app.slow_request_seconds = 0.000001
+        await client.get("/checks/public/00000000-0000-0000-0000-000000000000")
+    sampler.shutdown()
+
+    [capture] = read_captures(tmp_path)
+    assert capture["reason"] == "slow"
+    assert capture["route"] == "/checks/public/{public_uuid}"
+    assert capture["queries"]
+
+
+@pytest.mark.asyncio
+async def test_profile_records_copy(user_tokens, tmp_path):
+    """
+    [Successful] Test check items written with COPY are recorded as a query.
+    """
+    access_token, _ = user_tokens
+    sampler = StackSampler(interval=0.001)
+    profiled_app = ProfilingMiddleware(
+        app,
+        sample_rate=1,
+        slow_request_ms=0,
+        token="",
+        sampler=sampler,
+        writer=ProfileWriter(str(tmp_path), max_files=10),
+    )
+    queries = request_queries.total("/checks")
+
+    async with AsyncClient(
+        transport=ASGITransport(profiled_app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        response = await client.post(
+            "/checks",
+            json={
+                "products": [
+                    {"name": f"Product {index}", "price": 1, "quantity": 1}
+                    for index in range(settings.CHECK_ITEMS_COPY_THRESHOLD)
+                ],
+                "payment": {"type": "cash", "amount": 1000},
+            },
+        )
+        assert response.status_code == 201
+    sampler.shutdown()
+
+    [capture] = read_captures(tmp_path)
+    statements = [query["statement"] for query in capture["queries"]]
+    assert any(statement.startswith("COPY check_items") for statement in statements)
+    assert request_queries.total("/checks") - queries == len(statements)
+
+
+class FailingWriter(ProfileWriter):
+    def write(self, name: str, capture: dict) -> str:
+        raise OSError("No space left on device")
+
+
+@pytest.mark.asyncio
+async def test_profile_write_error_does_not_fail_request(tmp_path):
+    """
+    [Successful] Test a capture that cannot be written does not fail the request.
+    """
+    sampler = StackSampler(interval=0.001)
+    profiled_app = ProfilingMiddleware(
+        app,
+        sample_rate=1,
+        slow_request_ms=0,
+        token="",
+        sampler=sampler,
+        writer=FailingWriter(str(tmp_path), max_files=10),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(profiled_app), base_url="http://test"
+    ) as client:
+        response = await client.get("/metrics")
+    sampler.shutdown()
+
+    assert response.status_code == 200
+
+
+def test_profile_rotation_tolerates_removed_files(tmp_path, monkeypatch):
+    """
+    [Successful] Test rotation skips old files already removed by another writer.
+    """
+    writer = ProfileWriter(str(tmp_path), max_files=1)
+    writer.write("1-first", {})
+
+    def remove_concurrently(path):
+        os.unlink(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "remove", remove_concurrently)
+    writer.write("2-second", {})
+
+    assert os.listdir(tmp_path) == ["2-second.json"]
@@ -0,0 +1,128 @@
+import uuid
+
+import pytest
+from fastapi.routing import APIRoute
+from httpx import AsyncClient, ASGITransport
+
+from src.main import app
+
+# Maximum number of SQL statements per request, COPY operations included.
+# Check listings read checks and then their items with one
+# `= ANY(:check_ids)` query, so budgets do not grow with the
+# number of checks or items. Raise a budget only together with the change
+# that needs the extra query.
+QUERY_BUDGETS = {
+    "POST /auth/register": 2,
+    "POST /auth/login": 1,
+    "POST /checks": 6,
+    "POST /checks/batch": 3,
+    "GET /checks": 2,
+    "GET /checks/export": 1,
+    "GET /checks/summary": 1,
+    "GET /checks/{check_id}": 2,
+    "GET /checks/public/{public_uuid}": 2,
+    "GET /metrics": 0,
+}
+
+
+def make_check(items: int) -> dict:
+    """
+    Build a check payload with the given number of products.
+    """
+    return {
+        "products": [
+            {"name": f"Product {index}", "price": 12.5, "quantity": 2}
+            for index in range(items)
+        ],
+        "payment": {"type": "cash", "amount": 25.0 * items + 10},
+    }
+
+
+def test_every_endpoint_has_query_budget():
+    """
+    [Successful] Test a query budget is declared for every endpoint.
+    """
+    endpoints = {
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+    assert endpoints <= QUERY_BUDGETS.keys()
+
+
+@pytest.mark.asyncio
+async def test_endpoints_stay_within_query_budgets(query_counter):
+    """
+    [Successful] Test endpoints stay within their query budgets with many checks.
+    """
+    credentials = {"login": f"test-{uuid.uuid4()}", "password": "password"}
+
+    async with AsyncClient(
+        transport=ASGITransport(app),
+        base_url="http://test",
+    ) as client:
+        with query_counter.budget(QUERY_BUDGETS["POST /auth/register"]):
+            response = await client.post(
+                "/auth/register",
+                json={"first_name": "John", "last_name": "Doe", **credentials},
+            )
+        assert response.status_code == 201
+
+        with query_counter.budget(QUERY_BUDGETS["POST /auth/login"]):
+            response = await client.post("/auth/login", json=credentials)
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        with query_counter.budget(QUERY_BUDGETS["POST /checks"]):
+            response = await client.post(
+                "/checks",
+                json=make_check(3),
+                headers={"Idempotency-Key": str(uuid.uuid4())},
+            )
+        assert response.status_code == 201
+
+        # Items of the first batch are inserted, the second one has enough
+        # items to be written with COPY.
+        for batch_items in (range(1, 6), range(1, 21)):
+            with query_counter.budget(QUERY_BUDGETS["POST /checks/batch"]):
+                response = await client.post(
+                    "/checks/batch", json=[make_check(items) for items in batch_items]
+                )
+            assert response.status_code == 201
+        assert "COPY check_items" in query_counter.statements
+
+        with query_counter.budget(QUERY_BUDGETS["GET /checks"]):
+            response = await client.get("/checks", params={"limit": 20})
+        assert len(response.json()) == 20
+        check = response.json()[0]
+
+        with query_counter.budget(QUERY_BUDGETS["GET /checks/export"]):
+            response = await client.get("/checks/export")
+        assert response.status_code == 200
+
+        with query_counter.budget(QUERY_BUDGETS["GET /checks/summary"]):
+            response = await client.get("/checks/summary")
+        assert response.status_code == 200
+
+        with query_counter.budget(QUERY_BUDGETS["GET /checks/{check_id}"]):
+            response = await client.get(f"/checks/{check['id']}")
+        assert response.status_code == 200
+
+        with query_counter.budget(QUERY_BUDGETS["GET /checks/public/{public_uuid}"]):
+            response = await client.get(f"/checks/public/{check['public_uuid']}")
+        assert response.status_code == 200
+
+        with query_counter.budget(QUERY_BUDGETS["GET /metrics"]):
+            response = await client.get("/metrics")
+        assert response.status_code == 200
+
+
+def test_query_budget_exceeded(query_counter):
+    """
+    [Failed] Test a block executing more queries than its budget fails.
+    """
+    with pytest.raises(AssertionError, match="2 queries executed, budget is 1"):
+        with query_counter.budget(1):
+            query_counter.record(None, None, "SELECT 1", None, None, False)
+            query_counter.record(None, None, "SELECT 2", None, None, False)
@@ -0,0 +1,101 @@
+import os
+import tarfile
+import uuid
+import zipfile
+
+import pytest
+
+from src.auth.services import UserService
+from src.checks import bulk_render
+from src.checks.rendering import render_receipt
+from src.checks.services import CheckService
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+CHECKS = 5
+
+
+async def create_checks() -> tuple[int, list[str]]:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+
+    public_uuids = []
+    for index in range(CHECKS):
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            check = await CheckService(uow).create_check(
+                user["id"],
+                {
+                    "products": [
+                        {"name": f"Product {index}", "price": 12.5, "quantity": 2}
+                    ],
+                    "payment": {"type": "cash", "amount": 100.0},
+                },
+            )
+        public_uuids.append(check.public_uuid)
+    return user["id"], public_uuids
+
+
+async def render(user_id: int, output: str, checkpoint: str = None) -> int:
+    args = bulk_render.build_parser().parse_args(
+        ["--output", output, "--user-id", str(user_id), "--workers", "1"]
+        + ["--batch-size", "2"]
+        + (["--checkpoint", checkpoint] if checkpoint else [])
+    )
+    return await bulk_render.run(args)
+
+
+@pytest.mark.asyncio
+async def test_render_to_directory(tmp_path):
+    """
+    [Successful] Test receipts are written as served by the public endpoint.
+    """
+    user_id, public_uuids = await create_checks()
+
+    assert await render(user_id, str(tmp_path)) == CHECKS
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        f"{public_uuid}.html" for public_uuid in public_uuids
+    )
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        check = await CheckService(uow).get_check_by_public_uuid(public_uuids[0])
+    with open(tmp_path / f"{public_uuids[0]}.html", "rb") as file:
+        assert file.read() == render_receipt(check)
+
+
+@pytest.mark.asyncio
+async def test_render_resumes_from_checkpoint(tmp_path):
+    """
+    [Successful] Test a run with a checkpoint renders only the remaining checks.
+    """
+    user_id, public_uuids = await create_checks()
+    output = str(tmp_path / "receipts.zip")
+    checkpoint = str(tmp_path / "receipts.checkpoint")
+
+    assert await render(user_id, output, checkpoint) == CHECKS
+    assert await render(user_id, output, checkpoint) == 0
+
+    with zipfile.ZipFile(output) as archive:
+        assert sorted(archive.namelist()) == sorted(
+            f"{public_uuid}.html" for public_uuid in public_uuids
+        )
+
+    os.remove(checkpoint)
+    bulk_render.write_checkpoint(checkpoint, await newest_position(user_id))
+    output = str(tmp_path / "receipts.tar")
+
+    assert await render(user_id, output, checkpoint) == CHECKS - 1
+    with tarfile.open(output) as archive:
+        assert f"{public_uuids[-1]}.html" not in archive.getnames()
+        assert len(archive.getnames()) == CHECKS - 1
+
+
+async def newest_position(user_id: int):
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        checks, _ = await uow.checks.get_rows(data={"user_id": user_id}, limit=1)
+    return checks[0].created_at, checks[0].id
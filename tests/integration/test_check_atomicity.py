@@ -0,0 +1,38 @@
+import uuid
+
+import pytest
+
+from src.auth.services import UserService
+from src.checks.services import CheckService
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+@pytest.mark.asyncio
+async def test_create_check_is_atomic():
+    """
+    [Failed] Test a check is not stored when its items fail to insert.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+
+    with pytest.raises(Exception):
+        async with SQLAlchemyUnitOfWorkManager() as uow:
+            await CheckService(uow).create_check(
+                user["id"],
+                {
+                    "products": [{"name": "x" * 256, "price": 10.0, "quantity": 1}],
+                    "payment": {"type": "cash", "amount": 100.0},
+                },
+            )
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        checks = await uow.checks.get_by_data(data={"user_id": user["id"]})
+
+    assert checks == []
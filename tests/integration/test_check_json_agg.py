@@ -0,0 +1,89 @@
+import json
+import uuid
+
+import pytest
+
+from src.auth.services import UserService
+from src.checks.services import CheckService
+from src.config import settings
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+async def create_user_with_checks() -> int:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+
+    checks = [
+        {
+            "products": [
+                {"name": f"Product {index}", "price": 12.5, "quantity": index + 1}
+                for index in range(items)
+            ],
+            "payment": {"type": payment_type, "amount": 1000.0},
+        }
+        for items, payment_type in ((3, "cash"), (1, "cashless"), (5, "cash"))
+    ]
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        await CheckService(uow).create_checks(user["id"], checks)
+
+    return user["id"]
+
+
+@pytest.mark.asyncio
+async def test_json_agg_page_matches_rows(monkeypatch):
+    """
+    [Successful] Test json_agg documents match the checks serialized from rows.
+    """
+    user_id = await create_user_with_checks()
+    filters = {"user_id": user_id}
+
+    monkeypatch.setattr(settings, "CHECKS_READ_MODE", "rows")
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        rows, rows_cursor = await CheckService(uow).get_checks_page_json(filters, 2)
+
+    monkeypatch.setattr(settings, "CHECKS_READ_MODE", "json_agg")
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        documents, documents_cursor = await CheckService(uow).get_checks_page_json(
+            filters, 2
+        )
+
+    assert json.loads(documents) == json.loads(rows)
+    assert documents_cursor == rows_cursor
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        documents, documents_cursor = await CheckService(uow).get_checks_page_json(
+            filters, 2, cursor=documents_cursor
+        )
+
+    checks = json.loads(documents)
+    assert len(checks) == 1
+    assert len(checks[0]["products"]) == 3
+    assert documents_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_json_agg_check_matches_rows(monkeypatch):
+    """
+    [Successful] Test a json_agg document of one check matches its rows.
+    """
+    user_id = await create_user_with_checks()
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        checks = await uow.checks.get_rows(data={"user_id": user_id}, limit=1)
+    check_id = checks[0][0].id
+
+    monkeypatch.setattr(settings, "CHECKS_READ_MODE", "rows")
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        rows = await CheckService(uow).get_check_json(check_id, user_id)
+
+    monkeypatch.setattr(settings, "CHECKS_READ_MODE", "json_agg")
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        document = await CheckService(uow).get_check_json(check_id, user_id)
+
+    assert json.loads(document) == json.loads(rows)
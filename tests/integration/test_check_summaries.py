@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from src.auth.services import UserService
+from src.checks.models import Check
+from src.checks.schemas import SummaryPeriod
+from src.checks.services import CheckService
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+def make_check(payment_type: str, price: float) -> dict:
+    return {
+        "products": [{"name": "Product", "price": price, "quantity": 2}],
+        "payment": {"type": payment_type, "amount": 1000.0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_summary_matches_checks():
+    """
+    [Successful] Test summaries updated by single and batch creation match checks.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        await CheckService(uow).create_check(user["id"], make_check("cash", 10.5))
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        await CheckService(uow).create_checks(
+            user["id"],
+            [
+                make_check("cash", 20.25),
+                make_check("cashless", 30.0),
+                make_check("cash", 5000.0),
+            ],
+        )
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        summaries = await CheckService(uow).get_summary(user["id"], SummaryPeriod.DAY)
+        result = await uow.session.execute(
+            select(Check.type, func.count(), func.sum(Check.total))
+            .filter(Check.user_id == user["id"])
+            .group_by(Check.type)
+        )
+        expected = {row[0]: (row[1], float(row[2])) for row in result.all()}
+
+    # The checks may be created on both sides of midnight, so compare the sums
+    # of all days.
+    payments = {}
+    for summary in summaries:
+        for payment_type, totals in summary.payments.items():
+            count, total = payments.get(payment_type, (0, 0.0))
+            payments[payment_type] = (count + totals.count, total + totals.total)
+
+    assert sum(summary.count for summary in summaries) == 3
+    assert sum(summary.total for summary in summaries) == pytest.approx(
+        sum(total for _, total in expected.values())
+    )
+    assert payments.keys() == expected.keys()
+    for payment_type, (count, total) in expected.items():
+        assert payments[payment_type][0] == count
+        assert payments[payment_type][1] == pytest.approx(total)
@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy import text
+
+from src.database import async_session_maker, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_record_checkout():
+    """
+    [Successful] Test connection checkouts are recorded in pool metrics.
+    """
+    checkouts = pool_stats()["checkouts"]
+
+    async with async_session_maker() as session:
+        await session.execute(text("SELECT 1"))
+        assert pool_stats()["checked_out"] >= 1
+
+    stats = pool_stats()
+    assert stats["checkouts"] == checkouts + 1
+    assert stats["wait_seconds"] >= 0
+    assert stats["timeouts"] == 0
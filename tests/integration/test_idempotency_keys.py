@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import func, select, text
+
+from src.auth.services import UserService
+from src.checks import maintenance
+from src.checks.cache import idempotency_cache
+from src.checks.models import Check
+from src.checks.services import CheckService
+from src.database import engine
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+EXPIRE_KEYS = text(
+    "UPDATE check_idempotency_keys SET expires_at = now() - interval '1 second' "
+    "WHERE user_id = :user_id"
+)
+CHECK = {
+    "products": [{"name": "Product", "price": 12.5, "quantity": 2}],
+    "payment": {"type": "cash", "amount": 100.0},
+}
+
+
+async def create_user() -> int:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+    return user["id"]
+
+
+async def create_check_once(user_id: int, key: str) -> tuple:
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        return await CheckService(uow).create_check_once(
+            user_id,
+            {"products": [dict(CHECK["products"][0])], "payment": CHECK["payment"]},
+            key,
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_create_one_check():
+    """
+    [Successful] Test concurrent requests with one key create one check.
+    """
+    user_id = await create_user()
+    idempotency_cache.clear()
+
+    results = await asyncio.gather(
+        *(create_check_once(user_id, "concurrent") for _ in range(5))
+    )
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        checks = await uow.session.scalar(
+            select(func.count()).select_from(Check).filter(Check.user_id == user_id)
+        )
+
+    assert checks == 1
+    assert sorted(replayed for _, replayed in results) == [False] + [True] * 4
+    assert len({created_check.id for created_check, _ in results}) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_key_is_replaced_and_purged():
+    """
+    [Successful] Test an expired key creates a new check and is purged.
+    """
+    user_id = await create_user()
+    idempotency_cache.clear()
+    first, _ = await create_check_once(user_id, "expired")
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(EXPIRE_KEYS, {"user_id": user_id})
+        idempotency_cache.clear()
+        second, replayed = await create_check_once(user_id, "expired")
+
+        await connection.execute(EXPIRE_KEYS, {"user_id": user_id})
+        deleted = await maintenance.purge_idempotency_keys(connection, batch_size=1)
+        remaining = await connection.scalar(
+            text(
+                "SELECT count(*) FROM check_idempotency_keys WHERE user_id = :user_id"
+            ),
+            {"user_id": user_id},
+        )
+
+    assert not replayed
+    assert second.id != first.id
+    assert deleted >= 1
+    assert remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_locked_key():
+    """
+    [Successful] Test a retry waits for the request holding the key and replays it.
+    """
+    user_id = await create_user()
+    idempotency_cache.clear()
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        await uow.idempotency_keys.lock(user_id, "locked")
+        retry = asyncio.create_task(create_check_once(user_id, "locked"))
+        await asyncio.sleep(0.2)
+        assert not retry.done()
+
+        first, replayed = await CheckService(uow).create_check_once(
+            user_id,
+            {"products": [dict(CHECK["products"][0])], "payment": CHECK["payment"]},
+            "locked",
+        )
+
+    second, retry_replayed = await retry
+
+    assert not replayed
+    assert retry_replayed
+    assert second.id == first.id
@@ -0,0 +1,96 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.checks import maintenance
+from src.database import engine
+
+
+@pytest.mark.asyncio
+async def test_create_and_detach_partitions(monkeypatch):
+    """
+    [Successful] Test partitions are created once and detached items first.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    parent, child = f"test_checks_{suffix}", f"test_check_items_{suffix}"
+    monkeypatch.setattr(
+        maintenance,
+        "PARTITIONED_TABLES",
+        ((child, "check_created_at"), (parent, "created_at")),
+    )
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(
+            text(
+                f"CREATE TABLE {parent} (id int, created_at timestamp, "
+                f"PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+            )
+        )
+        await connection.execute(
+            text(
+                f"CREATE TABLE {child} (check_id int, check_created_at timestamp, "
+                f"FOREIGN KEY (check_id, check_created_at) "
+                f"REFERENCES {parent} (id, created_at)) "
+                f"PARTITION BY RANGE (check_created_at)"
+            )
+        )
+        try:
+            created = await maintenance.create_partitions(
+                connection, date(2024, 11, 1), 3
+            )
+            created_again = await maintenance.create_partitions(
+                connection, date(2024, 11, 1), 3
+            )
+            await connection.execute(
+                text(f"INSERT INTO {parent} VALUES (1, '2024-12-31 23:59:59')")
+            )
+            await connection.execute(
+                text(f"INSERT INTO {child} VALUES (1, '2024-12-31 23:59:59')")
+            )
+            detached = await maintenance.detach_partitions(
+                connection, date(2025, 1, 1), concurrently=True
+            )
+            remaining = await maintenance.list_partitions(connection, parent)
+            detached_rows = await connection.scalar(
+                text(f"SELECT count(*) FROM {parent}_p2024_12")
+            )
+        finally:
+            for table in (child, parent):
+                await connection.execute(text(f"DROP TABLE {table}"))
+                for month in ("2024_11", "2024_12", "2025_01"):
+                    await connection.execute(
+                        text(f"DROP TABLE IF EXISTS {table}_p{month}")
+                    )
+
+    assert created == [
+        f"{parent}_p2024_11",
+        f"{parent}_p2024_12",
+        f"{parent}_p2025_01",
+        f"{child}_p2024_11",
+        f"{child}_p2024_12",
+        f"{child}_p2025_01",
+    ]
+    assert created_again == []
+    assert detached == [
+        f"{child}_p2024_11",
+        f"{child}_p2024_12",
+        f"{parent}_p2024_11",
+        f"{parent}_p2024_12",
+    ]
+    assert remaining == [date(2025, 1, 1)]
+    assert detached_rows == 1
+
+
+@pytest.mark.asyncio
+async def test_checks_have_current_partition():
+    """
+    [Successful] Test the current month of checks and items is partitioned.
+    """
+    month = datetime.now().date().replace(day=1)
+
+    async with engine.connect() as connection:
+        for table, _ in maintenance.PARTITIONED_TABLES:
+            assert month in await maintenance.list_partitions(connection, table)
@@ -0,0 +1,155 @@
+import itertools
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from src.checks.maintenance import add_months, partition_name
+from src.checks.schemas import PaymentMethod
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+FILTERS = {
+    "created_at__lt": datetime(2030, 1, 1),
+    "created_at__gte": datetime(2020, 1, 1),
+    "amount__lt": 1000.0,
+    "amount__gte": 10.0,
+    "type": PaymentMethod.CASH,
+}
+FILTER_COMBINATIONS = [
+    dict(combination)
+    for size in range(len(FILTERS) + 1)
+    for combination in itertools.combinations(FILTERS.items(), size)
+]
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    """
+    Collect relations read with a sequential scan anywhere in the plan.
+    """
+    relations = []
+    if plan["Node Type"] == "Seq Scan":
+        relations.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        relations.extend(find_seq_scans(child))
+    return relations
+
+
+def find_relations(plan: dict) -> set[str]:
+    """
+    Collect relations read anywhere in the plan.
+    """
+    relations = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        relations |= find_relations(child)
+    return relations
+
+
+async def explain(
+    uow: SQLAlchemyUnitOfWorkManager, statement, parameters: dict
+) -> dict:
+    """
+    Get the plan of the statement with sequential scans discouraged, so a
+    sequential scan only shows up when no index can serve the query.
+    """
+    compiled = statement.params(parameters).compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    await uow.session.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await uow.session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    return result.scalar_one()[0]["Plan"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "builder",
+    ["build_statement", "build_projection_statement", "build_json_statement"],
+)
+@pytest.mark.parametrize("with_cursor", [False, True])
+@pytest.mark.parametrize("filters", FILTER_COMBINATIONS)
+async def test_check_listing_uses_indexes(filters, with_cursor, builder):
+    """
+    [Successful] Test every GET /checks filter combination is served by indexes.
+    """
+    after = (datetime(2025, 1, 1), 100) if with_cursor else None
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        statement, parameters = getattr(uow.checks, builder)(
+            {**filters, "user_id": 1}, limit=101, after=after
+        )
+        plan = await explain(uow, statement, parameters)
+
+    assert find_seq_scans(plan) == []
+
+
+@pytest.mark.asyncio
+async def test_check_items_lookup_uses_indexes():
+    """
+    [Successful] Test items of a page of checks are fetched through an index.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        statement, parameters = uow.checks.build_items_statement(list(range(1, 101)))
+        plan = await explain(uow, statement, parameters)
+
+    assert find_seq_scans(plan) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"id": 1, "user_id": 1},
+        {"public_uuid": "123e4567-e89b-12d3-a456-426614174000"},
+    ],
+)
+async def test_check_lookup_uses_indexes(filters):
+    """
+    [Successful] Test single check lookups are served by indexes.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        plan = await explain(uow, *uow.checks.build_statement(filters))
+
+    assert find_seq_scans(plan) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "builder",
+    ["build_projection_statement", "build_json_statement", "build_export_statement"],
+)
+async def test_check_listing_prunes_partitions(builder):
+    """
+    [Successful] Test a created_at range only reads partitions of its months.
+    """
+    month = datetime.now().date().replace(day=1)
+    filters = {
+        "user_id": 1,
+        "created_at__gte": datetime.combine(month, datetime.min.time()),
+        "created_at__lt": datetime.combine(add_months(month, 1), datetime.min.time()),
+    }
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        plan = await explain(uow, *getattr(uow.checks, builder)(filters))
+
+    assert {
+        relation for relation in find_relations(plan) if relation.startswith("checks_")
+    } == {partition_name("checks", month)}
+
+
+@pytest.mark.asyncio
+async def test_check_items_lookup_prunes_partitions():
+    """
+    [Successful] Test items of a page only read partitions of its months.
+    """
+    month = datetime.now().date().replace(day=1)
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        statement, parameters = uow.checks.build_items_statement(
+            [1, 2, 3],
+            created_from=datetime.combine(month, datetime.min.time()),
+            created_to=datetime.combine(month, datetime.max.time()),
+        )
+        plan = await explain(uow, statement, parameters)
+
+    assert find_relations(plan) == {partition_name("check_items", month)}
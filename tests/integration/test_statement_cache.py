@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from src.checks.schemas import PaymentMethod
+from src.database import compile_cache_metrics
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+@pytest.mark.asyncio
+async def test_listing_statement_is_reused_for_same_filters():
+    """
+    [Successful] Test filters with other values reuse the built statement.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        statement, parameters = uow.checks.build_projection_statement(
+            {"user_id": 1, "type": PaymentMethod.CASH, "total__gte": None}, limit=11
+        )
+        same_statement, same_parameters = uow.checks.build_projection_statement(
+            {"user_id": 2, "type": PaymentMethod.CASHLESS, "total__gte": None},
+            limit=21,
+        )
+        other_statement, _ = uow.checks.build_projection_statement(
+            {"user_id": 1, "total__gte": 10.0}, limit=11
+        )
+
+    assert same_statement is statement
+    assert other_statement is not statement
+    assert parameters == {"user_id": 1, "type": PaymentMethod.CASH, "limit": 11}
+    assert same_parameters == {
+        "user_id": 2,
+        "type": PaymentMethod.CASHLESS,
+        "limit": 21,
+    }
+
+
+@pytest.mark.asyncio
+async def test_none_filter_is_compared_with_is_null():
+    """
+    [Successful] Test None filter values build an IS NULL statement of their own.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        statement, parameters = uow.users._equality_statement(
+            "get", {"id": 1, "login": None}
+        )
+        other_statement, other_parameters = uow.users._equality_statement(
+            "get", {"id": 1, "login": "login"}
+        )
+
+    assert "users.login IS NULL" in str(statement)
+    assert other_statement is not statement
+    assert parameters == {"id": 1}
+    assert other_parameters == {"id": 1, "login": "login"}
+
+
+@pytest.mark.asyncio
+async def test_repeated_listing_hits_compile_cache():
+    """
+    [Successful] Test repeated listings are served by the compile cache.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        await uow.checks.get_rows(data={"user_id": 1}, limit=10)
+        hits = compile_cache_metrics.hits
+
+        for user_id in range(2, 5):
+            await uow.checks.get_rows(
+                data={"user_id": user_id},
+                limit=10,
+                after=(datetime(2030, 1, 1), 1000),
+            )
+            await uow.checks.get_rows(data={"user_id": user_id}, limit=10)
+
+    assert compile_cache_metrics.hits - hits >= 5
+    assert compile_cache_metrics.hit_ratio > 0
@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from src.auth.services import UserService
+from src.checks.models import Check
+from src.checks.services import CheckService
+from src.database import pool_stats
+from src.unit_of_work import SQLAlchemyUnitOfWorkManager
+
+
+@pytest.mark.asyncio
+async def test_nested_unit_of_work_reuses_session():
+    """
+    [Successful] Test nested entries reuse the session of the outermost one.
+    """
+    uow = SQLAlchemyUnitOfWorkManager()
+
+    async with uow:
+        session = uow.session
+        async with uow:
+            assert uow.session is session
+        assert uow.depth == 1
+
+    assert uow.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_create_user_checks_out_one_connection():
+    """
+    [Successful] Test a service call inside a request scope uses one connection.
+    """
+    checkouts = pool_stats()["checkouts"]
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+
+    assert pool_stats()["checkouts"] == checkouts + 1
+
+
+@pytest.mark.asyncio
+async def test_lazy_relationship_load_fail():
+    """
+    [Failed] Test relationships are never loaded lazily.
+    """
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        user = await UserService(uow).create_user(
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "login": f"test-{uuid.uuid4()}",
+                "password": "password",
+            }
+        )
+        created_check = await CheckService(uow).create_check(
+            user["id"],
+            {
+                "products": [{"name": "Product", "price": 12.5, "quantity": 2}],
+                "payment": {"type": "cash", "amount": 100.0},
+            },
+        )
+
+    async with SQLAlchemyUnitOfWorkManager() as uow:
+        check = await uow.session.scalar(
+            select(Check).filter(Check.id == created_check.id)
+        )
+
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            check.items
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            check.user
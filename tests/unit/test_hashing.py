@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from src.auth.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_success():
+    """
+    [Successful] Test password hashing and verification in the worker pool.
+    """
+    hasher = PasswordHasher(max_workers=1, max_concurrency=1)
+    try:
+        hashed_password = await hasher.hash("password")
+
+        assert hashed_password != "password"
+        assert await hasher.verify("password", hashed_password) is True
+        assert await hasher.verify("wrong_password", hashed_password) is False
+        assert hasher.stats()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_password_concurrency_cap():
+    """
+    [Successful] Test that jobs above the concurrency cap wait in the queue.
+    """
+    hasher = PasswordHasher(max_workers=1, max_concurrency=1)
+    try:
+        tasks = [asyncio.create_task(hasher.hash("password")) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        assert hasher.stats()["in_flight"] == 1
+        assert hasher.stats()["queued"] == 2
+
+        await asyncio.gather(*tasks)
+        assert hasher.stats()["queued"] == 0
+        assert hasher.stats()["in_flight"] == 0
+    finally:
+        hasher.shutdown()
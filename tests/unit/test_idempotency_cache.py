@@ -0,0 +1,29 @@
+from src.checks.cache import IdempotencyCache, StoredResponse
+
+STORED = StoredResponse("hash", "{}")
+
+
+def test_idempotency_cache_evicts_least_recently_used():
+    """
+    [Successful] Test least recently used responses are evicted over the size.
+    """
+    cache = IdempotencyCache(max_entries=2, ttl=60)
+    cache.set((1, "first"), STORED)
+    cache.set((1, "second"), STORED)
+    cache.get((1, "first"))
+    cache.set((1, "third"), STORED)
+
+    assert cache.get((1, "second")) is None
+    assert cache.get((1, "first")) == STORED
+    assert cache.get((1, "third")) == STORED
+
+
+def test_idempotency_cache_expires_entries():
+    """
+    [Successful] Test responses are not returned after the TTL.
+    """
+    cache = IdempotencyCache(max_entries=2, ttl=-1)
+    cache.set((1, "first"), STORED)
+
+    assert cache.get((1, "first")) is None
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1}
@@ -0,0 +1,48 @@
+from src.metrics.registry import Registry
+
+
+def test_histogram_render():
+    """
+    [Successful] Test histogram buckets are rendered cumulatively.
+    """
+    registry = Registry()
+    histogram = registry.histogram(
+        "duration_seconds", "Duration.", ("route",), buckets=(0.1, 1)
+    )
+
+    histogram.observe(0.05, "/checks")
+    histogram.observe(0.1, "/checks")
+    histogram.observe(0.5, "/checks")
+    histogram.observe(2, "/checks")
+
+    assert histogram.count("/checks") == 4
+    assert registry.render().splitlines() == [
+        "# HELP duration_seconds Duration.",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{route="/checks",le="0.1"} 2',
+        'duration_seconds_bucket{route="/checks",le="1"} 3',
+        'duration_seconds_bucket{route="/checks",le="+Inf"} 4',
+        'duration_seconds_count{route="/checks"} 4',
+        'duration_seconds_sum{route="/checks"} 2.65',
+    ]
+
+
+def test_counter_and_collector_render():
+    """
+    [Successful] Test counters and collected values are rendered with escaped labels.
+    """
+    registry = Registry()
+    counter = registry.counter("requests", "Requests.", ("path",))
+    registry.collector(lambda: [("size", "gauge", "Size.", [("size", {}, 3)])])
+
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests Requests.",
+        "# TYPE requests counter",
+        'requests_total{path="/a\\"b"} 3',
+        "# HELP size Size.",
+        "# TYPE size gauge",
+        "size 3",
+    ]
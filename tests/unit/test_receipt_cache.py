@@ -0,0 +1,45 @@
+import pytest
+
+from src.checks.cache import InMemoryReceiptCache, ReceiptCache
+
+
+@pytest.mark.asyncio
+async def test_receipt_cache_evicts_over_byte_budget():
+    """
+    [Successful] Test least recently used receipts are evicted over the budget.
+    """
+    cache = InMemoryReceiptCache(max_bytes=10)
+    await cache.set("first", b"12345")
+    await cache.set("second", b"12345")
+    await cache.get("first")
+    await cache.set("third", b"12345")
+
+    assert await cache.get("second") is None
+    assert await cache.get("first") == b"12345"
+    assert await cache.get("third") == b"12345"
+    assert cache.stats()["size_bytes"] == 10
+
+
+@pytest.mark.asyncio
+async def test_receipt_cache_skips_oversized_receipt():
+    """
+    [Successful] Test a receipt larger than the budget is not cached.
+    """
+    cache = InMemoryReceiptCache(max_bytes=4)
+    await cache.set("first", b"12345")
+
+    assert await cache.get("first") is None
+    assert cache.stats()["size_bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_receipt_cache_fills_local_from_shared():
+    """
+    [Successful] Test receipts found in the shared backend are cached locally.
+    """
+    shared = InMemoryReceiptCache(max_bytes=100)
+    cache = ReceiptCache(local=InMemoryReceiptCache(max_bytes=100), shared=shared)
+    await shared.set("first", b"receipt")
+
+    assert await cache.get("first") == b"receipt"
+    assert await cache.local.get("first") == b"receipt"
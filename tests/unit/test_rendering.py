@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from src.checks.rendering import iter_receipt, render_receipt
+from src.checks.schemas import CheckResponse
+
+
+def build_check(products: int) -> CheckResponse:
+    return CheckResponse(
+        id=1,
+        public_uuid="123e4567-e89b-12d3-a456-426614174000",
+        products=[
+            {"name": f"Product <{index}>", "price": 1.5, "quantity": 2}
+            for index in range(products)
+        ],
+        payment={"type": "cash", "amount": 3.0 * products},
+        total=3.0 * products,
+        rest=0,
+        created_at=datetime(2025, 1, 2, 3, 4, 5),
+    )
+
+
+def test_render_receipt():
+    """
+    [Successful] Test receipts are rendered with escaped product names.
+    """
+    content = render_receipt(build_check(2)).decode()
+
+    assert "Product &lt;1&gt;" in content
+    assert "Product <1>" not in content
+    assert "02.01.2025 03:04" in content
+    assert "Cash" in content
+
+
+def test_iter_receipt_matches_render():
+    """
+    [Successful] Test streamed receipts are split into chunks of the rendered one.
+    """
+    check = build_check(200)
+
+    chunks = list(iter_receipt(check, chunk_size=1024))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 1024 for chunk in chunks[:-1])
+    assert b"".join(chunks) == render_receipt(check)
@@ -0,0 +1,108 @@
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from pydantic import TypeAdapter
+
+from src.checks.schemas import CheckResponse, PaymentMethod
+from src.checks.serializers import dump_check, dump_checks, iter_export_ndjson
+
+CheckRow = namedtuple(
+    "CheckRow", ["id", "public_uuid", "type", "amount", "total", "rest", "created_at"]
+)
+ItemRow = namedtuple("ItemRow", ["check_id", "name", "price", "quantity"])
+ExportRow = namedtuple("ExportRow", CheckRow._fields + ("name", "price", "quantity"))
+
+CHECKS = [
+    CheckRow(
+        id=2,
+        public_uuid=uuid.uuid4(),
+        type=PaymentMethod.CASHLESS,
+        amount=Decimal("100.00"),
+        total=Decimal("74.97"),
+        rest=Decimal("25.03"),
+        created_at=datetime(2025, 5, 1, 12, 30, 15),
+    ),
+    CheckRow(
+        id=1,
+        public_uuid=uuid.uuid4(),
+        type=PaymentMethod.CASH,
+        amount=Decimal("60000.00"),
+        total=Decimal("40000.00"),
+        rest=Decimal("20000.00"),
+        created_at=datetime(2025, 4, 30, 8, 0, 0),
+    ),
+]
+ITEMS = [
+    ItemRow(check_id=1, name="Dji Mavic", price=Decimal("20000.00"), quantity=2),
+    ItemRow(check_id=2, name="Кава", price=Decimal("24.99"), quantity=3),
+]
+
+
+def to_response(check: CheckRow) -> CheckResponse:
+    return CheckResponse(
+        id=check.id,
+        public_uuid=str(check.public_uuid),
+        products=[item._asdict() for item in ITEMS if item.check_id == check.id],
+        payment={"type": check.type, "amount": check.amount},
+        total=check.total,
+        rest=check.rest,
+        created_at=check.created_at,
+    )
+
+
+def test_dump_checks_matches_response_model():
+    """
+    [Successful] Test rows are serialized exactly like list[CheckResponse].
+    """
+    expected = TypeAdapter(list[CheckResponse]).dump_json(
+        [to_response(check) for check in CHECKS]
+    )
+
+    assert dump_checks(CHECKS, ITEMS) == expected
+
+
+def test_dump_check_matches_response_model():
+    """
+    [Successful] Test a row is serialized exactly like CheckResponse.
+    """
+    items = [item for item in ITEMS if item.check_id == CHECKS[0].id]
+
+    assert (
+        dump_check(CHECKS[0], items)
+        == to_response(CHECKS[0]).model_dump_json().encode()
+    )
+
+
+def test_dump_checks_skips_items_of_other_checks():
+    """
+    [Successful] Test items of checks outside the page are ignored.
+    """
+    assert dump_checks(CHECKS[:1], ITEMS) == dump_checks(CHECKS[:1], ITEMS[1:])
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_groups_checks_across_partitions():
+    """
+    [Successful] Test a check split between partitions is exported as one line.
+    """
+    items = ITEMS + [
+        ItemRow(check_id=2, name="Круасан", price=Decimal("45.50"), quantity=1)
+    ]
+    rows = [
+        ExportRow(*check, item.name, item.price, item.quantity)
+        for check in CHECKS
+        for item in items
+        if item.check_id == check.id
+    ]
+
+    async def partitions():
+        yield rows[:1]
+        yield rows[1:]
+
+    chunks = [chunk async for chunk in iter_export_ndjson(partitions())]
+    lines = b"".join(chunks).splitlines()
+
+    assert lines == [dump_check(check, items) for check in CHECKS]
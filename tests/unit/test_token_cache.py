@@ -0,0 +1,44 @@
+import time
+
+from src.auth.cache import TokenCache
+
+
+def test_token_cache_hit_and_miss():
+    """
+    [Successful] Test cached payload is returned until the token expires.
+    """
+    cache = TokenCache(max_size=2)
+    payload = {"sub": "1", "exp": time.time() + 60}
+
+    assert cache.get("token") is None
+    cache.set("token", payload)
+
+    assert cache.get("token") == payload
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_token_cache_expired_token():
+    """
+    [Successful] Test expired payload is evicted on lookup.
+    """
+    cache = TokenCache(max_size=2)
+    cache.set("token", {"sub": "1", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    """
+    [Successful] Test the least recently used token is evicted when full.
+    """
+    cache = TokenCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.set("first", {"sub": "1", "exp": expires_at})
+    cache.set("second", {"sub": "2", "exp": expires_at})
+    cache.get("first")
+    cache.set("third", {"sub": "3", "exp": expires_at})
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
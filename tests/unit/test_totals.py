@@ -0,0 +1,130 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+from math import floor
+
+import pytest
+
+from src.checks.exceptions import InsufficientPayment
+from src.checks.totals import assign_check, calculate_totals, to_money
+
+SEEDS = range(500)
+
+
+def kopecks(value: Decimal) -> int:
+    return int(value * 100)
+
+
+def reference_kopecks(value: float) -> int:
+    """
+    Round a positive money value to kopecks half up with exact rationals.
+    """
+    return floor(Fraction(repr(value)) * 100 + Fraction(1, 2))
+
+
+def random_basket(rng: random.Random) -> list[dict]:
+    return [
+        {
+            "name": f"Product {index}",
+            "price": round(rng.uniform(0.01, 10000), rng.choice([0, 1, 2, 3])) or 0.01,
+            "quantity": rng.randint(1, 1000),
+        }
+        for index in range(rng.randint(1, 50))
+    ]
+
+
+def test_totals_match_reference():
+    """
+    [Successful] Test totals of random baskets match the exact reference.
+    """
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        products = random_basket(rng)
+        total = sum(
+            reference_kopecks(product["price"]) * product["quantity"]
+            for product in products
+        )
+        amount = (total + rng.randint(0, 100000)) / 100
+
+        totals = calculate_totals(products, amount)
+
+        assert kopecks(totals.total) == total, seed
+        assert kopecks(totals.amount) == reference_kopecks(amount), seed
+        assert totals.rest == totals.amount - totals.total, seed
+        assert sum(item["total"] for item in totals.items) == totals.total, seed
+        assert [item["quantity"] for item in totals.items] == [
+            product["quantity"] for product in products
+        ], seed
+
+
+def test_insufficient_payment_fail():
+    """
+    [Failed] Test a payment below the total of a random basket is rejected.
+    """
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        products = random_basket(rng)
+        total = sum(
+            reference_kopecks(product["price"]) * product["quantity"]
+            for product in products
+        )
+
+        with pytest.raises(InsufficientPayment):
+            calculate_totals(products, (total - rng.randint(1, total)) / 100)
+
+
+@pytest.mark.parametrize(
+    "price, quantity, total",
+    [
+        (0.1, 3, Decimal("0.30")),
+        (24.99, 3, Decimal("74.97")),
+        (12.345, 2, Decimal("24.70")),
+        (19.999, 1, Decimal("20.00")),
+    ],
+)
+def test_line_totals_do_not_drift(price, quantity, total):
+    """
+    [Successful] Test float prices are converted without binary drift.
+    """
+    totals = calculate_totals(
+        [{"name": "Product", "price": price, "quantity": quantity}], 100
+    )
+
+    assert totals.total == total
+    assert totals.rest == Decimal("100.00") - total
+
+
+def test_exact_payment_has_zero_rest():
+    """
+    [Successful] Test paying exactly the total leaves no rest.
+    """
+    totals = calculate_totals([{"name": "Product", "price": 0.1, "quantity": 3}], 0.3)
+
+    assert totals.rest == Decimal("0.00")
+
+
+def test_assign_check():
+    """
+    [Successful] Test item rows are completed with the keys of the check.
+    """
+    totals = calculate_totals([{"name": "Product", "price": 24.99, "quantity": 3}], 100)
+
+    assert assign_check(totals.items, 1, None) == [
+        {
+            "name": "Product",
+            "price": Decimal("24.99"),
+            "quantity": 3,
+            "total": Decimal("74.97"),
+            "check_id": 1,
+            "check_created_at": None,
+        }
+    ]
+
+
+def test_to_money():
+    """
+    [Successful] Test money values are rounded half up to two decimal places.
+    """
+    assert to_money("0.005") == Decimal("0.01")
+    assert str(to_money(12.5)) == "12.50"
+    assert str(to_money(100)) == "100.00"